@@ -7,15 +7,119 @@
 import sqlite3
 import json
 import asyncio
+import random
+import time
 import aiosqlite
-from datetime import datetime
+from collections import namedtuple
+from itertools import groupby
+from datetime import date, datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 import logging
 from contextlib import asynccontextmanager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# 时间统一以ISO-8601文本写入（与CURRENT_TIMESTAMP同为空格分隔，保证文本比较有序），
+# 读出的行全部是原生JSON类型，导出时无需 default=str 回调
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(sep=' '))
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+
+# 各表的显式列名（避免 SELECT * 和 aiosqlite.Row 的逐行 dict 拷贝）
+_MESSAGE_COLS = (
+    'id', 'channel_id', 'channel_name', 'user_id', 'username', 'content',
+    'attachments', 'embeds', 'message_type', 'timestamp', 'created_at'
+)
+_SIGNAL_COLS = (
+    'id', 'signal_key', 'symbol', 'side', 'entry_price', 'stop_loss',
+    'take_profit', 'channel', 'status', 'executed_at', 'order_id', 'created_at'
+)
+_ORDER_COLS = (
+    'id', 'order_id', 'symbol', 'side', 'order_type', 'quantity', 'price', 'status',
+    'filled_quantity', 'commission', 'signal_id', 'created_at', 'updated_at'
+)
+_METRIC_COLS = ('id', 'metric_type', 'metric_name', 'value', 'metadata', 'timestamp')
+_ALERT_COLS = ('id', 'level', 'category', 'message', 'data', 'acknowledged', 'created_at')
+
+_TABLE_COLS = {
+    'messages': _MESSAGE_COLS,
+    'trading_signals': _SIGNAL_COLS,
+    'orders': _ORDER_COLS,
+    'system_metrics': _METRIC_COLS,
+    'alerts': _ALERT_COLS,
+}
+
+# 待处理信号只需要下单相关的列
+_PENDING_SIGNAL_COLS = (
+    'id', 'signal_key', 'symbol', 'side', 'entry_price',
+    'stop_loss', 'take_profit', 'channel', 'created_at'
+)
+SignalRow = namedtuple('SignalRow', _PENDING_SIGNAL_COLS)
+
+
+# 写入语句（写入线程按相同SQL分组后使用executemany）
+_SQL_INSERT_MESSAGE = """
+    INSERT INTO messages (
+        channel_id, channel_name, user_id, username, 
+        content, attachments, embeds, message_type, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_UPSERT_SIGNAL = """
+    INSERT INTO trading_signals (
+        signal_key, symbol, side, entry_price, 
+        stop_loss, take_profit, channel
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(signal_key) DO UPDATE SET
+        entry_price = excluded.entry_price,
+        stop_loss = excluded.stop_loss,
+        take_profit = excluded.take_profit
+    RETURNING id
+"""
+_SQL_UPDATE_SIGNAL_STATUS = """
+    UPDATE trading_signals 
+    SET status = ?, order_id = ?, executed_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+_SQL_INSERT_ORDER = """
+    INSERT INTO orders (
+        order_id, symbol, side, order_type, quantity, 
+        price, status, signal_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_UPDATE_ORDER_STATUS_FILLED = """
+    UPDATE orders 
+    SET status = ?, filled_quantity = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE order_id = ?
+"""
+_SQL_UPDATE_ORDER_STATUS = """
+    UPDATE orders 
+    SET status = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE order_id = ?
+"""
+_SQL_INSERT_METRIC = """
+    INSERT INTO system_metrics (metric_type, metric_name, value, metadata)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_INSERT_ALERT = """
+    INSERT INTO alerts (level, category, message, data)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _select_sql(table: str, cols: tuple) -> str:
+    """构建显式列名的SELECT语句前缀"""
+    return f"SELECT {', '.join(cols)} FROM {table}"
+
+
+def _signal_row_factory(cursor, row):
+    """行工厂：直接构造SignalRow，单次元组分配"""
+    return SignalRow._make(row)
+
 
 class DatabaseManager:
     """数据库管理器"""
@@ -24,10 +128,24 @@ class DatabaseManager:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
         self._connection_pool = {}
+        # 单写入者：所有写操作经队列交给一个后台协程串行提交
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._write_batch_size = 100
+        self._write_retries = 5
+        # 定期维护（PRAGMA optimize + WAL checkpoint）
+        self._maintenance_interval = 900
+        self._maintenance_task: Optional[asyncio.Task] = None
+        # 热点读缓存（仪表盘轮询）：key -> (过期时间, 结果)
+        self._cache_ttl = 2.0
+        self._cache_maxsize = 256
+        self._read_cache: Dict[tuple, tuple] = {}
         
     async def init_database(self):
         """初始化数据库结构"""
         async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("PRAGMA journal_mode=WAL")
+            
             # 创建消息表
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS messages (
@@ -124,216 +242,343 @@ class DatabaseManager:
             
             await db.commit()
             logger.info("数据库初始化完成")
+        
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+    
+    async def _maintenance_loop(self):
+        """定期更新查询规划统计并截断WAL文件"""
+        while True:
+            await asyncio.sleep(self._maintenance_interval)
+            try:
+                async with self.get_connection() as db:
+                    await db.execute("PRAGMA optimize")
+                    await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                logger.debug("数据库维护完成")
+            except Exception as e:
+                logger.error(f"数据库维护失败: {e}")
     
     @asynccontextmanager
     async def get_connection(self):
         """获取数据库连接"""
         async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
             yield db
     
+    # 读缓存
+    def _cache_get(self, key: tuple) -> Optional[list]:
+        """命中且未过期时返回结果副本（逐行复制，调用方修改行不影响缓存）"""
+        entry = self._read_cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return [dict(row) for row in entry[1]]
+    
+    def _cache_put(self, key: tuple, rows: list) -> list:
+        """写入缓存并返回结果副本（逐行复制）"""
+        now = time.monotonic()
+        if len(self._read_cache) >= self._cache_maxsize:
+            self._read_cache = {k: v for k, v in self._read_cache.items() if v[0] >= now}
+            if len(self._read_cache) >= self._cache_maxsize:
+                self._read_cache.clear()
+        self._read_cache[key] = (now + self._cache_ttl, rows)
+        return [dict(row) for row in rows]
+    
+    def _cache_invalidate(self, kind: str, scope: Any = None):
+        """使某类缓存失效；scope为None时清除该类全部缓存"""
+        stale = [k for k in self._read_cache
+                 if k[0] == kind and (scope is None or k[1] == scope)]
+        for key in stale:
+            del self._read_cache[key]
+    
+    # 写入队列（single-writer）
+    async def _ensure_writer(self):
+        """确保后台写入协程已启动"""
+        if self._write_queue is None:
+            self._write_queue = asyncio.Queue()
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop())
+    
+    async def _submit_write(self, sql: str, params: tuple = (), fetch: Optional[str] = None):
+        """提交写操作并等待提交完成
+        
+        fetch: None 不取结果；'lastrowid' 返回自增id；'one' 返回 fetchone() 结果
+        """
+        await self._ensure_writer()
+        fut = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((sql, params, fetch, fut))
+        return await fut
+    
+    async def _writer_loop(self):
+        """后台写入协程：持有唯一写连接，每批最多合并 _write_batch_size 个写操作为一个事务
+        
+        协程异常退出（连接失败、rollback出错、被取消等）时，当前批次和队列中等待的写操作都以异常结束，
+        调用方不会一直等待；队列保留给下一次 _ensure_writer 启动的写入协程继续使用。
+        """
+        batch = []
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                stopping = False
+                while not stopping:
+                    item = await self._write_queue.get()
+                    if item is None:
+                        break
+                    batch = [item]
+                    while len(batch) < self._write_batch_size and not self._write_queue.empty():
+                        item = self._write_queue.get_nowait()
+                        if item is None:
+                            stopping = True
+                            break
+                        batch.append(item)
+                    await self._flush_write_batch(db, batch)
+                    batch = []
+        except BaseException as e:
+            error = e if isinstance(e, Exception) else RuntimeError(f"写入协程已停止: {e!r}")
+            logger.error(f"写入协程异常退出: {error}")
+            self._fail_pending_writes(batch, error)
+            if not isinstance(e, Exception):
+                raise
+    
+    def _fail_pending_writes(self, batch: List[tuple], error: Exception):
+        """以error结束当前批次和队列中所有尚未完成的写操作"""
+        pending = list(batch)
+        while not self._write_queue.empty():
+            pending.append(self._write_queue.get_nowait())
+        for item in pending:
+            if item is None:
+                continue
+            fut = item[-1]
+            if not fut.done():
+                fut.set_exception(error)
+    
+    async def _execute_write_batch(self, db, batch: List[tuple]) -> list:
+        """在 BEGIN IMMEDIATE 事务内执行一批写操作，相同SQL且无需返回值的连续操作合并为executemany"""
+        results = []
+        await db.execute("BEGIN IMMEDIATE")
+        for (sql, fetch), group in groupby(batch, key=lambda it: (it[0], it[2])):
+            group = list(group)
+            if fetch is None:
+                await db.executemany(sql, [it[1] for it in group])
+                results.extend(None for _ in group)
+                continue
+            for _, params, _, _ in group:
+                cursor = await db.execute(sql, params)
+                if fetch == 'lastrowid':
+                    results.append(cursor.lastrowid)
+                else:
+                    results.append(await cursor.fetchone())
+        await db.commit()
+        return results
+    
+    async def _flush_write_batch(self, db, batch: List[tuple]):
+        """提交一批写操作：数据库被锁时指数退避重试，其他错误时拆成单条重试以免连累整批"""
+        for attempt in range(self._write_retries + 1):
+            try:
+                results = await self._execute_write_batch(db, batch)
+                break
+            except sqlite3.OperationalError as e:
+                await db.rollback()
+                if 'locked' in str(e) and attempt < self._write_retries:
+                    await asyncio.sleep(random.expovariate(1 / (0.05 * 2 ** attempt)))
+                    continue
+                error = e
+            except Exception as e:
+                await db.rollback()
+                error = e
+            
+            if len(batch) > 1:
+                for item in batch:
+                    await self._flush_write_batch(db, [item])
+                return
+            logger.error(f"写入失败: {error}")
+            fut = batch[0][-1]
+            if not fut.done():
+                fut.set_exception(error)
+            return
+        
+        for (*_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+    
+    async def close(self):
+        """停止维护任务和写入协程（先处理完队列中已有的写操作）"""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        if self._writer_task is not None and not self._writer_task.done():
+            await self._write_queue.put(None)
+            await self._writer_task
+        self._writer_task = None
+    
     # 消息相关操作
     async def save_message(self, message_data: Dict):
         """保存消息到数据库"""
-        async with self.get_connection() as db:
-            await db.execute("""
-                INSERT INTO messages (
-                    channel_id, channel_name, user_id, username, 
-                    content, attachments, embeds, message_type, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                message_data.get('channel_id'),
-                message_data.get('channel_name'),
-                message_data.get('author_id'),
-                message_data.get('author'),
-                message_data.get('content'),
-                json.dumps(message_data.get('attachments', [])),
-                json.dumps(message_data.get('embeds', [])),
-                message_data.get('type', 'general'),
-                message_data.get('timestamp')
-            ))
-            await db.commit()
+        await self._submit_write(_SQL_INSERT_MESSAGE, (
+            message_data.get('channel_id'),
+            message_data.get('channel_name'),
+            message_data.get('author_id'),
+            message_data.get('author'),
+            message_data.get('content'),
+            json.dumps(message_data.get('attachments', [])),
+            json.dumps(message_data.get('embeds', [])),
+            message_data.get('type', 'general'),
+            message_data.get('timestamp')
+        ))
+        self._cache_invalidate('messages', message_data.get('channel_id'))
     
     async def get_recent_messages(self, channel_id: str, limit: int = 100) -> List[Dict]:
-        """获取频道最近的消息"""
+        """获取频道最近的消息（短时缓存）"""
+        cache_key = ('messages', channel_id, limit)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         async with self.get_connection() as db:
-            cursor = await db.execute("""
-                SELECT * FROM messages 
+            cursor = await db.execute(_select_sql('messages', _MESSAGE_COLS) + """
                 WHERE channel_id = ? 
                 ORDER BY timestamp DESC 
                 LIMIT ?
             """, (channel_id, limit))
             
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+        return self._cache_put(cache_key, [dict(zip(_MESSAGE_COLS, row)) for row in rows])
     
     async def cleanup_old_messages(self, days: int = 30):
         """清理旧消息"""
-        async with self.get_connection() as db:
-            await db.execute("""
-                DELETE FROM messages 
-                WHERE timestamp < datetime('now', '-{} days')
-            """.format(days))
-            await db.commit()
+        await self._submit_write("""
+            DELETE FROM messages 
+            WHERE timestamp < datetime('now', ?)
+        """, (f'-{int(days)} days',))
+        self._cache_invalidate('messages')
     
     # 交易信号相关操作
     async def save_trading_signal(self, signal: Dict) -> int:
-        """保存交易信号"""
-        async with self.get_connection() as db:
-            cursor = await db.execute("""
-                INSERT INTO trading_signals (
-                    signal_key, symbol, side, entry_price, 
-                    stop_loss, take_profit, channel
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                signal.get('signal_key'),
-                signal.get('symbol'),
-                signal.get('side'),
-                signal.get('entry_price'),
-                signal.get('stop_loss'),
-                signal.get('take_profit'),
-                signal.get('channel')
-            ))
-            await db.commit()
-            return cursor.lastrowid
+        """保存交易信号（signal_key已存在时更新价格，返回信号id）"""
+        row = await self._submit_write(_SQL_UPSERT_SIGNAL, (
+            signal.get('signal_key'),
+            signal.get('symbol'),
+            signal.get('side'),
+            signal.get('entry_price'),
+            signal.get('stop_loss'),
+            signal.get('take_profit'),
+            signal.get('channel')
+        ), fetch='one')
+        return row[0]
     
     async def update_signal_status(self, signal_id: int, status: str, order_id: str = None):
         """更新信号状态"""
-        async with self.get_connection() as db:
-            await db.execute("""
-                UPDATE trading_signals 
-                SET status = ?, order_id = ?, executed_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (status, order_id, signal_id))
-            await db.commit()
+        await self._submit_write(_SQL_UPDATE_SIGNAL_STATUS, (status, order_id, signal_id))
     
-    async def get_pending_signals(self) -> List[Dict]:
-        """获取待处理的信号"""
+    async def get_pending_signals(self) -> List[SignalRow]:
+        """获取待处理的信号（返回SignalRow，需要dict时调用 _asdict()）"""
         async with self.get_connection() as db:
-            cursor = await db.execute("""
-                SELECT * FROM trading_signals 
+            db.row_factory = _signal_row_factory
+            cursor = await db.execute(_select_sql('trading_signals', _PENDING_SIGNAL_COLS) + """
                 WHERE status = 'pending' 
                 ORDER BY created_at ASC
             """)
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+            return await cursor.fetchall()
     
     # 订单相关操作
     async def save_order(self, order_data: Dict, signal_id: int = None) -> int:
         """保存订单信息"""
-        async with self.get_connection() as db:
-            cursor = await db.execute("""
-                INSERT INTO orders (
-                    order_id, symbol, side, order_type, quantity, 
-                    price, status, signal_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                order_data.get('orderId'),
-                order_data.get('symbol'),
-                order_data.get('side'),
-                order_data.get('type'),
-                float(order_data.get('origQty', 0)),
-                float(order_data.get('price', 0)),
-                order_data.get('status'),
-                signal_id
-            ))
-            await db.commit()
-            return cursor.lastrowid
+        return await self._submit_write(_SQL_INSERT_ORDER, (
+            order_data.get('orderId'),
+            order_data.get('symbol'),
+            order_data.get('side'),
+            order_data.get('type'),
+            float(order_data.get('origQty', 0)),
+            float(order_data.get('price', 0)),
+            order_data.get('status'),
+            signal_id
+        ), fetch='lastrowid')
     
     async def update_order_status(self, order_id: str, status: str, filled_qty: float = None):
         """更新订单状态"""
-        async with self.get_connection() as db:
-            if filled_qty is not None:
-                await db.execute("""
-                    UPDATE orders 
-                    SET status = ?, filled_quantity = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE order_id = ?
-                """, (status, filled_qty, order_id))
-            else:
-                await db.execute("""
-                    UPDATE orders 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE order_id = ?
-                """, (status, order_id))
-            await db.commit()
+        if filled_qty is not None:
+            await self._submit_write(_SQL_UPDATE_ORDER_STATUS_FILLED, (status, filled_qty, order_id))
+        else:
+            await self._submit_write(_SQL_UPDATE_ORDER_STATUS, (status, order_id))
     
     # 系统指标相关操作
     async def save_metric(self, metric_type: str, metric_name: str, value: float, metadata: Dict = None):
         """保存系统指标"""
-        async with self.get_connection() as db:
-            await db.execute("""
-                INSERT INTO system_metrics (metric_type, metric_name, value, metadata)
-                VALUES (?, ?, ?, ?)
-            """, (
-                metric_type, 
-                metric_name, 
-                value, 
-                json.dumps(metadata) if metadata else None
-            ))
-            await db.commit()
+        await self._submit_write(_SQL_INSERT_METRIC, (
+            metric_type, 
+            metric_name, 
+            value, 
+            json.dumps(metadata) if metadata else None
+        ))
+        self._cache_invalidate('metrics')
     
     async def get_metrics(self, metric_type: str = None, hours: int = 24) -> List[Dict]:
-        """获取系统指标"""
+        """获取系统指标（短时缓存）"""
+        cache_key = ('metrics', metric_type, hours)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         async with self.get_connection() as db:
             if metric_type:
-                cursor = await db.execute("""
-                    SELECT * FROM system_metrics 
+                cursor = await db.execute(_select_sql('system_metrics', _METRIC_COLS) + """
                     WHERE metric_type = ? AND timestamp > datetime('now', '-{} hours')
                     ORDER BY timestamp DESC
                 """.format(hours), (metric_type,))
             else:
-                cursor = await db.execute("""
-                    SELECT * FROM system_metrics 
+                cursor = await db.execute(_select_sql('system_metrics', _METRIC_COLS) + """
                     WHERE timestamp > datetime('now', '-{} hours')
                     ORDER BY timestamp DESC
                 """.format(hours))
             
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+        return self._cache_put(cache_key, [dict(zip(_METRIC_COLS, row)) for row in rows])
     
     # 告警相关操作
     async def save_alert(self, level: str, category: str, message: str, data: Dict = None):
         """保存告警"""
-        async with self.get_connection() as db:
-            await db.execute("""
-                INSERT INTO alerts (level, category, message, data)
-                VALUES (?, ?, ?, ?)
-            """, (level, category, message, json.dumps(data) if data else None))
-            await db.commit()
+        await self._submit_write(_SQL_INSERT_ALERT, (
+            level, category, message, json.dumps(data) if data else None
+        ))
+        self._cache_invalidate('alerts')
     
     async def get_unacknowledged_alerts(self) -> List[Dict]:
-        """获取未确认的告警"""
+        """获取未确认的告警（短时缓存）"""
+        cache_key = ('alerts',)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         async with self.get_connection() as db:
-            cursor = await db.execute("""
-                SELECT * FROM alerts 
+            cursor = await db.execute(_select_sql('alerts', _ALERT_COLS) + """
                 WHERE acknowledged = FALSE 
                 ORDER BY created_at DESC
             """)
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+        return self._cache_put(cache_key, [dict(zip(_ALERT_COLS, row)) for row in rows])
     
     # 数据分析相关
     async def get_trading_stats(self, days: int = 7) -> Dict:
         """获取交易统计"""
+        since = f'-{int(days)} days'
         async with self.get_connection() as db:
-            # 信号统计
+            # 信号与订单统计合并为一次查询，减少aiosqlite线程往返
             cursor = await db.execute("""
-                SELECT status, COUNT(*) as count 
+                SELECT 'signal' AS kind, status, COUNT(*) AS cnt, NULL AS volume
                 FROM trading_signals 
-                WHERE created_at > datetime('now', '-{} days')
+                WHERE created_at > datetime('now', ?)
                 GROUP BY status
-            """.format(days))
-            signal_stats = dict(await cursor.fetchall())
-            
-            # 订单统计
-            cursor = await db.execute("""
-                SELECT status, COUNT(*) as count, SUM(quantity * price) as volume
+                UNION ALL
+                SELECT 'order' AS kind, status, COUNT(*) AS cnt, SUM(quantity * price) AS volume
                 FROM orders 
-                WHERE created_at > datetime('now', '-{} days')
+                WHERE created_at > datetime('now', ?)
                 GROUP BY status
-            """.format(days))
-            order_stats = {row[0]: {'count': row[1], 'volume': row[2] or 0} 
-                          for row in await cursor.fetchall()}
+            """, (since, since))
+            
+            signal_stats = {}
+            order_stats = {}
+            for kind, status, cnt, volume in await cursor.fetchall():
+                if kind == 'signal':
+                    signal_stats[status] = cnt
+                else:
+                    order_stats[status] = {'count': cnt, 'volume': volume or 0}
             
             return {
                 'signals': signal_stats,
@@ -346,19 +591,21 @@ class DatabaseManager:
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
         
-        tables = ['messages', 'trading_signals', 'orders', 'system_metrics', 'alerts']
-        
         async with self.get_connection() as db:
-            for table in tables:
-                cursor = await db.execute(f"SELECT * FROM {table}")
+            for table, cols in _TABLE_COLS.items():
+                cursor = await db.execute(_select_sql(table, cols))
                 rows = await cursor.fetchall()
                 
                 # 转换为JSON格式
-                data = [dict(row) for row in rows]
+                data = [dict(zip(cols, row)) for row in rows]
                 
                 # 保存到文件
-                with open(output_path / f"{table}.json", 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+                if orjson is not None:
+                    with open(output_path / f"{table}.json", 'wb') as f:
+                        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(output_path / f"{table}.json", 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
         
         logger.info(f"数据已导出到: {output_path}")
 
@@ -12,11 +12,16 @@ from datetime import datetime
 from pathlib import Path
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class JSONFormatter(logging.Formatter):
     """JSON格式的日志格式化器"""
     
-    def format(self, record):
+    def _build(self, record) -> dict:
         log_data = {
             'timestamp': datetime.fromtimestamp(record.created).isoformat(),
             'level': record.levelname,
@@ -40,8 +45,62 @@ class JSONFormatter(logging.Formatter):
             log_data['symbol'] = record.symbol
         if hasattr(record, 'operation'):
             log_data['operation'] = record.operation
-            
-        return json.dumps(log_data, ensure_ascii=False)
+        
+        return log_data
+    
+    def format(self, record):
+        return json.dumps(self._build(record), ensure_ascii=False)
+    
+    def format_bytes(self, record) -> bytes:
+        """直接输出UTF-8字节，供二进制日志处理器使用"""
+        log_data = self._build(record)
+        if orjson is not None:
+            return orjson.dumps(log_data, default=str)
+        return json.dumps(log_data, ensure_ascii=False).encode('utf-8')
+
+
+class _RotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """轮转文件处理器：文件已打开时只按tell()判断轮转，跳过每次emit的os.stat"""
+    
+    def shouldRollover(self, record):
+        if self.stream is None or self.maxBytes <= 0:
+            return super().shouldRollover(record)
+        pos = self.stream.tell()
+        # 与标准库一致：空文件不轮转，否则单条超过maxBytes的记录会在每次emit时轮转出空的备份
+        if not pos:
+            return False
+        msg = "%s\n" % self.format(record)
+        return pos + len(msg) >= self.maxBytes
+
+
+class _JSONRotatingFileHandler(_RotatingFileHandler):
+    """JSON日志轮转处理器：以二进制追加写入格式化好的字节，省去TextIOWrapper编码层"""
+    
+    def __init__(self, filename, maxBytes: int = 0, backupCount: int = 0, delay: bool = False):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, delay=True)
+        # RotatingFileHandler在maxBytes>0时会强制文本模式，这里改回二进制追加
+        self.mode = 'ab'
+        self.encoding = None
+        self.delay = delay
+        if not delay:
+            self.stream = self._open()
+    
+    def emit(self, record):
+        try:
+            data = self.formatter.format_bytes(record) + b'\n'
+            if self.stream is None:
+                self.stream = self._open()
+            pos = self.stream.tell()
+            if self.maxBytes > 0 and pos and pos + len(data) >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(data)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 
 class LoggerManager:
@@ -156,24 +215,30 @@ class LoggerManager:
         if logger.handlers:
             return logger
         
-        # 文件处理器（带轮转）
-        file_path = self.log_dir / filename
-        file_handler = logging.handlers.RotatingFileHandler(
-            file_path,
-            maxBytes=self.max_bytes,
-            backupCount=self.backup_count,
-            encoding='utf-8'
-        )
-        file_handler.setLevel(level)
-        
-        # 设置格式化器
+        # 文件处理器（带轮转，首次写入时才打开文件）
+        file_path = str((self.log_dir / filename).resolve())
         if use_json:
+            file_handler = _JSONRotatingFileHandler(
+                file_path,
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                delay=True
+            )
             formatter = JSONFormatter()
         else:
+            file_handler = _RotatingFileHandler(
+                file_path,
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding='utf-8',
+                delay=True
+            )
+            file_handler.terminator = '\n'
             formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
         
+        file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
         
@@ -207,6 +272,9 @@ class LoggerManager:
     
     def log_api_call(self, method: str, endpoint: str, duration: float, success: bool, **kwargs):
         """记录API调用"""
+        level = logging.INFO if success else logging.ERROR
+        if not self.api_logger.isEnabledFor(level):
+            return
         extra = {
             'method': method,
             'endpoint': endpoint,
@@ -214,11 +282,12 @@ class LoggerManager:
             'success': success,
             **kwargs
         }
-        level = logging.INFO if success else logging.ERROR
-        self.api_logger.log(level, f"API调用: {method} {endpoint} - {duration:.3f}s", extra=extra)
+        self.api_logger.log(level, "API调用: %s %s - %.3fs", method, endpoint, duration, extra=extra)
     
     def log_performance(self, operation: str, duration: float, memory_usage: dict = None, **kwargs):
         """记录性能信息"""
+        if not self.performance_logger.isEnabledFor(logging.INFO):
+            return
         extra = {
             'operation': operation,
             'duration': duration,
@@ -227,17 +296,19 @@ class LoggerManager:
         if memory_usage:
             extra.update(memory_usage)
         
-        self.performance_logger.info(f"性能: {operation} - {duration:.3f}s", extra=extra)
+        self.performance_logger.info("性能: %s - %.3fs", operation, duration, extra=extra)
     
     def log_discord_message(self, channel_id: str, user_id: str, message_type: str, **kwargs):
         """记录Discord消息"""
+        if not self.discord_logger.isEnabledFor(logging.INFO):
+            return
         extra = {
             'channel_id': channel_id,
             'user_id': user_id,
             'message_type': message_type,
             **kwargs
         }
-        self.discord_logger.info(f"Discord消息: {message_type} from {user_id} in {channel_id}", extra=extra)
+        self.discord_logger.info("Discord消息: %s from %s in %s", message_type, user_id, channel_id, extra=extra)
     
     def log_error(self, error: Exception, context: str = "", **kwargs):
         """记录错误"""
@@ -1,25 +1,55 @@
 # -*- coding: utf-8 -*-
+# SocketIO异步模式：默认优先使用eventlet（协程处理大量长连接），未安装时回退到threading。
+# monkey_patch 必须在导入其他模块之前执行，使 time.sleep/requests/threading 变为协作式。
+import os
+SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'eventlet')
+if SOCKETIO_ASYNC_MODE == 'eventlet':
+    try:
+        import eventlet
+        eventlet.monkey_patch()
+    except ImportError:
+        SOCKETIO_ASYNC_MODE = 'threading'
+
 import json
 import time
 import pandas as pd
 import numpy as np
-import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from flask import Flask, render_template, jsonify, request, send_from_directory
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 from Binance_price_monitor import BinanceRestPriceMonitor
 import threading
 import requests
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from collections import defaultdict
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, QueueHandler, QueueListener
+import queue
+import atexit
+import io
+import zlib
 import logging
 from pathlib import Path
 import sys
 import traceback
 from typing import Optional, Dict, List, Any
 import re
+import math
+import csv
+import glob
 
 # 配置日志
+log_listener: Optional[QueueListener] = None
+
+@atexit.register
+def _stop_log_listener():
+    """停止日志监听线程，并输出队列中剩余的日志"""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
 def setup_logging():
     """配置日志系统"""
     # 创建日志目录
@@ -34,7 +64,7 @@ def setup_logging():
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
     
-    # 添加文件处理器 - 按大小轮转
+    # 文件处理器 - 按大小轮转
     file_handler = RotatingFileHandler(
         os.path.join(log_dir, 'app.log'),
         maxBytes=10*1024*1024,  # 10MB
@@ -44,9 +74,8 @@ def setup_logging():
     file_handler.setFormatter(logging.Formatter(
         '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
     ))
-    logger.addHandler(file_handler)
     
-    # 添加按时间轮转的处理器 - 每天轮转
+    # 按时间轮转的处理器 - 每天轮转
     time_handler = TimedRotatingFileHandler(
         os.path.join(log_dir, 'daily.log'),
         when='midnight',
@@ -57,14 +86,21 @@ def setup_logging():
     time_handler.setFormatter(logging.Formatter(
         '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
     ))
-    logger.addHandler(time_handler)
     
-    # 添加控制台处理器
+    # 控制台处理器
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(logging.Formatter(
         '%(asctime)s [%(levelname)s] %(message)s'
     ))
-    logger.addHandler(console_handler)
+    
+    # 实际的文件/控制台输出放到QueueListener线程中执行，业务线程只需把日志记录放入队列
+    global log_listener
+    _stop_log_listener()
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    log_listener = QueueListener(log_queue, file_handler, time_handler, console_handler,
+                                 respect_handler_level=True)
+    log_listener.start()
     
     # 设置其他模块的日志级别
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
@@ -83,6 +119,38 @@ try:
 except ImportError:
     logger.warning("openpyxl未安装，Excel保存功能可能无法正常工作。请运行: pip install openpyxl")
 
+# 可选：calamine（Rust实现）解析xlsx比openpyxl快数倍，仅用于读取
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_READ_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_READ_ENGINE = None
+
+# 可选：pyarrow的多线程CSV解析器和Arrow字符串类型
+# 字符串列的 strip/upper/len 在Arrow字符串数组上执行，无需逐个创建Python str对象
+# 同时决定新完成订单用parquet还是xlsx存储
+try:
+    import pyarrow  # noqa: F401
+    CSV_READ_ENGINE = 'pyarrow'
+    STRING_DTYPE = 'string[pyarrow]'
+    PARQUET_AVAILABLE = True
+except ImportError:
+    CSV_READ_ENGINE = 'c'
+    STRING_DTYPE = 'string'
+    PARQUET_AVAILABLE = False
+
+# 可选：numba将风险收益比/盈亏的批量计算编译为机器码（cache=True避免每次启动重新编译）
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def read_excel_fast(path, **kwargs):
+    """读取Excel：已安装python-calamine时使用calamine引擎，否则使用pandas默认引擎"""
+    if EXCEL_READ_ENGINE and 'engine' not in kwargs:
+        kwargs['engine'] = EXCEL_READ_ENGINE
+    return pd.read_excel(path, **kwargs)
+
 # 初始化应用
 app = Flask(__name__, static_url_path='', static_folder='static')
 # 修改CORS设置
@@ -108,7 +176,58 @@ allowed_origins = [
     "https://8.209.208.159:8080",
     "*"  # 临时允许所有来源以测试连接性
 ]
-socketio = SocketIO(app, cors_allowed_origins=allowed_origins, async_mode='threading', logger=False, engineio_logger=False)
+# 可选：orjson序列化（比标准库json快数倍，原生支持numpy数值和datetime）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _orjson_default(obj):
+    """orjson不能直接序列化的对象（pd.Timestamp、NaT等）交给make_json_serializable转换"""
+    value = make_json_serializable(obj)
+    if value is obj:
+        raise TypeError(f"无法序列化的类型: {type(obj).__name__}")
+    return value
+
+def orjson_dumps(obj):
+    """使用orjson序列化为字符串，NaN/Inf输出为null，时间统一格式化为 %Y-%m-%d %H:%M:%S"""
+    return orjson.dumps(obj, default=_orjson_default,
+                        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_PASSTHROUGH_DATETIME).decode('utf-8')
+
+class OrjsonModule:
+    """提供与标准库json相同 dumps/loads 接口的orjson适配器，供Flask-SocketIO编码数据包"""
+    
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return orjson_dumps(obj)
+    
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
+# 广播（不指定to）时python-socketio只编码一次数据包，所有客户端共享同一帧，
+# 因此数据包编码使用orjson后，广播的编码开销与客户端数量无关
+socketio_options = {}
+if orjson is not None:
+    socketio_options['json'] = OrjsonModule
+    # HTTP接口的jsonify同样使用orjson（Flask 2.2+）
+    try:
+        from flask.json.provider import DefaultJSONProvider
+        
+        class OrjsonProvider(DefaultJSONProvider):
+            def dumps(self, obj, **kwargs):
+                return orjson_dumps(obj)
+            
+            def loads(self, s, **kwargs):
+                return orjson.loads(s)
+        
+        app.json = OrjsonProvider(app)
+    except ImportError:
+        pass
+
+socketio = SocketIO(app, cors_allowed_origins=allowed_origins, async_mode=SOCKETIO_ASYNC_MODE, logger=False, engineio_logger=False,
+                    **socketio_options)
 
 # 支持的交易对
 AVAILABLE_SYMBOLS = {
@@ -134,22 +253,56 @@ monitoring_active: bool = False
 price_data: Dict[str, Any] = {}
 active_orders: List[Dict[str, Any]] = []
 completed_orders: List[Dict[str, Any]] = []
-orders_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+orders_by_symbol: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
 # 山寨币数据 - 新增的全局变量
 altcoin_active_orders: List[Dict[str, Any]] = []
 altcoin_completed_orders: List[Dict[str, Any]] = []
-altcoin_orders_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+altcoin_orders_by_symbol: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 last_altcoin_csv_modification_time: float = 0  # 山寨币CSV文件修改时间
 
+# 当前时间字符串缓存：(秒级时间戳, 格式化结果)，同一秒内的调用直接复用
+_now_str_cache = (0, '')
+
+def now_str():
+    """返回当前时间字符串（%Y-%m-%d %H:%M:%S），每秒只格式化一次"""
+    global _now_str_cache
+    second = int(time.time())
+    cached_second, cached_str = _now_str_cache
+    if second != cached_second:
+        cached_str = datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+        _now_str_cache = (second, cached_str)
+    return cached_str
+
+def elapsed_seconds(start, end):
+    """两个 %Y-%m-%d %H:%M:%S 格式时间字符串之间的秒数（datetime64相减），格式不符时抛出ValueError"""
+    if len(start) != 19 or len(end) != 19:
+        raise ValueError(f"时间格式不正确: {start!r}, {end!r}")
+    return int((np.datetime64(end, 's') - np.datetime64(start, 's')) // np.timedelta64(1, 's'))
+
+# 同一位置同一异常类型每60秒最多记录一次完整堆栈，交易所故障等异常频繁的情况下不会反复格式化堆栈
+TRACEBACK_LOG_INTERVAL = 60
+_traceback_log_times: Dict[tuple, float] = {}
+
+def log_error_with_traceback(message):
+    """在except块中调用：记录错误消息，按 TRACEBACK_LOG_INTERVAL 限频附带完整堆栈（通过日志队列异步输出）"""
+    caller = sys._getframe(1)
+    key = (caller.f_code, caller.f_lineno, sys.exc_info()[0])
+    current_time = time.time()
+    if current_time - _traceback_log_times.get(key, 0) >= TRACEBACK_LOG_INTERVAL:
+        _traceback_log_times[key] = current_time
+        logger.error(message, exc_info=True)
+    else:
+        logger.error(message)
+
 # 智能数据推送控制
-last_data_hash: str = ""
+last_data_key: Optional[tuple] = None
 last_push_time: float = 0
 min_push_interval: float = 15  # 最小推送间隔15秒
 
 def should_push_data():
     """检测数据是否真正变化，决定是否需要推送"""
-    global last_data_hash, last_push_time, min_push_interval
+    global last_data_key, last_push_time, min_push_interval
     
     current_time = time.time()
     
@@ -157,29 +310,78 @@ def should_push_data():
     if current_time - last_push_time < min_push_interval:
         return False
     
-    # 计算当前数据的哈希值
-    import hashlib
-    data_str = f"{len(active_orders)}_{len(completed_orders)}"
-    
-    # 添加活跃订单的关键信息
-    for order in active_orders[:5]:  # 只检查前5个订单，避免计算过多
-        data_str += f"_{order.get('id', '')}_{order.get('profit_pct', '')}"
-    
-    # 添加已完成订单的关键信息
-    for order in completed_orders[:5]:  # 只检查前5个订单
-        data_str += f"_{order.get('id', '')}_{order.get('result', '')}"
-    
-    current_hash = hashlib.md5(data_str.encode()).hexdigest()
+    # 数据变化检测只需相等比较，直接用元组作为键，无需拼接字符串再做md5
+    current_key = (
+        len(active_orders),
+        len(completed_orders),
+        # 只检查前5个订单，避免计算过多
+        tuple((order.get('id'), order.get('profit_pct')) for order in active_orders[:5]),
+        tuple((order.get('id'), order.get('result')) for order in completed_orders[:5]),
+    )
     
     # 如果数据没有变化，不推送
-    if current_hash == last_data_hash:
+    if current_key == last_data_key:
         return False
     
-    # 更新哈希值和推送时间
-    last_data_hash = current_hash
+    # 更新数据键和推送时间
+    last_data_key = current_key
     last_push_time = current_time
     return True
 
+# WebSocket推送合并：合并窗口内同一事件（同一key）只发送最新的一份数据
+EMIT_COALESCE_INTERVAL: float = 0.5  # 合并窗口（秒）
+EMIT_CHUNK_SIZE: int = 20  # 每发送这么多个事件让出一次，避免长时间占用socketio
+# 为True时，每个合并窗口内的所有事件合并为一个 tick_update 帧发送（前端需按合并后的格式处理），
+# 默认关闭以兼容按事件名监听的现有页面
+EMIT_BATCHED_TICKS: bool = False
+_pending_emits: Dict[tuple, Any] = {}
+_pending_emits_lock = threading.Lock()
+_emit_flusher_started = False
+
+def queue_emit(event_name, data, key=None):
+    """将事件放入待推送队列，由后台任务按合并窗口统一发送
+    
+    key用于区分同一事件的不同对象（如按币种的价格更新），相同(event_name, key)只保留最新数据。
+    """
+    global _emit_flusher_started
+    with _pending_emits_lock:
+        # 先删除再插入，保证发送顺序与最后一次更新的顺序一致
+        _pending_emits.pop((event_name, key), None)
+        _pending_emits[(event_name, key)] = data
+        if _emit_flusher_started:
+            return
+        _emit_flusher_started = True
+    socketio.start_background_task(_emit_flush_loop)
+
+def _emit_flush_loop():
+    """后台推送任务：每个合并窗口发送一次积压的事件"""
+    while True:
+        socketio.sleep(EMIT_COALESCE_INTERVAL)
+        with _pending_emits_lock:
+            if not _pending_emits:
+                continue
+            batch = list(_pending_emits.items())
+            _pending_emits.clear()
+        
+        if EMIT_BATCHED_TICKS:
+            # 一个窗口只发送一帧：{'events': [{'event': 事件名, 'data': 数据}, ...], 'timestamp': ...}
+            try:
+                socketio.emit('tick_update', {
+                    'events': [{'event': event_name, 'data': data} for (event_name, _), data in batch],
+                    'timestamp': now_str()
+                })
+            except Exception as e:
+                logger.debug(f"发送合并WebSocket事件时出错: {e}")
+            continue
+        
+        for i, ((event_name, _), data) in enumerate(batch, 1):
+            try:
+                socketio.emit(event_name, data)
+            except Exception as e:
+                logger.debug(f"发送WebSocket事件 {event_name} 时出错: {e}")
+            if i % EMIT_CHUNK_SIZE == 0:
+                socketio.sleep(0)
+
 # 页面标题配置
 TITLE_CONFIG = {
     # 页面标题
@@ -252,9 +454,27 @@ def safe_convert_float(value):
     except (ValueError, TypeError):
         return None
 
+# 视为空值的字符串（小写）；最长4个字符，更长的字符串无需调用lower()
+NULL_STRINGS = frozenset(('nan', 'none', 'null', ''))
+
 # 转换为JSON可序列化格式
 def make_json_serializable(obj):
-    import math
+    
+    # 快速路径：订单字段绝大多数是原生str/float/int，按精确类型分派，避免逐个isinstance判断
+    obj_type = type(obj)
+    if obj_type is str:
+        if len(obj) <= 4 and obj.lower() in NULL_STRINGS:
+            return None
+        return obj
+    if obj_type is float:
+        # NaN和inf相减都得到NaN
+        return obj if obj - obj == 0 else None
+    if obj_type is int or obj_type is bool:
+        return obj
+    if obj_type is dict:
+        return {k: make_json_serializable(v) for k, v in obj.items()}
+    if obj_type is list:
+        return [make_json_serializable(item) for item in obj]
     
     # 处理NaN和None值
     if obj is pd.NaT or obj is np.nan or obj is None:
@@ -286,70 +506,111 @@ def make_json_serializable(obj):
     
     # 处理字符串类型的NaN
     elif isinstance(obj, str):
-        if obj.lower() in ['nan', 'none', 'null', '']:
+        if obj.lower() in NULL_STRINGS:
             return None
         return obj
     
     return obj
 
+# 推送用的序列化结果缓存：名称 -> (订单字段快照, make_json_serializable结果, 是否已推送)
+_serialized_orders_cache: Dict[str, list] = {}
+
+def serialize_orders_cached(name, orders):
+    """make_json_serializable 的缓存版本：订单列表的所有字段值都未变化时直接复用上次的结果
+    
+    比较的是每个订单 items() 的快照，不依赖部分字段，编辑订单等任意字段变化都会重新序列化。
+    返回 (序列化结果, 自上次标记推送后是否有变化)。
+    """
+    snapshot = [tuple(order.items()) for order in orders]
+    cached = _serialized_orders_cache.get(name)
+    if cached is not None and cached[0] == snapshot:
+        return cached[1], not cached[2]
+    data = make_json_serializable(orders)
+    _serialized_orders_cache[name] = [snapshot, data, False]
+    return data, True
+
+def mark_orders_pushed(*names):
+    """标记这些订单列表的当前序列化结果已推送"""
+    for name in names:
+        if name in _serialized_orders_cache:
+            _serialized_orders_cache[name][2] = True
+
 # 全局变量存储有效的交易对
 valid_symbols_cache = set()
 last_symbols_update = 0
+VALID_SYMBOLS_TTL = 3600  # 1小时
+VALID_SYMBOLS_CACHE_FILE = os.path.join('data', 'cache', 'valid_symbols.json')
+
+# 现货、合约、永续合约的exchangeInfo接口
+EXCHANGE_INFO_URLS = [
+    ('现货', 'https://api.binance.com/api/v3/exchangeInfo'),
+    ('合约', 'https://fapi.binance.com/fapi/v1/exchangeInfo'),
+    ('永续合约', 'https://dapi.binance.com/dapi/v1/exchangeInfo'),
+]
+
+def _fetch_exchange_symbols(market, url):
+    """获取单个市场的USDT交易对，失败返回空集合"""
+    try:
+        response = requests.get(url, timeout=10)
+        if response.status_code != 200:
+            logger.warning(f"无法获取币安{market}交易对信息")
+            return set()
+        data = response.json()
+        symbols = {symbol['symbol'] for symbol in data['symbols']
+                   if symbol['symbol'].endswith('USDT') and symbol['status'] == 'TRADING'}
+        logger.info(f"获取{market}交易对 {len(symbols)} 个")
+        return symbols
+    except Exception as e:
+        logger.warning(f"获取{market}交易对信息失败: {e}")
+        return set()
+
+def _load_valid_symbols_file():
+    """读取磁盘上未过期的交易对缓存，返回(交易对集合, 写入时间)，无可用缓存返回None"""
+    try:
+        mtime = os.path.getmtime(VALID_SYMBOLS_CACHE_FILE)
+        if time.time() - mtime >= VALID_SYMBOLS_TTL:
+            return None
+        with open(VALID_SYMBOLS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            symbols = set(json.load(f))
+        return (symbols, mtime) if symbols else None
+    except (OSError, ValueError, TypeError):
+        return None
+
+def _save_valid_symbols_file(symbols):
+    """将交易对集合写入磁盘缓存，重启后在有效期内无需重新请求"""
+    try:
+        os.makedirs(os.path.dirname(VALID_SYMBOLS_CACHE_FILE), exist_ok=True)
+        tmp_path = VALID_SYMBOLS_CACHE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(sorted(symbols), f)
+        os.replace(tmp_path, VALID_SYMBOLS_CACHE_FILE)
+    except OSError as e:
+        logger.debug(f"写入交易对缓存文件失败: {e}")
 
 def get_valid_symbols():
     """获取币安的有效USDT交易对列表（包含现货和合约）"""
     global valid_symbols_cache, last_symbols_update
-    import time
     
     # 如果缓存过期（超过1小时），重新获取
-    if time.time() - last_symbols_update > 3600:
+    if time.time() - last_symbols_update > VALID_SYMBOLS_TTL:
         try:
-            import requests
-            valid_symbols_cache = set()
+            # 优先使用磁盘缓存，避免每次重启都请求接口
+            cached = _load_valid_symbols_file()
+            if cached is not None:
+                valid_symbols_cache, last_symbols_update = cached
+                _normalize_symbol_cached.cache_clear()
+                logger.info(f"从缓存文件加载有效交易对 {len(valid_symbols_cache)} 个")
+                return valid_symbols_cache
             
-            # 1. 获取现货交易对
-            try:
-                spot_response = requests.get('https://api.binance.com/api/v3/exchangeInfo', timeout=10)
-                if spot_response.status_code == 200:
-                    spot_data = spot_response.json()
-                    spot_symbols = {symbol['symbol'] for symbol in spot_data['symbols'] 
-                                   if symbol['symbol'].endswith('USDT') and symbol['status'] == 'TRADING'}
-                    valid_symbols_cache.update(spot_symbols)
-                    logger.info(f"获取现货交易对 {len(spot_symbols)} 个")
-                else:
-                    logger.warning("无法获取币安现货交易对信息")
-            except Exception as e:
-                logger.warning(f"获取现货交易对信息失败: {e}")
-            
-            # 2. 获取合约交易对
-            try:
-                futures_response = requests.get('https://fapi.binance.com/fapi/v1/exchangeInfo', timeout=10)
-                if futures_response.status_code == 200:
-                    futures_data = futures_response.json()
-                    futures_symbols = {symbol['symbol'] for symbol in futures_data['symbols'] 
-                                      if symbol['symbol'].endswith('USDT') and symbol['status'] == 'TRADING'}
-                    valid_symbols_cache.update(futures_symbols)
-                    logger.info(f"获取合约交易对 {len(futures_symbols)} 个")
-                else:
-                    logger.warning("无法获取币安合约交易对信息")
-            except Exception as e:
-                logger.warning(f"获取合约交易对信息失败: {e}")
-            
-            # 3. 获取永续合约交易对
-            try:
-                perpetual_response = requests.get('https://dapi.binance.com/dapi/v1/exchangeInfo', timeout=10)
-                if perpetual_response.status_code == 200:
-                    perpetual_data = perpetual_response.json()
-                    perpetual_symbols = {symbol['symbol'] for symbol in perpetual_data['symbols'] 
-                                        if symbol['symbol'].endswith('USDT') and symbol['status'] == 'TRADING'}
-                    valid_symbols_cache.update(perpetual_symbols)
-                    logger.info(f"获取永续合约交易对 {len(perpetual_symbols)} 个")
-                else:
-                    logger.warning("无法获取币安永续合约交易对信息")
-            except Exception as e:
-                logger.warning(f"获取永续合约交易对信息失败: {e}")
+            # 三个接口互不依赖，并行请求
+            with ThreadPoolExecutor(max_workers=len(EXCHANGE_INFO_URLS)) as executor:
+                results = list(executor.map(lambda item: _fetch_exchange_symbols(*item), EXCHANGE_INFO_URLS))
             
+            valid_symbols_cache = set().union(*results)
             last_symbols_update = time.time()
+            _normalize_symbol_cached.cache_clear()
+            if valid_symbols_cache:
+                _save_valid_symbols_file(valid_symbols_cache)
             logger.info(f"已更新有效交易对缓存，总共 {len(valid_symbols_cache)} 个USDT交易对")
             
         except Exception as e:
@@ -357,52 +618,74 @@ def get_valid_symbols():
     
     return valid_symbols_cache
 
+# 交易对标准化用到的常量（模块级只构建一次）
+# 处理中文和特殊名称
+_SYMBOL_MAPPING = {
+    '比特币': 'BTC',
+    '以太': 'ETH',
+    '以太坊': 'ETH', 
+    '以太币': 'ETH',
+    'ETHEREUM': 'ETH',
+    'BITCOIN': 'BTC',
+    '莱特币': 'LTC',
+    '瑞波币': 'XRP',
+    'RIPPLE': 'XRP',
+    '狗狗币': 'DOGE',
+    'DOGECOIN': 'DOGE',
+    '索拉纳': 'SOL',
+    'SOLANA': 'SOL',
+    '阿瓦兰奇': 'AVAX',
+    'AVALANCHE': 'AVAX',
+    '波卡': 'DOT',
+    'POLKADOT': 'DOT',
+    '卡尔达诺': 'ADA',
+    'CARDANO': 'ADA',
+    '炼金术': 'ALCH',  
+    'ALCHEMY': 'ALCH'
+}
+# 常见的后缀（只移除第一个匹配的）
+_SYMBOL_SUFFIXES = ('USDT', 'USD', 'PERP', '永续', '合约')
+# 非字母字符（数字、下划线、符号），与 str.isalpha 的判断一致
+_NON_ALPHA_RE = re.compile(r'[\W\d_]')
+# 不获取价格的无效交易对
+INVALID_PRICE_SYMBOLS = frozenset([
+    'ALCHUSDT', 'USDT', 'USDTUSDT', 
+    'RFCUSDT', 'ZBCNUSDT', 'NANUSDT', 'TAIUSDT'
+])
+# 已知的无效交易对（标准化时排除）
+_KNOWN_INVALID_SYMBOLS = INVALID_PRICE_SYMBOLS | frozenset(['TESTUSDT', 'NULLUSDT', 'EMPTYUSDT'])
+# 白名单：允许特定币种即使不在币安API列表中也能通过验证
+_WHITELIST_SYMBOLS = frozenset([
+    'PUMPFUNUSDT', 'TOSHIUSDT', 'HYPEUSDT', 'BONKUSDT', 'WIFUSDT',
+    'PEPEUSDT', 'SHIBUSDT', 'FLOKIUSDT', 'MEMEUSDT', 'DOGEUSDT'
+])
+
 # 支持的交易对 - 支持所有交易对
 def normalize_symbol(symbol):
     """标准化交易对名称"""
     if not symbol:
         return None
     
-    symbol = str(symbol).strip().upper()
-    
-    # 处理中文和特殊名称
-    symbol_mapping = {
-        '比特币': 'BTC',
-        '以太': 'ETH',
-        '以太坊': 'ETH', 
-        '以太币': 'ETH',
-        'ETHEREUM': 'ETH',
-        'BITCOIN': 'BTC',
-        '莱特币': 'LTC',
-        '瑞波币': 'XRP',
-        'RIPPLE': 'XRP',
-        '狗狗币': 'DOGE',
-        'DOGECOIN': 'DOGE',
-        '索拉纳': 'SOL',
-        'SOLANA': 'SOL',
-        '阿瓦兰奇': 'AVAX',
-        'AVALANCHE': 'AVAX',
-        '波卡': 'DOT',
-        'POLKADOT': 'DOT',
-        '卡尔达诺': 'ADA',
-        'CARDANO': 'ADA',
-        '炼金术': 'ALCH',  
-        'ALCHEMY': 'ALCH'
-    }
-    
+    # 缓存命中时不会再调用 get_valid_symbols，这里检查有效交易对列表是否过期（刷新时会清空缓存）
+    if time.time() - last_symbols_update > VALID_SYMBOLS_TTL:
+        get_valid_symbols()
+    return _normalize_symbol_cached(str(symbol).strip().upper())
+
+# 币种数量远小于订单行数，按币种缓存标准化结果；有效交易对列表更新时清空
+@lru_cache(maxsize=4096)
+def _normalize_symbol_cached(symbol):
+    """标准化已去空白并转大写的交易对名称"""
     # 先尝试映射
-    if symbol in symbol_mapping:
-        symbol = symbol_mapping[symbol]
+    symbol = _SYMBOL_MAPPING.get(symbol, symbol)
     
     # 移除常见的后缀
-    suffixes_to_remove = ['USDT', 'USD', 'PERP', '永续', '合约']
-    for suffix in suffixes_to_remove:
+    for suffix in _SYMBOL_SUFFIXES:
         if symbol.endswith(suffix):
             symbol = symbol[:-len(suffix)]
             break
     
     # 移除特殊字符和数字
-    symbol = ''.join(c for c in symbol if c.isalpha())
+    symbol = _NON_ALPHA_RE.sub('', symbol)
     
     # 验证符号长度（通常币安交易对符号是2-10个字符）
     if len(symbol) < 1 or len(symbol) > 10:
@@ -413,35 +696,403 @@ def normalize_symbol(symbol):
     result = f"{symbol}USDT"
     
     # 验证是否为已知的无效交易对
-    known_invalid = [
-        'ALCHUSDT', 'USDT', 'USDTUSDT', 
-        'RFCUSDT', 'ZBCNUSDT', 'NANUSDT', 'TAIUSDT',
-        'TESTUSDT', 'NULLUSDT', 'EMPTYUSDT'
-    ]
-    if result in known_invalid:
+    if result in _KNOWN_INVALID_SYMBOLS:
         logger.debug(f"跳过已知无效的交易对: {result}")
         return None
     
-    # 验证交易对格式（应该是字母+USDT）
-    base_symbol = result[:-4]  # 移除USDT
-    if not base_symbol.isalpha() or len(base_symbol) < 1:
-        logger.debug(f"交易对格式无效: {result}")
-        return None
-    
-    # 白名单：允许特定币种即使不在币安API列表中也能通过验证
-    whitelist_symbols = [
-        'PUMPFUNUSDT', 'TOSHIUSDT', 'HYPEUSDT', 'BONKUSDT', 'WIFUSDT',
-        'PEPEUSDT', 'SHIBUSDT', 'FLOKIUSDT', 'MEMEUSDT', 'DOGEUSDT'
-    ]
-    
     # 验证是否为币安支持的有效交易对
     valid_symbols = get_valid_symbols()
-    if valid_symbols and result not in valid_symbols and result not in whitelist_symbols:
+    if valid_symbols and result not in valid_symbols and result not in _WHITELIST_SYMBOLS:
         logger.debug(f"币安不支持的交易对: {result}")
         return None
     
     return result
 
+def normalize_symbol_series(symbols):
+    """向量化版本的 normalize_symbol，无效的交易对为None
+    
+    交易币种大量重复，只对去重后的币种做标准化，再按编码映射回每一行。
+    """
+    codes, uniques = pd.factorize(symbols.astype(str).str.strip().str.upper())
+    normalized = np.append(_normalize_unique_symbols(pd.Series(uniques, dtype=object)), None)
+    result = normalized[codes]
+    
+    invalid_count = int(pd.isna(result).sum())
+    if invalid_count:
+        logger.debug(f"标准化交易对时跳过 {invalid_count} 个无效交易对")
+    return pd.Series(result, index=symbols.index, dtype=object)
+
+def _normalize_unique_symbols(symbol):
+    """normalize_symbol_series 的实现：输入为去重后的大写币种，返回object数组"""
+    symbol = symbol.map(lambda value: _SYMBOL_MAPPING.get(value, value))
+    
+    # 移除常见的后缀（每个值只移除第一个匹配的后缀）
+    stripped = pd.Series(False, index=symbol.index)
+    for suffix in _SYMBOL_SUFFIXES:
+        hit = ~stripped & symbol.str.endswith(suffix)
+        symbol = symbol.where(~hit, symbol.str.slice(0, -len(suffix)))
+        stripped |= hit
+    
+    symbol = symbol.str.replace(_NON_ALPHA_RE, '', regex=True)
+    result = symbol + 'USDT'
+    
+    valid = symbol.str.len().between(1, 10) & ~result.isin(_KNOWN_INVALID_SYMBOLS)
+    valid_symbols = get_valid_symbols()
+    if valid_symbols:
+        valid &= result.isin(valid_symbols) | result.isin(_WHITELIST_SYMBOLS)
+    return object_values(result.where(valid))
+
+# 源文件解析缓存：(path, usecols) -> ((mtime, size), DataFrame)，文件未变化时直接复用
+# 按最近使用顺序保存（字典顺序），超过 TABLE_CACHE_MAXSIZE 个时淘汰最久未使用的（如旧的价格历史归档）
+_table_cache: Dict[tuple, tuple] = {}
+TABLE_CACHE_MAXSIZE = 16
+TABLE_CACHE_DIR = os.path.join('data', 'cache')
+
+# all_analysis_results.csv 中订单加载需要的列，其余列（分析原文等）不解析
+ANALYSIS_CSV_COLUMNS = (
+    'timestamp', 'channel',
+    'analysis.交易币种', 'analysis.方向', 'analysis.入场点位1',
+    'analysis.止损点位1', 'analysis.止盈点位1',
+    'status', 'result', 'exit_price', 'exit_time', 'hold_time', 'profit',
+    # 山寨币活跃订单用到的分析内容和原文
+    'analysis.分析内容', 'analysis.原文',
+)
+# 取值重复度高的文本列使用category，筛选时按类别比较而不是逐行比较字符串
+ANALYSIS_CSV_DTYPES = {
+    'analysis.交易币种': 'category',
+    'analysis.方向': 'category',
+    'channel': 'category',
+}
+
+# CSV增量读取状态：cache_key -> (已解析的字节数, 这部分内容的crc32, 文件表头)
+_csv_tail_state: Dict[tuple, tuple] = {}
+
+def read_csv_columns(source, usecols=None, dtype=None, header=None):
+    """只解析需要的列（文件中不存在的列自动忽略），安装了pyarrow时使用pyarrow引擎
+    
+    source为文件路径或bytes；传入header（列名列表）时表示source是不带表头的数据行。
+    usecols可以是列名集合，也可以是按列名判断是否需要的函数。
+    """
+    def open_source():
+        return io.BytesIO(source) if isinstance(source, bytes) else source
+    
+    options = {'dtype': dtype, 'engine': CSV_READ_ENGINE}
+    if header is not None:
+        options.update(header=None, names=header)
+    if usecols is not None:
+        columns = header if header is not None else pd.read_csv(open_source(), nrows=0).columns
+        wanted = usecols if callable(usecols) else set(usecols).__contains__
+        options['usecols'] = [col for col in columns if wanted(col)]
+        if dtype:
+            options['dtype'] = {col: kind for col, kind in dtype.items() if wanted(col)}
+    return pd.read_csv(open_source(), **options)
+
+def _ends_at_csv_record_boundary(data):
+    """CSV内容是否以完整的记录结尾
+    
+    只看末尾换行不够：分析原文等字段是带引号的多行文本，写到一半时可能正好停在字段内的换行处。
+    引号字段内的双引号都转义为两个，引号总数为偶数时末尾的换行才在引号字段之外。
+    """
+    return data.endswith(b'\n') and data.count(b'"') % 2 == 0
+
+def _read_csv_incremental(path, cache_key, usecols, dtype):
+    """增量解析CSV：文件只在末尾追加了数据时只解析新增的行
+    
+    通过比较已解析部分的crc32确认前缀没有变化，整文件重写或修改历史行时完整重新解析。
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    state = _csv_tail_state.pop(cache_key, None)
+    cached = _table_cache.get(cache_key)
+    complete = _ends_at_csv_record_boundary(data)
+    df = None
+    header = None
+    if (state is not None and cached is not None and complete and len(data) > state[0]
+            and zlib.crc32(data[:state[0]]) == state[1]):
+        offset, _, header = state
+        try:
+            tail_df = read_csv_columns(data[offset:], usecols, dtype, header=header)
+            df = pd.concat([cached[1], tail_df], ignore_index=True)
+            # 拼接后类别不同的category列会退化为object，重新转换
+            for col, kind in (dtype or {}).items():
+                if col in df.columns and df[col].dtype != kind:
+                    df[col] = df[col].astype(kind)
+            logger.debug(f"增量解析CSV {path}: 新增 {len(tail_df)} 行")
+        except Exception as e:
+            logger.debug(f"增量解析CSV失败，改为完整解析: {e}")
+            df = None
+    
+    if df is None:
+        df = read_csv_columns(data, usecols, dtype)
+        header = list(pd.read_csv(io.BytesIO(data), nrows=0).columns)
+    
+    # 文件末尾不在记录边界时可能正在写入，下次完整解析
+    if complete:
+        _csv_tail_state[cache_key] = (len(data), zlib.crc32(data), header)
+    return df
+
+def read_table_cached(path, usecols=None, dtype=None):
+    """按文件mtime/大小缓存Excel/CSV的解析结果
+    
+    Excel额外在 data/cache 下保存parquet快照，重启后源文件未变化时无需重新解析。
+    CSV可以通过usecols/dtype只解析需要的列，不同的列组合分别缓存；文件只追加时只解析新增的行。
+    返回的DataFrame是共享对象，调用方只能筛选，不能原地修改。
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime, stat.st_size)
+    cache_key = (path, tuple(usecols) if usecols else None)
+    cached = _table_cache.get(cache_key)
+    if cached is not None and cached[0] == key:
+        # 移到末尾，标记为最近使用
+        _table_cache[cache_key] = _table_cache.pop(cache_key)
+        return cached[1]
+    
+    is_excel = path.endswith(('.xlsx', '.xls'))
+    parquet_path = os.path.join(TABLE_CACHE_DIR, os.path.basename(path) + '.parquet')
+    df = None
+    if is_excel and os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= stat.st_mtime:
+        try:
+            df = pd.read_parquet(parquet_path)
+        except Exception as e:
+            logger.debug(f"读取parquet缓存失败，改为解析源文件: {e}")
+    
+    if df is None:
+        if is_excel:
+            df = read_excel_fast(path)
+            try:
+                os.makedirs(TABLE_CACHE_DIR, exist_ok=True)
+                df.to_parquet(parquet_path, compression='zstd')
+            except Exception as e:
+                # 未安装pyarrow或存在混合类型列时只使用内存缓存
+                logger.debug(f"写入parquet缓存失败: {e}")
+        else:
+            df = _read_csv_incremental(path, cache_key, usecols, dtype)
+    
+    _table_cache.pop(cache_key, None)
+    _table_cache[cache_key] = (key, df)
+    while len(_table_cache) > TABLE_CACHE_MAXSIZE:
+        evicted = next(iter(_table_cache))
+        del _table_cache[evicted]
+        _csv_tail_state.pop(evicted, None)
+    return df
+
+# 主流币种（BTC/ETH/SOL订单表只保留这些，山寨币表排除这些）
+MAJOR_SYMBOLS = frozenset(['BTC', 'ETH', 'SOL'])
+
+# 主流币种的裸币种和USDT交易对两种写法，一次isin即可判断，无需逐个去掉后缀
+MAJOR_SYMBOL_FORMS = MAJOR_SYMBOLS | frozenset(symbol + 'USDT' for symbol in MAJOR_SYMBOLS)
+
+def symbol_upper_series(series):
+    """向量化：去空白并转大写（空值为NA）"""
+    return series.astype(STRING_DTYPE).str.strip().str.upper()
+
+def unique_values_mask(series, classify):
+    """对去重后的取值调用classify得到布尔结果，再按编码映射回每一行（空值为False）
+    
+    交易币种重复度很高，字符串处理只需对每个不同的币种做一次。
+    """
+    codes, uniques = pd.factorize(series)
+    flags = np.append(np.asarray(classify(pd.Series(uniques)), dtype=bool), False)
+    return pd.Series(flags[codes], index=series.index)
+
+def _is_major_symbol(symbols):
+    return symbol_upper_series(symbols).isin(MAJOR_SYMBOL_FORMS)
+
+def _is_altcoin_symbol(symbols):
+    symbols = symbol_upper_series(symbols)
+    return (symbols.str.len().fillna(0) > 0) & ~symbols.isin(MAJOR_SYMBOL_FORMS | {'USDT'})
+
+def major_symbol_mask(series):
+    """向量化：BTC/ETH/SOL（含USDT交易对写法）"""
+    return unique_values_mask(series, _is_major_symbol)
+
+def altcoin_symbol_mask(series):
+    """向量化：非空且不是主流币种的交易币种（单独的"USDT"去掉后缀后为空，同样排除）"""
+    return unique_values_mask(series, _is_altcoin_symbol)
+
+def non_blank_mask(series):
+    """向量化：非空且去空白后不为空字符串"""
+    return series.astype(STRING_DTYPE).str.strip().str.len().fillna(0) > 0
+
+def target_or_stop_mask(df, target_col, stop_col):
+    """向量化：止盈点位或止损点位至少有一个是有效的非零数值"""
+    target = pd.to_numeric(df[target_col], errors='coerce')
+    stop = pd.to_numeric(df[stop_col], errors='coerce')
+    return (target.notna() & (target != 0)) | (stop.notna() & (stop != 0))
+
+def status_completed_mask(df):
+    """向量化：status列为completed的行（没有status列时全部为False）"""
+    if 'status' in df.columns:
+        return df['status'].eq('completed')
+    return pd.Series(False, index=df.index)
+
+def empty_mask(df, col):
+    """向量化：值为空或空字符串（没有该列时视为空）"""
+    if col in df.columns:
+        values = df[col]
+        return values.isna() | (values == '')
+    return pd.Series(True, index=df.index)
+
+def numeric_column(df, col, default=np.nan):
+    """向量化：列存在时返回 pd.to_numeric 结果（无效值为NaN），列不存在时返回default"""
+    if col and col in df.columns:
+        return pd.to_numeric(df[col], errors='coerce')
+    return pd.Series(default, index=df.index, dtype=float)
+
+def profit_column(df):
+    """向量化：profit列有值时取profit，否则取weighted_profit_pct，转为数值（无效值为NaN）"""
+    profit = raw_column(df, 'profit', np.nan)
+    return numeric_column(df, 'profit').where(profit.notna(), numeric_column(df, 'weighted_profit_pct'))
+
+def first_numeric_column(df, cols):
+    """向量化：按列顺序取每行第一个非空的值并转为数值（无法转换为NaN）"""
+    result = pd.Series(np.nan, index=df.index)
+    pending = pd.Series(True, index=df.index)
+    for col in cols:
+        present = pending & df[col].notna()
+        result = result.where(~present, pd.to_numeric(df[col], errors='coerce'))
+        pending &= ~present
+    return result
+
+def text_values(df, col, default=None):
+    """列值转为字符串并去空白，取出为object数组（缺失值或没有该列时为default）"""
+    if not col or col not in df.columns:
+        return np.full(len(df), default, dtype=object)
+    values = df[col]
+    text = values.astype(str).str.strip().astype(object)
+    return text.where(values.notna(), default).to_numpy()
+
+def percent_column(df, col):
+    """向量化：百分比列去掉'%'后转为数值，无效值为NaN"""
+    if col and col in df.columns:
+        values = df[col]
+        percent = values.astype(str).str.replace('%', '', regex=False)
+        return pd.to_numeric(percent, errors='coerce').where(values.notna())
+    return pd.Series(np.nan, index=df.index, dtype=float)
+
+def raw_column(df, col, default=None):
+    """列存在时原样返回，否则返回default填充的列（与 row.get(col, default) 一致）"""
+    if col and col in df.columns:
+        return df[col]
+    return pd.Series(default, index=df.index, dtype=object)
+
+def text_column(df, col, default):
+    """向量化：列值转为字符串，缺失值使用default"""
+    if col and col in df.columns:
+        values = df[col]
+        return values.astype(str).where(values.notna(), default)
+    return pd.Series(default, index=df.index, dtype=object)
+
+def direction_series(df, col, default='做多'):
+    """向量化：方向列去空白，缺失或非做多/做空的值统一为default"""
+    if not col or col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    direction = df[col].astype(str).str.strip()
+    return direction.where(direction.isin(['做多', '做空']), default)
+
+def publish_time_series(df, col, default):
+    """向量化：datetime列统一格式化为字符串，其他值原样保留，缺失值使用default"""
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    values = df[col]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.dt.strftime('%Y-%m-%d %H:%M:%S')
+    return values.astype(object).where(values.notna(), default)
+
+def _format_time_value(value):
+    """单个时间值：字符串原样保留，datetime格式化为字符串，其他类型为None"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return None
+
+def is_time_column(col):
+    """列名含time/时间/date的列视为时间列"""
+    return 'time' in col.lower() or '时间' in col or 'date' in col
+
+# CSV监控循环用到的订单字段列（另外还需要止盈列和时间列）
+MONITOR_CSV_COLUMNS = frozenset([
+    'channel', 'analysis.交易币种', 'analysis.方向',
+    'analysis.入场点位1', 'analysis.止损点位1',
+])
+
+def is_monitor_csv_column(col):
+    """CSV监控只解析用到的列：订单字段、止盈列和时间列"""
+    return col in MONITOR_CSV_COLUMNS or '止盈' in col or is_time_column(col)
+
+def monitor_csv_columns(path):
+    """按文件表头把 is_monitor_csv_column 解析为具体的列名元组
+    
+    函数不能作为缓存键，解析成元组后两个CSV监控可以通过 read_table_cached 共用同一个增量解析缓存。
+    """
+    return tuple(col for col in pd.read_csv(path, nrows=0).columns if is_monitor_csv_column(col))
+
+def publish_time_column(df, columns):
+    """向量化：按列顺序取第一个非空的时间列（列名含time/时间/date）作为发布时间，
+    datetime统一格式化为字符串，没有时间值的行为None"""
+    result = np.full(len(df), None, dtype=object)
+    pending = np.ones(len(df), dtype=bool)
+    for col in columns:
+        if not is_time_column(col):
+            continue
+        values = df[col]
+        present = pending & values.notna().to_numpy()
+        if present.any():
+            picked = values[present]
+            if pd.api.types.is_datetime64_any_dtype(picked):
+                picked = picked.dt.strftime('%Y-%m-%d %H:%M:%S')
+            elif not pd.api.types.is_string_dtype(picked):
+                # 数值等其他类型的值与逐行处理一致，不作为发布时间
+                picked = picked.map(_format_time_value)
+            result[present] = picked.to_numpy(dtype=object)
+        pending &= ~present
+    return pd.Series(result, index=df.index, dtype=object)
+
+def frame_records(df):
+    """DataFrame转为记录列表，NaN/NaT统一转为None"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def object_values(series):
+    """列转为object数组，NaN/NaT统一转为None"""
+    values = series.to_numpy(dtype=object, copy=True)
+    values[series.isna().to_numpy()] = None
+    return values
+
+# Excel关键列解析规则：key -> (优先匹配的精确列名, 模糊匹配的关键字)
+EXCEL_ORDER_COLUMNS = {
+    'entry': (('入场点位1', 'analysis.入场点位1'), '入场点位'),
+    'symbol': (('交易币种', 'analysis.交易币种'), '币种'),
+    'direction': (('方向', 'analysis.方向'), '方向'),
+    'stop_loss': (('止损点位1', 'analysis.止损点位1'), '止损点位'),
+}
+
+# 山寨币Excel还需要止盈列
+ALTCOIN_EXCEL_COLUMNS = dict(EXCEL_ORDER_COLUMNS, target=(('止盈点位1', 'analysis.止盈点位1'), '止盈点位'))
+
+def resolve_columns(columns, specs):
+    """按"精确列名优先，否则取第一个包含关键字的列"解析关键列，模糊匹配只遍历一次列名
+    
+    返回 {key: 列名}，找不到的列为None。
+    """
+    column_set = set(columns)
+    resolved = {}
+    pending = {}
+    for key, (exact_names, keyword) in specs.items():
+        resolved[key] = next((name for name in exact_names if name in column_set), None)
+        if resolved[key] is None:
+            pending[key] = keyword
+    
+    for col in columns:
+        if not pending:
+            break
+        for key, keyword in list(pending.items()):
+            if keyword in str(col):
+                resolved[key] = col
+                del pending[key]
+    return resolved
+
 # 加载订单数据
 def load_order_data():
     """加载订单数据：已完成订单从Excel读取，活跃订单从CSV读取"""
@@ -452,595 +1103,337 @@ def load_order_data():
         processed_orders = []
         active_orders = []
         completed_orders = []
-        orders_by_symbol = {}
+        orders_by_symbol = defaultdict(list)
         order_id = 1
         
-        # 只保留BTC、ETH、SOL
-        allowed_symbols = ['BTC', 'ETH', 'SOL']
-        def is_allowed_symbol(symbol):
-            symbol = str(symbol).strip().upper()
-            if symbol.endswith('USDT'):
-                symbol = symbol[:-4]
-            return symbol in allowed_symbols
-        
         # 1. 从results.xlsx文件加载已完成订单数据
         excel_file_path = os.path.join('data', 'analysis_results', 'results.xlsx')
         if os.path.exists(excel_file_path):
             try:
-                print(f"从Excel文件加载已完成订单: {excel_file_path}")
-                excel_df = pd.read_excel(excel_file_path)
-                print(f"Excel文件包含 {len(excel_df)} 行数据")
+                logger.debug("从Excel文件加载已完成订单: %s", excel_file_path)
+                excel_df = read_table_cached(excel_file_path)
+                logger.debug("Excel文件包含 %d 行数据", len(excel_df))
                 
                 # 列名
                 columns = excel_df.columns.tolist()
-                print(f"Excel文件列名: {columns}")
+                column_set = set(columns)
+                logger.debug("Excel文件列名: %s", columns)
                 
                 # 获取关键列 - 优先匹配精确列名
-                entry_col = None
-                if '入场点位1' in columns:
-                    entry_col = '入场点位1'
-                elif 'analysis.入场点位1' in columns:
-                    entry_col = 'analysis.入场点位1'
-                else:
-                    # 查找包含"入场点位"的列
-                    for col in columns:
-                        if '入场点位' in col:
-                            entry_col = col
-                            break
+                key_columns = resolve_columns(columns, EXCEL_ORDER_COLUMNS)
+                entry_col = key_columns['entry']
+                symbol_col = key_columns['symbol']
+                direction_col = key_columns['direction']
+                stop_loss_col = key_columns['stop_loss']
                 
-                symbol_col = None
-                if '交易币种' in columns:
-                    symbol_col = '交易币种'
-                elif 'analysis.交易币种' in columns:
-                    symbol_col = 'analysis.交易币种'
-                else:
-                    # 查找包含"币种"的列
-                    for col in columns:
-                        if '币种' in col:
-                            symbol_col = col
-                            break
-                
-                direction_col = None
-                if '方向' in columns:
-                    direction_col = '方向'
-                elif 'analysis.方向' in columns:
-                    direction_col = 'analysis.方向'
-                else:
-                    # 查找包含"方向"的列
-                    for col in columns:
-                        if '方向' in col:
-                            direction_col = col
-                            break
-                
-                stop_loss_col = None
-                if '止损点位1' in columns:
-                    stop_loss_col = '止损点位1'
-                elif 'analysis.止损点位1' in columns:
-                    stop_loss_col = 'analysis.止损点位1'
-                else:
-                    # 查找包含"止损点位"的列
-                    for col in columns:
-                        if '止损点位' in col:
-                            stop_loss_col = col
-                            break
-                
-                print(f"检测到的列名映射: 入场点位={entry_col}, 交易币种={symbol_col}, 方向={direction_col}, 止损点位={stop_loss_col}")
+                logger.debug("检测到的列名映射: 入场点位=%s, 交易币种=%s, 方向=%s, 止损点位=%s",
+                             entry_col, symbol_col, direction_col, stop_loss_col)
                 
                 if entry_col and symbol_col:
                     # 新增筛选条件：方向列不能为空
                     excel_direction_mask = True
-                    if direction_col and direction_col in excel_df.columns:
-                        excel_direction_mask = (
-                            excel_df[direction_col].notna() &
-                            (excel_df[direction_col] != '') &
-                            (excel_df[direction_col].astype(str).str.strip() != '')
-                        )
+                    if direction_col and direction_col in column_set:
+                        excel_direction_mask = non_blank_mask(excel_df[direction_col])
                     
                     # 新增筛选条件：止盈点位1和止损点位1至少有一个  
                     excel_target_stop_mask = True
-                    if stop_loss_col and '止盈点位1' in excel_df.columns:
-                        def has_valid_target_or_stop_excel(row):
-                            try:
-                                target1 = row.get('止盈点位1')
-                                stop1 = row.get(stop_loss_col)
-                                
-                                # 检查止盈点位1是否有效
-                                has_target = False
-                                if pd.notna(target1) and target1 != '' and target1 != 0:
-                                    try:
-                                        float(target1)
-                                        has_target = True
-                                    except (ValueError, TypeError):
-                                        pass
-                                
-                                # 检查止损点位1是否有效
-                                has_stop = False
-                                if pd.notna(stop1) and stop1 != '' and stop1 != 0:
-                                    try:
-                                        float(stop1)
-                                        has_stop = True
-                                    except (ValueError, TypeError):
-                                        pass
-                                
-                                return has_target or has_stop
-                            except Exception:
-                                return False
-                        
-                        excel_target_stop_mask = excel_df.apply(has_valid_target_or_stop_excel, axis=1)
+                    if stop_loss_col and '止盈点位1' in column_set:
+                        excel_target_stop_mask = target_or_stop_mask(excel_df, '止盈点位1', stop_loss_col)
                     
                     # 严格筛选：必须同时有交易币种和入场点位的有效数据
                     filtered_df = excel_df[
-                        excel_df[entry_col].notna() & 
-                        excel_df[symbol_col].notna() &
+                        excel_df[entry_col].notna() &
                         (excel_df[entry_col] != '') &
-                        (excel_df[symbol_col] != '') &
                         (excel_df[entry_col] != 0) &
-                        (excel_df[symbol_col].astype(str).str.strip() != '') &
-                        (excel_df[symbol_col].apply(is_allowed_symbol)) &
+                        # 只保留BTC、ETH、SOL（同时保证交易币种非空）
+                        major_symbol_mask(excel_df[symbol_col]) &
                         excel_direction_mask &  # 新增：方向不能为空
                         excel_target_stop_mask  # 新增：至少要有止盈或止损
                     ]
-                    print(f"找到 {len(filtered_df)} 行同时有交易币种和入场点位的有效数据")
+                    logger.debug("找到 %d 行同时有交易币种和入场点位的有效数据", len(filtered_df))
                     
                     if len(filtered_df) > 0:
-                        # 处理所有有效的币种数据
-                        for idx, row in filtered_df.iterrows():
-                            try:
-                                # 再次验证交易币种和入场点位
-                                original_symbol = str(row[symbol_col]).strip().upper()
-                                if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
-                                    continue
-                                
-                                # 验证入场点位
-                                try:
-                                    entry_price = float(row[entry_col])
-                                    if entry_price <= 0:
-                                        continue
-                                except (ValueError, TypeError):
-                                    continue
-                                    
-                                # 标准化交易对名称
-                                normalized_symbol = normalize_symbol(original_symbol)
-                                if not normalized_symbol:
-                                    continue
-                                
-                                # 获取方向
-                                direction = str(row[direction_col]).strip() if direction_col and not pd.isna(row[direction_col]) else "做多"
-                                if direction not in ["做多", "做空"]:
-                                    direction = "做多"
-                                
-                                # 获取其他价格信息
-                                try:
-                                    stop_loss = float(row[stop_loss_col]) if stop_loss_col and not pd.isna(row[stop_loss_col]) else None
-                                    target_price = None
-                                    if 'analysis.止盈点位1' in columns and not pd.isna(row['analysis.止盈点位1']):
-                                        target_price = float(row['analysis.止盈点位1'])
-                                except (ValueError, TypeError):
-                                    stop_loss = None
-                                    target_price = None
-                                
-                                # 获取状态信息
-                                status = row.get('status')
-                                result = row.get('result')
-                                exit_price = row.get('exit_price')
-                                exit_time = row.get('exit_time')
-                                hold_time = row.get('hold_time')
-                                profit_pct = row.get('profit_pct')
-                                current_price = row.get('current_price')
-                                
-                                # 获取总加权盈亏%和持仓时间(分钟)
-                                weighted_profit_pct = None
-                                hold_time_minutes = None
-                                
-                                if 'profit' in columns:
-                                    weighted_profit_val = row.get('profit')
-                                    if not pd.isna(weighted_profit_val):
-                                        try:
-                                            weighted_profit_pct = float(weighted_profit_val)
-                                        except (ValueError, TypeError):
-                                            pass
-                                
-                                if 'hold_time' in columns:
-                                    hold_time_val = row.get('hold_time')
-                                    if not pd.isna(hold_time_val):
-                                        try:
-                                            hold_time_minutes = float(hold_time_val)
-                                        except (ValueError, TypeError):
-                                            pass
-                                
-                                # 获取频道信息
-                                channel = 'Excel已完成订单'
-                                if 'channel' in columns:
-                                    channel_val = row.get('channel')
-                                    if not pd.isna(channel_val):
-                                        channel = str(channel_val)
-                                
-                                # 获取发布时间
-                                publish_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                if 'timestamp' in columns:
-                                    time_val = row.get('timestamp')
-                                    if not pd.isna(time_val):
-                                        if isinstance(time_val, str):
-                                            publish_time = time_val
-                                        elif isinstance(time_val, (pd.Timestamp, datetime)):
-                                            publish_time = time_val.strftime('%Y-%m-%d %H:%M:%S')
-                                
-                                # 创建订单对象
-                                risk_reward_ratio = calculate_risk_reward_ratio(direction, entry_price, target_price, stop_loss)
-                                
-                                # Excel中的订单都标记为已完成
-                                is_completed = True
-                                
-                                order = create_order_object(
-                                    id_num=order_id,
-                                    symbol=original_symbol,
-                                    normalized_symbol=normalized_symbol,
-                                    direction=direction,
-                                    entry_price=entry_price,
-                                    average_entry_cost=None,
-                                    profit_pct=profit_pct,
-                                    target_price=target_price,
-                                    stop_loss=stop_loss,
-                                    exit_price=exit_price,
-                                    exit_time=exit_time,
-                                    is_completed=is_completed,
-                                    channel=channel,
-                                    publish_time=publish_time,
-                                    risk_reward_ratio=risk_reward_ratio,
-                                    hold_time=hold_time,
-                                    result=result if result else "-",
-                                    source="results.xlsx",
-                                    weighted_profit_pct=weighted_profit_pct,
-                                    hold_time_minutes=hold_time_minutes
-                                )
-                                
-                                # 设置当前价格
-                                if current_price is not None:
-                                    order['current_price'] = current_price
-                                
-                                # 添加到已完成订单列表
-                                completed_orders.append(order)
-                                processed_orders.append(order)
-                                
-                                # 添加到按币种分类的字典
-                                symbol_key = original_symbol.upper()
-                                if symbol_key not in orders_by_symbol:
-                                    orders_by_symbol[symbol_key] = []
-                                orders_by_symbol[symbol_key].append(order)
-                                
-                                order_id += 1
-                            
-                            except Exception as e:
-                                print(f"处理Excel行 {idx+1} 时出错: {e}")
+                        # 按列预先清洗/转换，避免逐行 iterrows + float() + pd.isna
+                        symbols = filtered_df[symbol_col].astype(str).str.strip().str.upper()
+                        entry_prices = pd.to_numeric(filtered_df[entry_col], errors='coerce')
+                        valid = ~symbols.isin(['', 'NAN', 'NULL']) & (entry_prices > 0)
+                        clean_df = filtered_df[valid]
+                        
+                        default_time = now_str()
+                        columns_data = pd.DataFrame({
+                            'symbol': symbols[valid],
+                            # 标准化交易对名称
+                            'normalized_symbol': normalize_symbol_series(symbols[valid]),
+                            'entry_price': entry_prices[valid],
+                            'direction': direction_series(clean_df, direction_col),
+                            'stop_loss': numeric_column(clean_df, stop_loss_col),
+                            'target_price': numeric_column(clean_df, 'analysis.止盈点位1'),
+                            'result': raw_column(clean_df, 'result'),
+                            'exit_price': raw_column(clean_df, 'exit_price'),
+                            'exit_time': raw_column(clean_df, 'exit_time'),
+                            'hold_time': raw_column(clean_df, 'hold_time'),
+                            'profit_pct': raw_column(clean_df, 'profit_pct'),
+                            'current_price': raw_column(clean_df, 'current_price'),
+                            'weighted_profit_pct': numeric_column(clean_df, 'profit'),
+                            'hold_time_minutes': numeric_column(clean_df, 'hold_time'),
+                            'channel': text_column(clean_df, 'channel', 'Excel已完成订单'),
+                            'publish_time': publish_time_series(clean_df, 'timestamp', default_time),
+                        })
+                        columns_data['risk_reward_ratio'] = risk_reward_ratio_series(
+                            columns_data['direction'], columns_data['entry_price'],
+                            columns_data['target_price'], columns_data['stop_loss'])
+                        
+                        # Excel中的订单都标记为已完成；一次性生成订单字典
+                        columns_data = columns_data[columns_data['normalized_symbol'].notna()]
+                        columns_data['result'] = columns_data['result'].where(truthy_mask(columns_data['result']), "-")
+                        orders = create_order_records(columns_data, order_id, is_completed=True, source="results.xlsx")
+                        order_id += len(orders)
+                        completed_orders.extend(orders)
+                        processed_orders.extend(orders)
                         
-                        print(f"从Excel文件成功加载了 {len(completed_orders)} 个已完成订单")
+                        # 添加到按币种分类的字典
+                        for order in orders:
+                            orders_by_symbol[order['symbol']].append(order)
+                        
+
+                        logger.debug("从Excel文件成功加载了 %d 个已完成订单", len(completed_orders))
                     else:
-                        print("Excel文件中没有有效的入场价格数据")
+                        logger.debug("Excel文件中没有有效的入场价格数据")
                 else:
-                    print(f"Excel文件缺少必要的列：入场点位({entry_col})或交易币种({symbol_col})")
+                    logger.warning("Excel文件缺少必要的列：入场点位(%s)或交易币种(%s)", entry_col, symbol_col)
             except Exception as e:
-                print(f"从Excel文件加载已完成订单时出错: {e}")
+                logger.error("从Excel文件加载已完成订单时出错: %s", e)
         
         # 2. 从CSV文件加载活跃订单数据
         csv_file_path = os.path.join('data', 'analysis_results', 'all_analysis_results.csv')
         if os.path.exists(csv_file_path):
             try:
-                print(f"从CSV文件加载活跃订单: {csv_file_path}")
-                csv_df = pd.read_csv(csv_file_path)
-                print(f"CSV文件包含 {len(csv_df)} 行数据")
+                logger.debug("从CSV文件加载活跃订单: %s", csv_file_path)
+                csv_df = read_table_cached(csv_file_path, usecols=ANALYSIS_CSV_COLUMNS,
+                                           dtype=ANALYSIS_CSV_DTYPES)
+                logger.debug("CSV文件包含 %d 行数据", len(csv_df))
                 
                 # 列名
-                columns = csv_df.columns.tolist()
+                column_set = set(csv_df.columns)
                 
                 # 获取关键列
-                entry_col = 'analysis.入场点位1' if 'analysis.入场点位1' in columns else None
-                stop_loss_col = 'analysis.止损点位1' if 'analysis.止损点位1' in columns else None
-                symbol_col = 'analysis.交易币种' if 'analysis.交易币种' in columns else None
-                direction_col = 'analysis.方向' if 'analysis.方向' in columns else None
-                target_col = 'analysis.止盈点位1' if 'analysis.止盈点位1' in columns else None
+                entry_col = 'analysis.入场点位1' if 'analysis.入场点位1' in column_set else None
+                stop_loss_col = 'analysis.止损点位1' if 'analysis.止损点位1' in column_set else None
+                symbol_col = 'analysis.交易币种' if 'analysis.交易币种' in column_set else None
+                direction_col = 'analysis.方向' if 'analysis.方向' in column_set else None
+                target_col = 'analysis.止盈点位1' if 'analysis.止盈点位1' in column_set else None
                 
                 if entry_col and symbol_col:
                     # 新增筛选条件：方向列不能为空
                     direction_mask = True  # 默认为True
-                    if direction_col and direction_col in csv_df.columns:
-                        direction_mask = (
-                            csv_df[direction_col].notna() &
-                            (csv_df[direction_col] != '') &
-                            (csv_df[direction_col].astype(str).str.strip() != '')
-                        )
+                    if direction_col and direction_col in column_set:
+                        direction_mask = non_blank_mask(csv_df[direction_col])
                     
                     # 新增筛选条件：止盈点位1和止损点位1至少有一个
                     target_stop_mask = True  # 默认为True
-                    if stop_loss_col and 'analysis.止盈点位1' in csv_df.columns:
-                        def has_valid_target_or_stop_csv(row):
-                            try:
-                                target1 = row.get('analysis.止盈点位1')
-                                stop1 = row.get(stop_loss_col)
-                                
-                                # 检查止盈点位1是否有效
-                                has_target = False
-                                if pd.notna(target1) and target1 != '' and target1 != 0:
-                                    try:
-                                        float(target1)
-                                        has_target = True
-                                    except (ValueError, TypeError):
-                                        pass
-                                
-                                # 检查止损点位1是否有效
-                                has_stop = False
-                                if pd.notna(stop1) and stop1 != '' and stop1 != 0:
-                                    try:
-                                        float(stop1)
-                                        has_stop = True
-                                    except (ValueError, TypeError):
-                                        pass
-                                
-                                return has_target or has_stop
-                            except Exception:
-                                return False
-                        
-                        target_stop_mask = csv_df.apply(has_valid_target_or_stop_csv, axis=1)
+                    if stop_loss_col and 'analysis.止盈点位1' in column_set:
+                        target_stop_mask = target_or_stop_mask(csv_df, 'analysis.止盈点位1', stop_loss_col)
                     
-                    # 筛选未完成的活跃订单
-                    active_df = csv_df[
-                        csv_df[entry_col].notna() & 
-                        csv_df[symbol_col].notna() &
+                    # 活跃/已完成订单共用的基础筛选条件，只计算一次
+                    base_mask = (
+                        csv_df[entry_col].notna() &
                         (csv_df[entry_col] != '') &
-                        (csv_df[symbol_col] != '') &
                         (csv_df[entry_col] != 0) &
-                        (csv_df[symbol_col].astype(str).str.strip() != '') &
-                        (csv_df[symbol_col].apply(is_allowed_symbol)) &
+                        # 只保留BTC、ETH、SOL（同时保证交易币种非空）
+                        major_symbol_mask(csv_df[symbol_col]) &
                         direction_mask &  # 新增：方向不能为空
-                        target_stop_mask &  # 新增：至少要有止盈或止损
-                        # 筛选未完成的订单
-                        (csv_df.get('status') != 'completed') &
-                        (csv_df.get('exit_price').isna() | (csv_df.get('exit_price') == '')) &
-                        (csv_df.get('exit_time').isna() | (csv_df.get('exit_time') == '')) &
-                        (csv_df.get('result').isna() | (csv_df.get('result') == ''))
+                        target_stop_mask  # 新增：至少要有止盈或止损
+                    )
+                    status_completed = status_completed_mask(csv_df)
+                    
+                    # 筛选未完成的活跃订单
+                    active_df = csv_df[
+                        base_mask &
+                        ~status_completed &
+                        empty_mask(csv_df, 'exit_price') &
+                        empty_mask(csv_df, 'exit_time') &
+                        empty_mask(csv_df, 'result')
                     ]
-                    print(f"找到 {len(active_df)} 个活跃订单")
+                    logger.debug("找到 %d 个活跃订单", len(active_df))
                     
                     if len(active_df) > 0:
-                        # 处理活跃订单
-                        for idx, row in active_df.iterrows():
-                            try:
-                                # 验证交易币种和入场点位
-                                original_symbol = str(row[symbol_col]).strip().upper()
-                                if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
-                                    continue
-                                
-                                try:
-                                    entry_price = float(row[entry_col])
-                                    if entry_price <= 0:
-                                        continue
-                                except (ValueError, TypeError):
-                                    continue
-                                    
-                                normalized_symbol = normalize_symbol(original_symbol)
-                                if not normalized_symbol:
-                                    continue
-                                
-                                direction = str(row[direction_col]).strip() if direction_col and not pd.isna(row[direction_col]) else "做多"
-                                if direction not in ["做多", "做空"]:
-                                    direction = "做多"
-                                
-                                try:
-                                    stop_loss = float(row[stop_loss_col]) if stop_loss_col and not pd.isna(row[stop_loss_col]) else None
-                                    target_price = None
-                                    if 'analysis.止盈点位1' in columns and not pd.isna(row['analysis.止盈点位1']):
-                                        target_price = float(row['analysis.止盈点位1'])
-                                except (ValueError, TypeError):
-                                    stop_loss = None
-                                    target_price = None
-                                
-                                # 获取频道信息
-                                channel = 'CSV活跃订单'
-                                if 'channel' in columns:
-                                    channel_val = row.get('channel')
-                                    if not pd.isna(channel_val):
-                                        channel = str(channel_val)
-                                
-                                # 获取发布时间
-                                publish_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                if 'timestamp' in columns:
-                                    time_val = row.get('timestamp')
-                                    if not pd.isna(time_val):
-                                        if isinstance(time_val, str):
-                                            publish_time = time_val
-                                        elif isinstance(time_val, (pd.Timestamp, datetime)):
-                                            publish_time = time_val.strftime('%Y-%m-%d %H:%M:%S')
-                                
-                                risk_reward_ratio = calculate_risk_reward_ratio(direction, entry_price, target_price, stop_loss)
-                                
-                                order = create_order_object(
-                                    id_num=order_id,
-                                    symbol=original_symbol,
-                                    normalized_symbol=normalized_symbol,
-                                    direction=direction,
-                                    entry_price=entry_price,
-                                    average_entry_cost=None,
-                                    profit_pct=None,
-                                    target_price=target_price,
-                                    stop_loss=stop_loss,
-                                    exit_price=None,
-                                    exit_time=None,
-                                    is_completed=False,
-                                    channel=channel,
-                                    publish_time=publish_time,
-                                    risk_reward_ratio=risk_reward_ratio,
-                                    hold_time=None,
-                                    result="-",
-                                    source="all_analysis_results.csv"
-                                )
-                                
-                                # 添加到活跃订单列表
-                                active_orders.append(order)
-                                processed_orders.append(order)
-                                
-                                # 添加到按币种分类的字典
-                                symbol_key = original_symbol.upper()
-                                if symbol_key not in orders_by_symbol:
-                                    orders_by_symbol[symbol_key] = []
-                                orders_by_symbol[symbol_key].append(order)
-                                
-                                order_id += 1
-                            
-                            except Exception as e:
-                                print(f"处理CSV行 {idx+1} 时出错: {e}")
+                        # 按列预先清洗/转换，避免逐行 iterrows + float() + pd.isna
+                        symbols = active_df[symbol_col].astype(str).str.strip().str.upper()
+                        entry_prices = pd.to_numeric(active_df[entry_col], errors='coerce')
+                        valid = ~symbols.isin(['', 'NAN', 'NULL']) & (entry_prices > 0)
+                        clean_df = active_df[valid]
+                        
+                        default_time = now_str()
+                        columns_data = pd.DataFrame({
+                            'symbol': symbols[valid],
+                            # 标准化交易对名称
+                            'normalized_symbol': normalize_symbol_series(symbols[valid]),
+                            'entry_price': entry_prices[valid],
+                            'direction': direction_series(clean_df, direction_col),
+                            'stop_loss': numeric_column(clean_df, stop_loss_col),
+                            'target_price': numeric_column(clean_df, 'analysis.止盈点位1'),
+                            'channel': text_column(clean_df, 'channel', 'CSV活跃订单'),
+                            'publish_time': publish_time_series(clean_df, 'timestamp', default_time),
+                        })
+                        columns_data['risk_reward_ratio'] = risk_reward_ratio_series(
+                            columns_data['direction'], columns_data['entry_price'],
+                            columns_data['target_price'], columns_data['stop_loss'])
                         
-                        print(f"从CSV文件成功加载了 {len(active_orders)} 个活跃订单")
+                        orders = create_order_records(columns_data[columns_data['normalized_symbol'].notna()],
+                                                      order_id, is_completed=False,
+                                                      source="all_analysis_results.csv", result="-")
+                        order_id += len(orders)
+                        active_orders.extend(orders)
+                        processed_orders.extend(orders)
+                        
+                        # 添加到按币种分类的字典
+                        for order in orders:
+                            orders_by_symbol[order['symbol']].append(order)
+                        
+
+                        logger.debug("从CSV文件成功加载了 %d 个活跃订单", len(active_orders))
                     else:
-                        print("CSV文件中没有活跃订单")
+                        logger.debug("CSV文件中没有活跃订单")
                     
                     # 加载已完成订单（从CSV文件）
-                    print("开始加载已完成订单...")
-                    print(f"使用列名 - entry_col: {entry_col}, symbol_col: {symbol_col}")
+                    logger.debug("开始加载已完成订单，使用列名 - entry_col: %s, symbol_col: %s", entry_col, symbol_col)
                     try:
-                        # 先检查status列中有多少completed记录
-                        if 'status' in csv_df.columns:
-                            completed_count = len(csv_df[csv_df['status'] == 'completed'])
-                            print(f"CSV文件中有 {completed_count} 条status=completed的记录")
-                        else:
-                            print("CSV文件中没有status列")
-                        
-                        # 对已完成订单也应用新的筛选条件
-                        completed_direction_mask = True
-                        if direction_col and direction_col in csv_df.columns:
-                            completed_direction_mask = (
-                                csv_df[direction_col].notna() &
-                                (csv_df[direction_col] != '') &
-                                (csv_df[direction_col].astype(str).str.strip() != '')
-                            )
-                        
-                        completed_target_stop_mask = True
-                        if stop_loss_col and 'analysis.止盈点位1' in csv_df.columns:
-                            completed_target_stop_mask = csv_df.apply(has_valid_target_or_stop_csv, axis=1)
+                        # 先检查status列中有多少completed记录（仅调试时统计）
+                        if logger.isEnabledFor(logging.DEBUG):
+                            if 'status' in column_set:
+                                logger.debug("CSV文件中有 %d 条status=completed的记录",
+                                             int(status_completed.sum()))
+                            else:
+                                logger.debug("CSV文件中没有status列")
                         
-                        completed_df = csv_df[
-                            csv_df[entry_col].notna() & 
-                            csv_df[symbol_col].notna() &
-                            (csv_df[entry_col] != '') &
-                            (csv_df[symbol_col] != '') &
-                            (csv_df[entry_col] != 0) &
-                            (csv_df[symbol_col].astype(str).str.strip() != '') &
-                            (csv_df[symbol_col].apply(is_allowed_symbol)) &
-                            completed_direction_mask &  # 新增：方向不能为空
-                            completed_target_stop_mask &  # 新增：至少要有止盈或止损
-                            # 筛选已完成的订单
-                            (csv_df.get('status') == 'completed')
-                        ]
-                        print(f"找到 {len(completed_df)} 个已完成订单")
+                        # 已完成订单与活跃订单共用基础筛选条件
+                        completed_df = csv_df[base_mask & status_completed]
+                        logger.debug("找到 %d 个已完成订单", len(completed_df))
                     except Exception as e:
-                        print(f"过滤已完成订单时出错: {e}")
-                        import traceback
+                        logger.error("过滤已完成订单时出错: %s", e)
                         traceback.print_exc()
                         completed_df = pd.DataFrame()  # 创建空DataFrame
                     
                     if len(completed_df) > 0:
-                        # 处理已完成订单
-                        for idx, row in completed_df.iterrows():
-                            try:
-                                # 验证交易币种和入场点位
-                                original_symbol = str(row[symbol_col]).strip().upper()
-                                if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
-                                    continue
-                                
-                                # 移除USDT后缀（如果存在）
-                                if original_symbol.endswith('USDT'):
-                                    symbol = original_symbol[:-4]
-                                else:
-                                    symbol = original_symbol
-                                
-                                # 验证入场点位
-                                try:
-                                    entry_price = float(row[entry_col])
-                                    if entry_price <= 0:
-                                        continue
-                                except (ValueError, TypeError):
-                                    continue
-                                
-                                # 获取其他字段
-                                direction = str(row.get(direction_col, '做多')).strip()
-                                if direction not in ['做多', '做空']:
-                                    direction = '做多'
-                                
-                                stop_loss = row.get(stop_loss_col, None)
-                                target_price = row.get(target_col, None)
-                                
-                                # 安全转换数值
-                                def safe_float_convert(val):
-                                    if pd.isna(val) or val == '' or val == 'nan':
-                                        return None
-                                    try:
-                                        return float(val)
-                                    except (ValueError, TypeError):
-                                        return None
-                                
-                                stop_loss = safe_float_convert(stop_loss)
-                                target_price = safe_float_convert(target_price)
-                                
-                                # 获取已完成订单的额外信息
-                                exit_price = safe_float_convert(row.get('exit_price'))
-                                exit_time = row.get('exit_time', '')
-                                result = row.get('result', '')
-                                profit_pct = safe_float_convert(row.get('profit', 0))
-                                hold_time = safe_float_convert(row.get('hold_time', 0))
-                                
-                                # 创建已完成订单对象
-                                order = {
-                                    'id': order_id,
-                                    'symbol': symbol,
-                                    'direction': direction,
-                                    'entry_price': entry_price,
-                                    'stop_loss': stop_loss,
-                                    'target_price': target_price,
-                                    'current_price': exit_price if exit_price else entry_price,
-                                    'profit_pct': profit_pct if profit_pct else 0,
-                                    'triggered_time': row.get('timestamp', ''),
-                                    'publish_time': row.get('timestamp', ''),
-                                    'is_completed': True,
-                                    'exit_price': exit_price,
-                                    'exit_time': exit_time,
-                                    'result': result,
-                                    'hold_time': hold_time,
-                                    'status': 'completed'
-                                }
-                                
-                                completed_orders.append(order)
-                                processed_orders.append(order)
-                                
-                                order_id += 1
+                        # 按列预先清洗/转换，避免逐行 iterrows + float() + pd.isna
+                        symbols = completed_df[symbol_col].astype(str).str.strip().str.upper()
+                        entry_prices = pd.to_numeric(completed_df[entry_col], errors='coerce')
+                        valid = ~symbols.isin(['', 'NAN', 'NULL']) & (entry_prices > 0)
+                        clean_df = completed_df[valid]
+                        
+                        columns_data = pd.DataFrame({
+                            # 移除USDT后缀（如果存在）
+                            'symbol': symbols[valid].str.removesuffix('USDT'),
+                            'entry_price': entry_prices[valid],
+                            'direction': direction_series(clean_df, direction_col),
+                            'stop_loss': numeric_column(clean_df, stop_loss_col),
+                            'target_price': numeric_column(clean_df, target_col),
+                            'exit_price': numeric_column(clean_df, 'exit_price'),
+                            'exit_time': raw_column(clean_df, 'exit_time', ''),
+                            'result': raw_column(clean_df, 'result', ''),
+                            'profit_pct': numeric_column(clean_df, 'profit', 0.0),
+                            'hold_time': numeric_column(clean_df, 'hold_time', 0.0),
+                            'timestamp': raw_column(clean_df, 'timestamp', ''),
+                        })
+                        
+                        for rec in frame_records(columns_data):
+                            exit_price = rec['exit_price']
                             
-                            except Exception as e:
-                                print(f"处理已完成订单CSV行 {idx+1} 时出错: {e}")
+                            # 创建已完成订单对象
+                            order = {
+                                'id': order_id,
+                                'symbol': rec['symbol'],
+                                'direction': rec['direction'],
+                                'entry_price': rec['entry_price'],
+                                'stop_loss': rec['stop_loss'],
+                                'target_price': rec['target_price'],
+                                'current_price': exit_price if exit_price else rec['entry_price'],
+                                'profit_pct': rec['profit_pct'] if rec['profit_pct'] else 0,
+                                'triggered_time': rec['timestamp'],
+                                'publish_time': rec['timestamp'],
+                                'is_completed': True,
+                                'exit_price': exit_price,
+                                'exit_time': rec['exit_time'],
+                                'result': rec['result'],
+                                'hold_time': rec['hold_time'],
+                                'status': 'completed'
+                            }
+                            
+                            completed_orders.append(order)
+                            processed_orders.append(order)
+                            
+                            order_id += 1
                         
-                        print(f"从CSV文件成功加载了 {len(completed_orders)} 个已完成订单")
+
+                        logger.debug("从CSV文件成功加载了 %d 个已完成订单", len(completed_orders))
                     else:
-                        print("CSV文件中没有已完成订单")
+                        logger.debug("CSV文件中没有已完成订单")
                 else:
-                    print(f"CSV文件缺少必要的列：入场点位({entry_col})或交易币种({symbol_col})")
+                    logger.warning("CSV文件缺少必要的列：入场点位(%s)或交易币种(%s)", entry_col, symbol_col)
             except Exception as e:
-                print(f"从CSV文件加载活跃订单时出错: {e}")
+                logger.error("从CSV文件加载活跃订单时出错: %s", e)
         
-        print(f"订单加载完成: {len(active_orders)} 个活跃订单, {len(completed_orders)} 个已完成订单")
+        logger.info("订单加载完成: %d 个活跃订单, %d 个已完成订单", len(active_orders), len(completed_orders))
         
         # 更新活跃订单的入场状态
         try:
             update_entry_status_for_orders(active_orders)
-            print(f"已更新 {len(active_orders)} 个活跃订单的入场状态")
+            logger.debug("已更新 %d 个活跃订单的入场状态", len(active_orders))
         except Exception as e:
-            print(f"更新入场状态失败: {e}")
+            logger.error("更新入场状态失败: %s", e)
         
         # 删除整体排序逻辑，保留文件原始顺序
         return True
         
     except Exception as e:
-        print(f"加载订单数据时出错: {e}")
+        logger.error("加载订单数据时出错: %s", e)
         traceback.print_exc()
         return False
 
 
-# 加载山寨币数据 - 新增的函数
+# 批量获取价格时的最大并发数
+PRICE_FETCH_WORKERS = 16
+
+def fetch_price_with_retry(symbol, max_retries=3):
+    """获取交易对当前价格，USDT交易对取不到时尝试基础币种，请求出错时短暂等待后重试"""
+    for attempt in range(max_retries):
+        try:
+            current_price = monitor.get_current_price(symbol)
+            if current_price is None:
+                # 尝试基础币种格式
+                current_price = monitor.get_current_price(symbol.replace('USDT', ''))
+            return current_price
+        except Exception as e:
+            logger.debug(f"获取{symbol}价格失败，重试 {attempt + 1}/{max_retries}: {e}")
+            if attempt + 1 < max_retries:
+                time.sleep(0.5)  # 短暂等待后重试
+    return None
+
+# 本轮监控循环的价格快照：币种 -> 当前价格（取不到为None），
+# update_order_prices 和 update_all_orders_status 共用，同一币种每轮只请求一次
+tick_prices: Dict[str, Optional[float]] = {}
+
+def begin_price_tick():
+    """开始新一轮监控：清空上一轮的价格快照"""
+    tick_prices.clear()
+
+def _fetch_current_price(symbol):
+    try:
+        return monitor.get_current_price(symbol)
+    except Exception as e:
+        logger.debug(f"获取{symbol}价格失败: {e}")
+        return None
+
+def get_tick_prices(symbols):
+    """批量获取本轮的价格：快照中没有的币种并发请求一次，返回价格快照字典"""
+    missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in tick_prices]
+    if len(missing) > 1:
+        with ThreadPoolExecutor(max_workers=min(PRICE_FETCH_WORKERS, len(missing))) as executor:
+            tick_prices.update(zip(missing, executor.map(_fetch_current_price, missing)))
+    elif missing:
+        tick_prices[missing[0]] = _fetch_current_price(missing[0])
+    return tick_prices
+
 def update_altcoin_prices():
     """更新山寨币订单的实时价格 - 为新的山寨币订单获取实时价格"""
     global altcoin_active_orders, monitor
@@ -1056,156 +1449,61 @@ def update_altcoin_prices():
         updated_count = 0
         error_count = 0
         
+        pending_orders = []
         for order in altcoin_active_orders:
-            try:
-                # 只处理从CSV文件新添加的山寨币订单
-                if order.get('source', '').startswith('all_analysis_results.csv_altcoin'):
-                    symbol = order.get('symbol', '').strip()
-                    if not symbol:
-                        continue
-                        
-                    # 确保symbol格式正确
-                    if not symbol.endswith('USDT'):
-                        symbol = f"{symbol}USDT"
-                    
-                    # 获取当前价格 - 增加重试机制
-                    current_price = None
-                    retry_count = 0
-                    max_retries = 3
-                    
-                    while retry_count < max_retries and current_price is None:
-                        try:
-                            current_price = monitor.get_current_price(symbol)
-                            if current_price is None:
-                                # 尝试基础币种格式
-                                base_symbol = symbol.replace('USDT', '')
-                                current_price = monitor.get_current_price(base_symbol)
-                        except Exception as e:
-                            logger.debug(f"获取{symbol}价格失败，重试 {retry_count + 1}/{max_retries}: {e}")
-                            retry_count += 1
-                            if retry_count < max_retries:
-                                time.sleep(0.5)  # 短暂等待后重试
-                    
-                    if current_price is not None:
-                        # 更新订单的当前价格
-                        order['current_price'] = current_price
-                        
-                        # 计算盈亏百分比
-                        entry_price = order.get('entry_price')
-                        direction = order.get('direction', '做多')
-                        
-                        if entry_price and entry_price > 0:
-                            if direction == '多单' or direction == '做多':
-                                profit_pct = ((current_price - entry_price) / entry_price) * 100
-                            elif direction == '空单' or direction == '做空':
-                                profit_pct = ((entry_price - current_price) / entry_price) * 100
-                            else:
-                                profit_pct = 0
-                            
-                            order['profit_pct'] = round(profit_pct, 2)
-                            updated_count += 1
-                            logger.debug(f"更新山寨币 {symbol} 价格: {current_price}, 盈亏: {profit_pct:.2f}%")
-                        else:
-                            error_count += 1
-                            logger.debug(f"山寨币 {symbol} 入场价格无效: {entry_price}")
-                    else:
-                        error_count += 1
-                        logger.debug(f"无法获取山寨币 {symbol} 的当前价格")
-                
-            except Exception as e:
-                error_count += 1
-                logger.error(f"更新山寨币订单 {order.get('symbol', 'unknown')} 价格时出错: {str(e)}")
-                continue
-        
-        logger.info(f"山寨币价格更新完成: 成功更新 {updated_count} 个订单，失败 {error_count} 个订单")
-        
-    except Exception as e:
-        logger.error(f"更新山寨币价格时出错: {str(e)}")
-        traceback.print_exc()
-        
-        # 以下代码已禁用，保留作为参考
-        updated_count = 0
-        error_count = 0
-        
-        for order in altcoin_active_orders:
-            try:
+            # 只处理从CSV文件新添加的山寨币订单
+            if order.get('source', '').startswith('all_analysis_results.csv_altcoin'):
                 symbol = order.get('symbol', '').strip()
                 if not symbol:
                     continue
-                    
+                
                 # 确保symbol格式正确
                 if not symbol.endswith('USDT'):
                     symbol = f"{symbol}USDT"
-                
-                # 获取当前价格 - 增加重试机制
-                current_price = None
-                retry_count = 0
-                max_retries = 3
-                
-                while retry_count < max_retries and current_price is None:
-                    try:
-                        current_price = monitor.get_current_price(symbol)
-                        if current_price is None:
-                            # 尝试基础币种格式
-                            base_symbol = symbol.replace('USDT', '')
-                            current_price = monitor.get_current_price(base_symbol)
-                    except Exception as e:
-                        logger.debug(f"获取{symbol}价格失败，重试 {retry_count + 1}/{max_retries}: {e}")
-                        retry_count += 1
-                        if retry_count < max_retries:
-                            time.sleep(0.5)  # 短暂等待后重试
-                
-                if current_price is None:
-                    logger.debug(f"无法获取 {symbol} 的当前价格，跳过更新")
-                    error_count += 1
-                    continue
-                    
-                # 更新订单价格信息
-                order['current_price'] = current_price
-                
-                # 计算盈亏
-                entry_price = order.get('entry_price', 0)
-                direction = order.get('direction', '').strip()
-                
-                if entry_price and entry_price > 0:
-                    if direction == '多单' or direction == '做多':
-                        profit_pct = ((current_price - entry_price) / entry_price) * 100
-                    elif direction == '空单' or direction == '做空':
-                        profit_pct = ((entry_price - current_price) / entry_price) * 100
-                    else:
-                        profit_pct = 0
-                        
-                    order['profit_pct'] = round(profit_pct, 2)
-                    
-                    # 更新订单状态
-                    stop_loss = order.get('stop_loss', 0)
-                    target_profit = order.get('target_profit', 0)
-                    
-                    if stop_loss and stop_loss > 0:
-                        if (direction == '多单' or direction == '做多') and current_price <= stop_loss:
-                            order['status'] = 'stopped'
-                        elif (direction == '空单' or direction == '做空') and current_price >= stop_loss:
-                            order['status'] = 'stopped'
-                    
-                    if target_profit and target_profit > 0:
-                        if (direction == '多单' or direction == '做多') and current_price >= target_profit:
-                            order['status'] = 'completed'
-                        elif (direction == '空单' or direction == '做空') and current_price <= target_profit:
-                            order['status'] = 'completed'
-                    
-                    updated_count += 1
-                            
-            except Exception as e:
-                logger.debug(f"更新山寨币订单 {order.get('symbol', 'unknown')} 价格时出错: {e}")
+                pending_orders.append((order, symbol))
+        
+        # 相同币种只请求一次，并发获取价格，避免逐个订单串行等待网络往返
+        unique_symbols = list(dict.fromkeys(symbol for _, symbol in pending_orders))
+        prices = {}
+        if unique_symbols:
+            with ThreadPoolExecutor(max_workers=min(PRICE_FETCH_WORKERS, len(unique_symbols))) as executor:
+                prices = dict(zip(unique_symbols, executor.map(fetch_price_with_retry, unique_symbols)))
+        
+        priced_orders = []
+        for order, symbol in pending_orders:
+            current_price = prices.get(symbol)
+            if current_price is None:
                 error_count += 1
+                logger.debug(f"无法获取山寨币 {symbol} 的当前价格")
                 continue
-                
+            
+            # 更新订单的当前价格
+            order['current_price'] = current_price
+            entry_price = order.get('entry_price')
+            if pd.api.types.is_number(entry_price) and entry_price > 0:
+                priced_orders.append(order)
+            else:
+                error_count += 1
+                logger.debug(f"山寨币 {symbol} 入场价格无效: {entry_price}")
+        
+        if priced_orders:
+            # 批量计算盈亏百分比：多单 (现价-入场)/入场，空单 (入场-现价)/入场，其他方向为0
+            entry = np.array([order['entry_price'] for order in priced_orders], dtype=float)
+            current = np.array([order['current_price'] for order in priced_orders], dtype=float)
+            sign = direction_signs([order.get('direction', '做多') for order in priced_orders],
+                                   ('多单', '做多'), ('空单', '做空'))
+            profit = _profit_pct_kernel(sign, entry, current)
+            for order, profit_pct in zip(priced_orders, np.round(profit, 2).tolist()):
+                order['profit_pct'] = profit_pct
+            updated_count += len(priced_orders)
+            logger.debug(f"已更新 {len(priced_orders)} 个山寨币订单的价格和盈亏")
+        
         logger.info(f"山寨币价格更新完成: 成功更新 {updated_count} 个订单，失败 {error_count} 个订单")
         
     except Exception as e:
-        logger.error(f"更新山寨币价格时出错: {e}")
-        traceback.print_exc()
+        log_error_with_traceback(f"更新山寨币价格时出错: {str(e)}")
 
+# 加载山寨币数据 - 新增的函数
 def load_altcoin_data():
     """加载山寨币数据：除了BTC、ETH、SOL之外的所有币种"""
     global altcoin_active_orders, altcoin_completed_orders, altcoin_orders_by_symbol
@@ -1215,192 +1513,75 @@ def load_altcoin_data():
         processed_orders = []
         altcoin_active_orders = []
         altcoin_completed_orders = []
-        altcoin_orders_by_symbol = {}
+        altcoin_orders_by_symbol = defaultdict(list)
         order_id = 1
         
-        # 排除BTC、ETH、SOL，只保留其他币种
-        excluded_symbols = ['BTC', 'ETH', 'SOL']
-        def is_altcoin_symbol(symbol):
-            symbol = str(symbol).strip().upper()
-            if symbol.endswith('USDT'):
-                symbol = symbol[:-4]
-            return symbol not in excluded_symbols
-        
         # 1. 从results.xlsx文件加载已完成订单数据
         excel_file_path = os.path.join('data', 'analysis_results', 'results.xlsx')
         if os.path.exists(excel_file_path):
             try:
                 print(f"从Excel文件加载山寨币已完成订单: {excel_file_path}")
-                excel_df = pd.read_excel(excel_file_path)
+                # 与 load_order_data 共用解析缓存，文件未变化时不重新解析
+                excel_df = read_table_cached(excel_file_path)
                 print(f"Excel文件包含 {len(excel_df)} 行数据")
                 
-                # 列名
-                columns = excel_df.columns.tolist()
-                print(f"Excel文件列名: {columns}")
-                
-                # 获取关键列 - 优先匹配精确列名
-                entry_col = None
-                if '入场点位1' in columns:
-                    entry_col = '入场点位1'
-                elif 'analysis.入场点位1' in columns:
-                    entry_col = 'analysis.入场点位1'
-                else:
-                    # 查找包含"入场点位"的列
-                    for col in columns:
-                        if '入场点位' in col:
-                            entry_col = col
-                            break
-                
-                symbol_col = None
-                if '交易币种' in columns:
-                    symbol_col = '交易币种'
-                elif 'analysis.交易币种' in columns:
-                    symbol_col = 'analysis.交易币种'
-                else:
-                    # 查找包含"币种"的列
-                    for col in columns:
-                        if '币种' in col:
-                            symbol_col = col
-                            break
-                
-                direction_col = None
-                if '方向' in columns:
-                    direction_col = '方向'
-                elif 'analysis.方向' in columns:
-                    direction_col = 'analysis.方向'
-                else:
-                    # 查找包含"方向"的列
-                    for col in columns:
-                        if '方向' in col:
-                            direction_col = col
-                            break
-                
-                stop_loss_col = None
-                if '止损点位1' in columns:
-                    stop_loss_col = '止损点位1'
-                elif 'analysis.止损点位1' in columns:
-                    stop_loss_col = 'analysis.止损点位1'
-                else:
-                    # 查找包含"止损点位"的列
-                    for col in columns:
-                        if '止损点位' in col:
-                            stop_loss_col = col
-                            break
-                
-                target_col = None
-                if '止盈点位1' in columns:
-                    target_col = '止盈点位1'
-                elif 'analysis.止盈点位1' in columns:
-                    target_col = 'analysis.止盈点位1'
-                else:
-                    # 查找包含"止盈点位"的列
-                    for col in columns:
-                        if '止盈点位' in col:
-                            target_col = col
-                            break
-                
-                if entry_col and symbol_col:
-                    # 筛选山寨币数据
-                    filtered_df = excel_df[
-                        excel_df[entry_col].notna() & 
-                        excel_df[symbol_col].notna() &
-                        (excel_df[entry_col] != '') &
-                        (excel_df[symbol_col] != '') &
-                        (excel_df[entry_col] != 0) &
-                        (excel_df[symbol_col].astype(str).str.strip() != '') &
-                        (excel_df[symbol_col].apply(is_altcoin_symbol))  # 只保留山寨币
-                    ]
-                    
-                    print(f"找到 {len(filtered_df)} 个山寨币已完成订单")
-                    
-                    if len(filtered_df) > 0:
-                        # 处理已完成订单
-                        for idx, row in filtered_df.iterrows():
-                            try:
-                                # 验证交易币种和入场点位
-                                original_symbol = str(row[symbol_col]).strip().upper()
-                                if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
-                                    continue
-                                
-                                try:
-                                    entry_price = float(row[entry_col])
-                                    if entry_price <= 0:
-                                        continue
-                                except (ValueError, TypeError):
-                                    continue
-                                
-                                normalized_symbol = normalize_symbol(original_symbol)
-                                if not normalized_symbol:
-                                    continue
-                                
-                                direction = str(row[direction_col]).strip() if direction_col and not pd.isna(row[direction_col]) else "做多"
-                                if direction not in ["做多", "做空"]:
-                                    direction = "做多"
-                                
-                                try:
-                                    stop_loss = float(row[stop_loss_col]) if stop_loss_col and not pd.isna(row[stop_loss_col]) else None
-                                    target_price = float(row[target_col]) if target_col and not pd.isna(row[target_col]) else None
-                                except (ValueError, TypeError):
-                                    stop_loss = None
-                                    target_price = None
-                                
-                                # 获取其他字段
-                                channel = str(row.get('channel', '未知')).strip()
-                                publish_time = row.get('timestamp', '')
-                                
-                                # 获取盈亏信息
-                                profit_pct = None
-                                if '总加权盈亏%' in columns and not pd.isna(row['总加权盈亏%']):
-                                    profit_str = str(row['总加权盈亏%']).replace('%', '')
-                                    try:
-                                        profit_pct = float(profit_str)
-                                    except:
-                                        profit_pct = None
-                                
-                                # 计算风险收益比
-                                risk_reward_ratio = calculate_risk_reward_ratio(direction, entry_price, target_price, stop_loss)
-                                
-                                # 获取结果
-                                result = row.get('最终结果', '')
-                                
-                                # 获取持仓时间
-                                hold_time = row.get('hold_time', '')
-                                
-                                order = create_order_object(
-                                    id_num=order_id,
-                                    symbol=original_symbol,
-                                    normalized_symbol=normalized_symbol,
-                                    direction=direction,
-                                    entry_price=entry_price,
-                                    average_entry_cost=None,
-                                    profit_pct=profit_pct,
-                                    target_price=target_price,
-                                    stop_loss=stop_loss,
-                                    exit_price=None,
-                                    exit_time=None,
-                                    is_completed=True,
-                                    channel=channel,
-                                    publish_time=publish_time,
-                                    risk_reward_ratio=risk_reward_ratio,
-                                    hold_time=hold_time,
-                                    result=result,
-                                    source="results.xlsx"
-                                )
-                                
-                                # 添加到山寨币已完成订单列表
-                                altcoin_completed_orders.append(order)
-                                processed_orders.append(order)
-                                
-                                # 添加到按币种分类的字典
-                                symbol_key = original_symbol.upper()
-                                if symbol_key not in altcoin_orders_by_symbol:
-                                    altcoin_orders_by_symbol[symbol_key] = []
-                                altcoin_orders_by_symbol[symbol_key].append(order)
-                                
-                                order_id += 1
-                            
-                            except Exception as e:
-                                print(f"处理Excel行 {idx+1} 时出错: {e}")
+                # 列名
+                columns = excel_df.columns.tolist()
+                print(f"Excel文件列名: {columns}")
+                
+                # 获取关键列 - 优先匹配精确列名
+                key_columns = resolve_columns(columns, ALTCOIN_EXCEL_COLUMNS)
+                entry_col = key_columns['entry']
+                symbol_col = key_columns['symbol']
+                direction_col = key_columns['direction']
+                stop_loss_col = key_columns['stop_loss']
+                target_col = key_columns['target']
+                
+                if entry_col and symbol_col:
+                    # 筛选山寨币数据
+                    filtered_df = excel_df[
+                        excel_df[entry_col].notna() &
+                        (excel_df[entry_col] != '') &
+                        (excel_df[entry_col] != 0) &
+                        altcoin_symbol_mask(excel_df[symbol_col])  # 只保留山寨币
+                    ]
+                    
+                    print(f"找到 {len(filtered_df)} 个山寨币已完成订单")
+                    
+                    if len(filtered_df) > 0:
+                        # 处理已完成订单：整列转换类型后一次性生成订单字典
+                        symbols = filtered_df[symbol_col].astype(str).str.strip().str.upper()
+                        entry_prices = pd.to_numeric(filtered_df[entry_col], errors='coerce')
+                        valid = ~symbols.isin(['', 'NAN', 'NULL']) & (entry_prices > 0)
+                        clean_df = filtered_df[valid]
+                        
+                        rows_df = pd.DataFrame({
+                            'symbol': symbols[valid],
+                            'normalized_symbol': normalize_symbol_series(symbols[valid]),
+                            'entry_price': entry_prices[valid],
+                            'direction': direction_series(clean_df, direction_col),
+                            'stop_loss': numeric_column(clean_df, stop_loss_col),
+                            'target_price': numeric_column(clean_df, target_col),
+                            'channel': raw_column(clean_df, 'channel', '未知').map(str).str.strip(),
+                            'publish_time': publish_time_series(clean_df, 'timestamp', ''),
+                            'profit_pct': percent_column(clean_df, '总加权盈亏%'),
+                            'result': raw_column(clean_df, '最终结果', ''),
+                            'hold_time': raw_column(clean_df, 'hold_time', ''),
+                        })
+                        rows_df['risk_reward_ratio'] = risk_reward_ratio_series(
+                            rows_df['direction'], rows_df['entry_price'], rows_df['target_price'], rows_df['stop_loss'])
+                        rows_df = rows_df[rows_df['normalized_symbol'].notna()]
+                        
+                        orders = create_order_records(rows_df, order_id, is_completed=True, source="results.xlsx")
+                        order_id += len(orders)
+                        
+                        # 添加到山寨币已完成订单列表（按时间降序）
+                        altcoin_completed_orders.extend(sort_by_publish_time(orders, rows_df['publish_time']))
+                        processed_orders.extend(orders)
+                        
+                        # 添加到按币种分类的字典
+                        for order in orders:
+                            altcoin_orders_by_symbol[order['symbol']].append(order)
                         
                         print(f"从Excel文件成功加载了 {len(altcoin_completed_orders)} 个山寨币已完成订单")
                     else:
@@ -1415,7 +1596,8 @@ def load_altcoin_data():
         if os.path.exists(csv_file_path):
             try:
                 print(f"从CSV文件加载山寨币活跃订单: {csv_file_path}")
-                csv_df = pd.read_csv(csv_file_path)
+                # 与 load_order_data 使用相同的列和类型，共用同一份解析缓存
+                csv_df = read_table_cached(csv_file_path, usecols=ANALYSIS_CSV_COLUMNS, dtype=ANALYSIS_CSV_DTYPES)
                 print(f"CSV文件包含 {len(csv_df)} 行数据")
                 
                 # 列名
@@ -1431,102 +1613,54 @@ def load_altcoin_data():
                 content_col = 'analysis.原文' if 'analysis.原文' in columns else None
                 
                 if entry_col and symbol_col:
-                    # 筛选山寨币未完成的活跃订单
-                    active_df = csv_df[
-                        csv_df[entry_col].notna() & 
-                        csv_df[symbol_col].notna() &
-                        (csv_df[entry_col] != '') &
-                        (csv_df[symbol_col] != '') &
-                        (csv_df[entry_col] != 0) &
-                        (csv_df[symbol_col].astype(str).str.strip() != '') &
-                        (csv_df[symbol_col].apply(is_altcoin_symbol)) &  # 只保留山寨币
+                    # 筛选山寨币未完成的活跃订单：入场价先整列转为数值，只保留有效的正数
+                    csv_entry_prices = pd.to_numeric(csv_df[entry_col], errors='coerce')
+                    active_mask = (
+                        (csv_entry_prices > 0) &
+                        altcoin_symbol_mask(csv_df[symbol_col]) &  # 只保留山寨币
                         # 筛选未完成的订单
-                        (csv_df.get('status') != 'completed') &
-                        (csv_df.get('exit_price').isna() | (csv_df.get('exit_price') == '')) &
-                        (csv_df.get('exit_time').isna() | (csv_df.get('exit_time') == '')) &
-                        (csv_df.get('result').isna() | (csv_df.get('result') == ''))
-                    ]
+                        ~status_completed_mask(csv_df) &
+                        empty_mask(csv_df, 'exit_price') &
+                        empty_mask(csv_df, 'exit_time') &
+                        empty_mask(csv_df, 'result')
+                    )
+                    active_df = csv_df[active_mask]
                     print(f"找到 {len(active_df)} 个山寨币活跃订单")
                     
                     if len(active_df) > 0:
-                        # 处理活跃订单
-                        for idx, row in active_df.iterrows():
-                            try:
-                                # 验证交易币种和入场点位
-                                original_symbol = str(row[symbol_col]).strip().upper()
-                                if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
-                                    continue
-                                
-                                try:
-                                    entry_price = float(row[entry_col])
-                                    if entry_price <= 0:
-                                        continue
-                                except (ValueError, TypeError):
-                                    continue
-                                    
-                                normalized_symbol = normalize_symbol(original_symbol)
-                                if not normalized_symbol:
-                                    continue
-                                
-                                direction = str(row[direction_col]).strip() if direction_col and not pd.isna(row[direction_col]) else "做多"
-                                if direction not in ["做多", "做空"]:
-                                    direction = "做多"
-                                
-                                try:
-                                    stop_loss = float(row[stop_loss_col]) if stop_loss_col and not pd.isna(row[stop_loss_col]) else None
-                                    target_price = float(row[target_col]) if target_col and not pd.isna(row[target_col]) else None
-                                except (ValueError, TypeError):
-                                    stop_loss = None
-                                    target_price = None
-                                
-                                # 获取其他字段
-                                channel = str(row.get('channel', '未知')).strip()
-                                publish_time = row.get('timestamp', '')
-                                
-                                # 获取分析内容和原文
-                                analysis_content = str(row[analysis_col]).strip() if analysis_col and not pd.isna(row[analysis_col]) else ''
-                                original_content = str(row[content_col]).strip() if content_col and not pd.isna(row[content_col]) else ''
-                                
-                                # 计算风险收益比
-                                risk_reward_ratio = calculate_risk_reward_ratio(direction, entry_price, target_price, stop_loss)
-                                
-                                order = create_order_object(
-                                    id_num=order_id,
-                                    symbol=original_symbol,
-                                    normalized_symbol=normalized_symbol,
-                                    direction=direction,
-                                    entry_price=entry_price,
-                                    average_entry_cost=None,
-                                    profit_pct=None,
-                                    target_price=target_price,
-                                    stop_loss=stop_loss,
-                                    exit_price=None,
-                                    exit_time=None,
-                                    is_completed=False,
-                                    channel=channel,
-                                    publish_time=publish_time,
-                                    risk_reward_ratio=risk_reward_ratio,
-                                    hold_time=None,
-                                    result="-",
-                                    source="all_analysis_results.csv",
-                                    analysis_content=analysis_content,
-                                    original_content=original_content
-                                )
-                                
-                                # 添加到山寨币活跃订单列表
-                                altcoin_active_orders.append(order)
-                                processed_orders.append(order)
-                                
-                                # 添加到按币种分类的字典
-                                symbol_key = original_symbol.upper()
-                                if symbol_key not in altcoin_orders_by_symbol:
-                                    altcoin_orders_by_symbol[symbol_key] = []
-                                altcoin_orders_by_symbol[symbol_key].append(order)
-                                
-                                order_id += 1
-                            
-                            except Exception as e:
-                                print(f"处理CSV行 {idx+1} 时出错: {e}")
+                        # 处理活跃订单：整列转换类型后一次性生成订单字典
+                        symbols = active_df[symbol_col].astype(str).str.strip().str.upper()
+                        entry_prices = csv_entry_prices[active_mask]
+                        valid = ~symbols.isin(['', 'NAN', 'NULL'])
+                        clean_df = active_df[valid]
+                        
+                        rows_df = pd.DataFrame({
+                            'symbol': symbols[valid],
+                            'normalized_symbol': normalize_symbol_series(symbols[valid]),
+                            'entry_price': entry_prices[valid],
+                            'direction': direction_series(clean_df, direction_col),
+                            'stop_loss': numeric_column(clean_df, stop_loss_col),
+                            'target_price': numeric_column(clean_df, target_col),
+                            'channel': raw_column(clean_df, 'channel', '未知').map(str).str.strip(),
+                            'publish_time': publish_time_series(clean_df, 'timestamp', ''),
+                            'analysis_content': text_column(clean_df, analysis_col, '').str.strip(),
+                            'original_content': text_column(clean_df, content_col, '').str.strip(),
+                        })
+                        rows_df['risk_reward_ratio'] = risk_reward_ratio_series(
+                            rows_df['direction'], rows_df['entry_price'], rows_df['target_price'], rows_df['stop_loss'])
+                        rows_df = rows_df[rows_df['normalized_symbol'].notna()]
+                        
+                        orders = create_order_records(rows_df, order_id, is_completed=False,
+                                                      source="all_analysis_results.csv", result="-")
+                        order_id += len(orders)
+                        
+                        # 添加到山寨币活跃订单列表（按时间降序）
+                        altcoin_active_orders.extend(sort_by_publish_time(orders, rows_df['publish_time']))
+                        processed_orders.extend(orders)
+                        
+                        # 添加到按币种分类的字典
+                        for order in orders:
+                            altcoin_orders_by_symbol[order['symbol']].append(order)
                         
                         print(f"从CSV文件成功加载了 {len(altcoin_active_orders)} 个山寨币活跃订单")
                     else:
@@ -1536,10 +1670,6 @@ def load_altcoin_data():
             except Exception as e:
                 print(f"从CSV文件加载山寨币活跃订单时出错: {e}")
         
-        # 按时间降序排序
-        altcoin_active_orders.sort(key=lambda x: x.get('publish_time', ''), reverse=True)
-        altcoin_completed_orders.sort(key=lambda x: x.get('publish_time', ''), reverse=True)
-        
         print(f"山寨币订单加载完成: {len(altcoin_active_orders)} 个活跃订单, {len(altcoin_completed_orders)} 个已完成订单")
         return True
         
@@ -1549,11 +1679,17 @@ def load_altcoin_data():
         return False
 
 
+# 多单/空单方向取值（兼容简写）
+LONG_DIRECTIONS = frozenset(['做多', '多'])
+SHORT_DIRECTIONS = frozenset(['做空', '空'])
+# 入场触发检查中视为空单的方向
+ENTRY_SHORT_DIRECTIONS = frozenset(['空单', '做空', '空头', 'SHORT'])
+
 # 计算风险收益比
 def calculate_risk_reward_ratio(direction, entry_price, target_price, stop_loss):
     """计算风险收益比"""
     if entry_price is not None and target_price is not None and stop_loss is not None:
-        if direction == '多':
+        if direction in LONG_DIRECTIONS:
             # 多单：目标价格应高于入场价，止损应低于入场价
             potential_profit = target_price - entry_price
             potential_loss = entry_price - stop_loss
@@ -1568,6 +1704,153 @@ def calculate_risk_reward_ratio(direction, entry_price, target_price, stop_loss)
     
     return None  # 无效数据返回None
 
+@lru_cache(maxsize=None)
+def _direction_sign_table(long_values, short_values):
+    """方向值 -> 符号的查找表，以及不在表中的方向的默认符号"""
+    table = {value: -1 for value in (short_values or ())}
+    table.update((value, 1) for value in long_values)
+    return table, (-1 if short_values is None else 0)
+
+def direction_signs(direction, long_values, short_values=None):
+    """方向编码为int8：多单1，空单-1，其他0（short_values为None时非多单都视为空单）
+    
+    方向只有少数几种取值，每个订单查一次表，不再对整个数组逐个集合做isin。
+    """
+    table, default = _direction_sign_table(long_values, short_values)
+    get = table.get
+    return np.fromiter((get(value, default) for value in direction), dtype=np.int8)
+
+def _float_or_nan(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+def float_array(values):
+    """逐个float()转换为float64数组，无法转换的值（None、空字符串等）为NaN"""
+    return np.fromiter((_float_or_nan(value) for value in values), dtype=np.float64)
+
+def _order_profit_pct(order):
+    """解析订单盈亏百分比（profit_pct优先，其次weighted_profit_pct），无法解析时返回None"""
+    profit_pct = order.get('profit_pct') or order.get('weighted_profit_pct') or 0
+    try:
+        if isinstance(profit_pct, str):
+            return float(profit_pct.replace('%', ''))
+        return float(profit_pct)
+    except Exception as e:
+        logger.debug(f"处理订单盈亏数据时出错: {e}, 订单数据: {order}")
+        return None
+
+def max_consecutive_runs(outcomes):
+    """计算布尔胜负序列（True为盈利）中最长的连续盈利、连续亏损次数"""
+    if outcomes.size == 0:
+        return 0, 0
+    # 游程编码：每段连续相同结果的起点与长度
+    boundaries = np.flatnonzero(np.concatenate(([True], outcomes[1:] != outcomes[:-1], [True])))
+    run_lengths = np.diff(boundaries)
+    run_values = outcomes[boundaries[:-1]]
+    return int(run_lengths[run_values].max(initial=0)), int(run_lengths[~run_values].max(initial=0))
+
+# 批量计算内核：sign为 direction_signs 的结果，价格为float数组
+if njit is not None:
+    @njit(cache=True)
+    def _risk_reward_kernel(sign, entry, target, stop):
+        out = np.empty(entry.shape[0])
+        for i in range(entry.shape[0]):
+            potential_profit = sign[i] * (target[i] - entry[i])
+            potential_loss = sign[i] * (entry[i] - stop[i])
+            if potential_profit > 0 and potential_loss > 0:
+                out[i] = potential_profit / potential_loss
+            else:
+                out[i] = np.nan
+        return out
+    
+    @njit(cache=True)
+    def _profit_pct_kernel(sign, entry, current):
+        out = np.empty(entry.shape[0])
+        for i in range(entry.shape[0]):
+            if sign[i] == 0:
+                out[i] = 0.0
+            else:
+                out[i] = sign[i] * ((current[i] - entry[i]) / entry[i] * 100)
+        return out
+    
+    # 止盈/止损判断：多单 现价>=止盈 / 现价<=止损，空单相反；止盈优先，方向无效或价格缺失时都为False
+    @njit(cache=True)
+    def _exit_hits_kernel(sign, current, target, stop):
+        n = current.shape[0]
+        take_profit = np.zeros(n, dtype=np.bool_)
+        stop_loss = np.zeros(n, dtype=np.bool_)
+        for i in range(n):
+            if sign[i] == 0 or np.isnan(target[i]) or np.isnan(stop[i]):
+                continue
+            if sign[i] * (current[i] - target[i]) >= 0:
+                take_profit[i] = True
+            elif sign[i] * (stop[i] - current[i]) >= 0:
+                stop_loss[i] = True
+        return take_profit, stop_loss
+    
+    # 入场触发扫描：从start开始第一个 <= / >= threshold 的位置，没有时为-1
+    @njit(cache=True)
+    def _first_at_or_below(values, start, threshold):
+        for j in range(start, values.shape[0]):
+            if values[j] <= threshold:
+                return j
+        return -1
+    
+    @njit(cache=True)
+    def _first_at_or_above(values, start, threshold):
+        for j in range(start, values.shape[0]):
+            if values[j] >= threshold:
+                return j
+        return -1
+else:
+    def _risk_reward_kernel(sign, entry, target, stop):
+        potential_profit = sign * (target - entry)
+        potential_loss = sign * (entry - stop)
+        valid = (potential_profit > 0) & (potential_loss > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(valid, potential_profit / potential_loss, np.nan)
+    
+    def _profit_pct_kernel(sign, entry, current):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (current - entry) / entry * 100
+        return np.where(sign == 0, 0.0, sign * change)
+    
+    def _exit_hits_kernel(sign, current, target, stop):
+        checkable = (sign != 0) & ~np.isnan(target) & ~np.isnan(stop)
+        take_profit = checkable & (sign * (current - target) >= 0)
+        stop_loss = checkable & ~take_profit & (sign * (stop - current) >= 0)
+        return take_profit, stop_loss
+    
+    def _first_at_or_below(values, start, threshold):
+        hits = values[start:] <= threshold
+        first = int(np.argmax(hits)) if hits.size else 0
+        return start + first if hits.size and hits[first] else -1
+    
+    def _first_at_or_above(values, start, threshold):
+        hits = values[start:] >= threshold
+        first = int(np.argmax(hits)) if hits.size else 0
+        return start + first if hits.size and hits[first] else -1
+
+def risk_reward_ratios(direction, entry_price, target_price, stop_loss):
+    """数组版 calculate_risk_reward_ratio：一次计算整组订单的风险收益比，无效数据为NaN
+    
+    direction为方向数组，价格为数值数组/列表（缺失值为NaN）。
+    """
+    e = np.asarray(entry_price, dtype=float)
+    t = np.asarray(target_price, dtype=float)
+    s = np.asarray(stop_loss, dtype=float)
+    return _risk_reward_kernel(direction_signs(direction, LONG_DIRECTIONS), e, t, s)
+
+def risk_reward_ratio_series(direction, entry_price, target_price, stop_loss):
+    """向量化计算风险收益比，规则与 calculate_risk_reward_ratio 一致，无效数据为NaN"""
+    ratio = risk_reward_ratios(direction,
+                               pd.to_numeric(entry_price, errors='coerce'),
+                               pd.to_numeric(target_price, errors='coerce'),
+                               pd.to_numeric(stop_loss, errors='coerce'))
+    return pd.Series(ratio, index=direction.index)
+
 # 检查订单是否已完成
 def check_if_completed(exit_price, exit_time, row):
     """检查订单是否已完成"""
@@ -1621,26 +1904,60 @@ def create_order_object(id_num, symbol, normalized_symbol, direction, entry_pric
         'original_content': original_content  # 原文内容
     }
 
-# 价格缓存，避免频繁API调用
-price_cache = {}
-price_cache_time = {}
+def create_order_records(columns, start_id, is_completed, source=None, **constants):
+    """批量版 create_order_object：columns的列名为订单字段名，constants为所有订单相同的字段值
+    
+    未提供的字段使用 create_order_object 的默认值，id从start_id开始递增，NaN统一转为None。
+    """
+    template = create_order_object(None, None, None, None, None, None, None, None, None, None, None,
+                                   is_completed, None, None, None, None, None, source=source)
+    template.update(constants)
+    # 只有随行变化的字段需要逐列转换，其余字段直接沿用模板中的值
+    keys = [key for key in template if key in columns and key not in ('id', 'status', 'is_weighted')]
+    arrays = [object_values(columns[key]) for key in keys]
+    if 'entry_price_2' in columns or 'entry_price_3' in columns:
+        keys.append('is_weighted')
+        arrays.append((raw_column(columns, 'entry_price_2').notna() |
+                       raw_column(columns, 'entry_price_3').notna()).to_numpy(dtype=object))
+    ids = range(start_id, start_id + len(columns))
+    return [{**template, 'id': id_num, **dict(zip(keys, values))}
+            for id_num, values in zip(ids, zip(*arrays))]
+
+def sort_by_publish_time(orders, publish_time):
+    """订单按publish_time降序排列（稳定排序，与 list.sort(key=publish_time, reverse=True) 顺序一致）
+    
+    publish_time为与orders一一对应的列，排序在pandas中完成，不再逐个比较字典。
+    """
+    positions = publish_time.reset_index(drop=True).sort_values(ascending=False, kind='stable').index
+    return [orders[i] for i in positions]
+
+def truthy_mask(series):
+    """向量化：与 bool(value) 一致的真值判断，缺失值为False"""
+    return series.notna() & series.astype(bool)
+
+# 获取实时价格的主要币种
+REALTIME_SYMBOLS = frozenset(['BTCUSDT', 'ETHUSDT', 'SOLUSDT'])
+# 需要进行价格异常检查的币种
+PRICE_CHECK_SYMBOLS = frozenset(['BTCUSDT', 'SOLUSDT', 'ETHUSDT', 'XRPUSDT'])
+
+# 价格缓存，避免频繁API调用：symbol -> (价格, 获取时间)
+price_cache: Dict[str, tuple] = {}
 PRICE_CACHE_DURATION = 30  # 缓存30秒
 
 def get_cached_price(symbol):
     """获取缓存的价格，如果缓存过期则重新获取"""
     current_time = time.time()
     
-    # 检查缓存是否存在且未过期
-    if symbol in price_cache and symbol in price_cache_time:
-        if current_time - price_cache_time[symbol] < PRICE_CACHE_DURATION:
-            return price_cache[symbol]
+    # 检查缓存是否存在且未过期（一次查找同时取出价格和时间）
+    cached = price_cache.get(symbol)
+    if cached is not None and current_time - cached[1] < PRICE_CACHE_DURATION:
+        return cached[0]
     
     # 缓存过期或不存在，重新获取价格
     try:
         current_price = monitor.get_current_price(symbol)
         if current_price is not None:
-            price_cache[symbol] = current_price
-            price_cache_time[symbol] = current_time
+            price_cache[symbol] = (current_price, current_time)
             return current_price
     except Exception as e:
         logger.warning(f"获取价格失败: {symbol}, error: {e}")
@@ -1659,77 +1976,34 @@ def filter_abnormal_price_orders(orders):
     """
     if not orders:
         return orders
-        
-    filtered_orders = []
     
-    # 需要进行价格异常检查的币种
-    check_symbols = ['BTCUSDT', 'SOLUSDT', 'ETHUSDT', 'XRPUSDT']
+    # 只取出需要的两个字段，整列计算过滤条件
+    symbols = pd.Series([order.get('normalized_symbol') for order in orders], dtype=object)
+    raw_entries = pd.Series([order.get('entry_price') for order in orders], dtype=object)
     
-    for order in orders:
-        try:
-            # 获取订单信息
-            symbol = order.get('normalized_symbol')
-            entry_price = order.get('entry_price')
-            
-            # 如果必要信息缺失，直接添加（不过滤）
-            if not symbol or not entry_price:
-                filtered_orders.append(order)
-                continue
-                
-            # 验证交易对有效性
-            invalid_symbols = [
-                'ALCHUSDT', 'USDT', 'USDTUSDT', 
-                'RFCUSDT', 'ZBCNUSDT', 'NANUSDT', 'TAIUSDT'
-            ]
-            if symbol in invalid_symbols:
-                logger.debug(f"跳过无效交易对: {symbol}")
-                continue
-                
-            # 如果不是需要检查的币种，直接添加到过滤后的列表
-            if symbol not in check_symbols:
-                filtered_orders.append(order)
-                continue
-                
-            # 对BTC、SOL、ETH、XRP进行价格异常检查
-            # 使用缓存获取当前价格
-            current_price = get_cached_price(symbol)
-            if current_price is None:
-                # 如果无法获取价格，保留该订单（不过滤）
-                filtered_orders.append(order)
-                continue
-                
-            # 计算价格差异百分比
-            try:
-                entry_price_float = float(entry_price)
-                current_price_float = float(current_price)
-                
-                if entry_price_float <= 0:
-                    # 入场价格无效，保留该订单
-                    filtered_orders.append(order)
-                    continue
-                    
-                # 计算价格差异百分比
-                price_diff_pct = abs(current_price_float - entry_price_float) / entry_price_float * 100
-                
-                # 如果价格差异超过10%，过滤掉该订单
-                if price_diff_pct > 10:
-                    logger.info(f"过滤价格异常订单: {order.get('symbol')} "
-                              f"入场价格: {entry_price_float}, 当前价格: {current_price_float}, "
-                              f"价格差异: {price_diff_pct:.2f}%")
-                    continue
-                    
-                # 价格正常，添加到过滤后的列表
-                filtered_orders.append(order)
-                
-            except (ValueError, TypeError) as e:
-                # 价格转换失败，保留该订单
-                filtered_orders.append(order)
-                continue
-                
-        except Exception as e:
-            # 处理出错，保留该订单
-            filtered_orders.append(order)
-            continue
+    # 必要信息缺失的订单直接保留（不过滤），astype(bool) 与逐个 bool(value) 判断一致
+    has_info = symbols.astype(bool) & raw_entries.astype(bool)
+    invalid = has_info & symbols.isin(INVALID_PRICE_SYMBOLS)
+    checked = has_info & symbols.isin(PRICE_CHECK_SYMBOLS)
+    
+    # 对BTC、SOL、ETH、XRP进行价格异常检查：每个币种只取一次价格（使用缓存）
+    prices = {symbol: get_cached_price(symbol) for symbol in symbols[checked].unique()}
+    current_prices = pd.to_numeric(symbols.map(prices), errors='coerce')
+    entry_prices = pd.to_numeric(raw_entries, errors='coerce')
+    
+    # 无法获取价格、入场价格无效或无法转换的订单保留；价格差异超过10%的订单过滤掉
+    price_diff_pct = (current_prices - entry_prices).abs() / entry_prices * 100
+    abnormal = checked & (entry_prices > 0) & (price_diff_pct > 10)
+    
+    for i in np.flatnonzero(invalid.to_numpy()):
+        logger.debug(f"跳过无效交易对: {symbols[i]}")
+    for i in np.flatnonzero(abnormal.to_numpy()):
+        logger.info(f"过滤价格异常订单: {orders[i].get('symbol')} "
+                  f"入场价格: {float(entry_prices[i])}, 当前价格: {float(current_prices[i])}, "
+                  f"价格差异: {price_diff_pct[i]:.2f}%")
+    
+    keep = ~(invalid | abnormal).to_numpy()
+    filtered_orders = [order for order, kept in zip(orders, keep) if kept]
             
     # 只在有过滤时才输出日志
     if len(filtered_orders) < len(orders):
@@ -1740,37 +2014,50 @@ def filter_abnormal_price_orders(orders):
 # 价格历史数据缓存
 price_history_cache = {}
 price_history_cache_time = 0
+price_history_cache_since = None  # 缓存数据覆盖的最早日期，None表示全部历史
 PRICE_HISTORY_CACHE_DURATION = 300  # 5分钟缓存
 
-def load_price_history():
-    """从 price_history.csv 加载价格历史数据"""
-    global price_history_cache, price_history_cache_time
+def load_price_history(since_day=None):
+    """从 price_history.csv 及其按天归档的文件加载价格历史数据
+    
+    since_day（YYYY-MM-DD）为最早需要的日期（待入场订单中最早的发布日期），更早的归档文件不读取。
+    """
+    global price_history_cache, price_history_cache_time, price_history_cache_since
     
     current_time = time.time()
-    # 如果缓存未过期，直接返回
-    if current_time - price_history_cache_time < PRICE_HISTORY_CACHE_DURATION and price_history_cache:
+    # 如果缓存未过期且覆盖了需要的日期，直接返回
+    covered = price_history_cache_since is None or (since_day is not None and since_day >= price_history_cache_since)
+    if current_time - price_history_cache_time < PRICE_HISTORY_CACHE_DURATION and price_history_cache and covered:
         return price_history_cache
     
     try:
-        price_history_file = os.path.join('data', 'price_history.csv')
-        if not os.path.exists(price_history_file):
-            logger.warning(f"价格历史文件不存在: {price_history_file}")
+        df = read_price_history(since_day)
+        if df is None:
+            logger.warning(f"价格历史文件不存在: {PRICE_HISTORY_FILE}")
             return {}
         
-        df = pd.read_csv(price_history_file)
-        
         # 将timestamp转换为datetime
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         
-        # 按币种分组存储价格历史
+        # 按币种分组存储价格历史：每个币种保存按时间排序的 (时间索引, 最低价数组, 最高价数组,
+        # 后缀最低价, 后缀最高价)，查询时用二分查找定位发布时间，不再逐行比较整个DataFrame
+        df = df[df['timestamp'].notna()].sort_values('timestamp', kind='stable')
         history_data = {}
-        for symbol in df['symbol'].unique():
-            symbol_data = df[df['symbol'] == symbol].copy()
-            symbol_data = symbol_data.sort_values('timestamp')
-            history_data[symbol] = symbol_data
+        for symbol, group in df.groupby('symbol', sort=False):
+            low_prices = group['low_price'].to_numpy(dtype=float)
+            high_prices = group['high_price'].to_numpy(dtype=float)
+            history_data[symbol] = (
+                pd.DatetimeIndex(group['timestamp']),
+                low_prices,
+                high_prices,
+                # 第i位为第i条之后（含）的最低/最高价，fmin/fmax忽略缺失值
+                np.fmin.accumulate(low_prices[::-1])[::-1],
+                np.fmax.accumulate(high_prices[::-1])[::-1],
+            )
         
         price_history_cache = history_data
         price_history_cache_time = current_time
+        price_history_cache_since = since_day
         
         logger.info(f"加载价格历史数据完成，包含 {len(history_data)} 个币种的数据")
         return history_data
@@ -1779,6 +2066,42 @@ def load_price_history():
         logger.error(f"加载价格历史数据失败: {e}")
         return {}
 
+# 发布时间解析缓存：字符串 -> Timestamp（无法解析为NaT），每次刷新入场状态时不再重复解析
+_publish_dt_cache: Dict[str, pd.Timestamp] = {}
+PUBLISH_DT_CACHE_SIZE = 100000
+
+def parse_publish_times(texts):
+    """发布时间字符串批量解析为DatetimeIndex，未缓存的值一次性向量化解析"""
+    unique_texts = dict.fromkeys(texts)
+    if len(_publish_dt_cache) + len(unique_texts) > PUBLISH_DT_CACHE_SIZE:
+        _publish_dt_cache.clear()
+    missing = [text for text in unique_texts if text not in _publish_dt_cache]
+    if missing:
+        # format='mixed' 逐个值推断格式，与单独调用 pd.to_datetime 的结果一致
+        _publish_dt_cache.update(zip(missing, pd.to_datetime(missing, format='mixed', errors='coerce')))
+    return pd.DatetimeIndex([_publish_dt_cache[text] for text in texts])
+
+def _entry_trigger_from(history, start, entry_price, direction):
+    """从价格历史的第start条数据开始，查找第一次触及入场价格的时间"""
+    timestamps, low_prices, high_prices, low_suffix_min, high_suffix_max = history
+    if start >= len(timestamps):
+        return False, None
+    
+    # 检查是否触及入场价格：先用后缀最低/最高价O(1)判断是否会触发，只有会触发时才查找第一次触发的位置
+    entry_price = float(entry_price)
+    if direction in ENTRY_SHORT_DIRECTIONS:
+        # 空单：价格涨到入场价或以上时触发
+        if not high_suffix_max[start] >= entry_price:
+            return False, None
+        first_hit = _first_at_or_above(high_prices, int(start), entry_price)
+    else:
+        # 多单：价格跌到入场价或以下时触发（未知方向默认为多单处理）
+        if not low_suffix_min[start] <= entry_price:
+            return False, None
+        first_hit = _first_at_or_below(low_prices, int(start), entry_price)
+    
+    return True, timestamps[first_hit]
+
 def check_entry_triggered(order):
     """检查订单是否已触及入场点位"""
     try:
@@ -1790,13 +2113,6 @@ def check_entry_triggered(order):
         if not all([symbol, entry_price, publish_time]):
             return False, None
         
-        # 加载价格历史数据
-        price_history = load_price_history()
-        if symbol not in price_history:
-            return False, None
-        
-        symbol_data = price_history[symbol]
-        
         # 将发布时间转换为datetime
         try:
             if isinstance(publish_time, str):
@@ -1808,41 +2124,78 @@ def check_entry_triggered(order):
             logger.warning(f"无法解析发布时间: {publish_time}")
             return False, None
         
-        # 筛选发布时间之后的价格数据
-        after_publish = symbol_data[symbol_data['timestamp'] >= publish_dt]
-        
-        if after_publish.empty:
+        if pd.isna(publish_dt):
             return False, None
         
-        # 检查是否触及入场价格
-        triggered = False
-        triggered_time = None
-        
-        if direction in ['多单', '做多', '多头', 'LONG']:
-            # 多单：价格跌到入场价或以下时触发
-            triggered_rows = after_publish[after_publish['low_price'] <= entry_price]
-        elif direction in ['空单', '做空', '空头', 'SHORT']:
-            # 空单：价格涨到入场价或以上时触发
-            triggered_rows = after_publish[after_publish['high_price'] >= entry_price]
-        else:
-            # 未知方向，默认为多单处理
-            triggered_rows = after_publish[after_publish['low_price'] <= entry_price]
-        
-        if not triggered_rows.empty:
-            triggered = True
-            triggered_time = triggered_rows.iloc[0]['timestamp']
+        # 加载发布日期之后的价格历史数据
+        price_history = load_price_history(publish_dt.strftime('%Y-%m-%d'))
+        if symbol not in price_history:
+            return False, None
         
-        return triggered, triggered_time
+        # 二分查找发布时间之后的第一条价格数据
+        start = price_history[symbol][0].searchsorted(publish_dt, side='left')
+        return _entry_trigger_from(price_history[symbol], start, entry_price, direction)
         
     except Exception as e:
         logger.error(f"检查入场触发失败 {order.get('symbol', 'unknown')}: {e}")
         return False, None
 
+def check_entry_triggered_batch(orders, history):
+    """批量版 check_entry_triggered：orders为同一币种的订单，history为该币种的价格历史
+    
+    发布时间整组解析（已解析过的直接取缓存），并用一次 searchsorted 定位每个订单的起始位置。
+    """
+    results = [(False, None)] * len(orders)
+    if history is None:
+        return results
+    
+    candidates = [i for i, order in enumerate(orders)
+                  if all([order.get('entry_price'), order.get('publish_time')])]
+    if not candidates:
+        return results
+    try:
+        publish_dts = parse_publish_times([str(orders[i].get('publish_time')) for i in candidates])
+        starts = history[0].searchsorted(publish_dts, side='left')
+    except (ValueError, TypeError):
+        # 时区不一致等无法整组解析的情况，逐个订单检查
+        return [check_entry_triggered(order) for order in orders]
+    
+    for i, publish_dt, start in zip(candidates, publish_dts, starts):
+        if pd.isna(publish_dt):
+            continue
+        order = orders[i]
+        try:
+            results[i] = _entry_trigger_from(history, start, order.get('entry_price'),
+                                             order.get('direction', '做多'))
+        except Exception as e:
+            logger.error(f"检查入场触发失败 {order.get('symbol', 'unknown')}: {e}")
+    return results
+
 def update_entry_status_for_orders(orders):
-    """更新订单列表的入场状态"""
-    for order in orders:
-        if order.get('status') == 'active' and not order.get('has_entered', False):
-            triggered, triggered_time = check_entry_triggered(order)
+    """更新订单列表的入场状态（按币种分组，每个币种的价格历史只查找一次）"""
+    pending = [order for order in orders
+               if order.get('status') == 'active' and not order.get('has_entered', False)]
+    if not pending:
+        return
+    
+    # 只读取最早的待入场订单发布日期之后的价格历史；没有可解析的发布时间时不会触发入场，无需加载
+    price_history = {}
+    try:
+        earliest = parse_publish_times([str(order.get('publish_time')) for order in pending
+                                        if order.get('publish_time')]).min()
+        if not pd.isna(earliest):
+            price_history = load_price_history(earliest.strftime('%Y-%m-%d'))
+    except (ValueError, TypeError):
+        # 时区不一致等无法整组比较的情况，加载全部历史
+        price_history = load_price_history()
+    orders_by_symbol = defaultdict(list)
+    for order in pending:
+        orders_by_symbol[order.get('normalized_symbol')].append(order)
+    
+    for symbol, symbol_orders in orders_by_symbol.items():
+        history = price_history.get(symbol) if symbol else None
+        results = check_entry_triggered_batch(symbol_orders, history)
+        for order, (triggered, triggered_time) in zip(symbol_orders, results):
             order['triggered'] = triggered
             order['triggered_time'] = triggered_time
             
@@ -1853,6 +2206,17 @@ def update_entry_status_for_orders(orders):
                 order['has_entered'] = False
                 order['entry_status'] = '未入场'
 
+def move_orders(indices, source, target):
+    """把source中indices位置的订单移到target末尾，source原地一次重建，返回 [(原索引, 订单)]
+    
+    按索引从大到小追加到target，与逐个从后往前del时的顺序一致；越界的索引忽略。
+    """
+    to_move = {i for i in indices if i < len(source)}
+    moved = [(i, source[i]) for i in sorted(to_move, reverse=True)]
+    target.extend(order for _, order in moved)
+    source[:] = [order for j, order in enumerate(source) if j not in to_move]
+    return moved
+
 # 更新活跃订单的当前价格和盈亏
 def update_order_prices():
     """更新活跃订单的当前价格和盈亏 - 只对BTC、ETH、SOL获取实时价格"""
@@ -1861,13 +2225,31 @@ def update_order_prices():
     orders_updated = False
     orders_to_complete = []
     
-    # 定义需要获取实时价格的主要币种
-    realtime_symbols = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
-    
     # 调试日志，记录更新前的订单数量
     logger.info(f"更新价格前 - 活跃订单: {len(active_orders)}, 已完成订单: {len(completed_orders)}")
     
-    for i, order in enumerate(active_orders):
+    # 逐订单的计算过程只在DEBUG级别记录，循环前判断一次，避免生产环境中每个订单都格式化日志字符串
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    priced_orders = defaultdict(int)
+    
+    # 先按币种筛选出需要处理的订单：已完成的、缺少交易对的（需要记录警告）和需要实时价格的主要币种，
+    # 其余订单（山寨币、无效交易对）在循环中不再逐个访问
+    candidate_indices = [
+        i for i, order in enumerate(active_orders)
+        if order.get('status') == 'completed' or order.get('is_completed')
+        or not order.get('normalized_symbol') or order.get('normalized_symbol') in REALTIME_SYMBOLS
+    ]
+    if debug_enabled and len(candidate_indices) < len(active_orders):
+        logger.debug(f"跳过 {len(active_orders) - len(candidate_indices)} 个非主要币种订单，不获取实时价格")
+    
+    # 一次取齐本轮需要的价格（与 update_all_orders_status 共用快照）
+    cycle_prices = get_tick_prices(
+        active_orders[i].get('normalized_symbol') for i in candidate_indices
+        if active_orders[i].get('normalized_symbol') in REALTIME_SYMBOLS
+    )
+    
+    for i in candidate_indices:
+        order = active_orders[i]
         try:
             # 跳过已完成的订单
             if order.get('status') == 'completed' or order.get('is_completed'):
@@ -1880,55 +2262,47 @@ def update_order_prices():
                 logger.warning(f"订单 #{i} 缺少normalized_symbol字段: {original_symbol}")
                 continue
                 
-            # 验证交易对有效性
-            invalid_symbols = [
-                'ALCHUSDT', 'USDT', 'USDTUSDT', 
-                'RFCUSDT', 'ZBCNUSDT', 'NANUSDT', 'TAIUSDT'
-            ]
-            if symbol in invalid_symbols:
-                logger.debug(f"跳过无效交易对: {symbol}")
-                continue
-            
-            # 检查是否为需要实时价格的主要币种
-            if symbol not in realtime_symbols:
-                logger.debug(f"跳过 {symbol}: 非主要币种，不获取实时价格")
-                continue
-                
-            # 使用monitor获取当前价格
-            logger.info(f"获取 {symbol}(原始: {original_symbol}) 的当前价格")
-            current_price = monitor.get_current_price(symbol)
+            # 使用本轮的价格快照（每个币种每轮只请求一次）
+            current_price = cycle_prices.get(symbol)
             if current_price is None:
                 logger.warning(f"跳过 {symbol}: 无法获取当前价格")
                 continue
                 
             # 更新订单的当前价格
             order['current_price'] = current_price
-            logger.info(f"订单 #{i} {symbol} 当前价格: {current_price}")
+            priced_orders[symbol] += 1
+            if debug_enabled:
+                logger.debug(f"订单 #{i} {symbol} 当前价格: {current_price}")
             
             # 计算盈亏百分比
             entry_price = float(order.get('entry_price', 0))
             if entry_price > 0:
                 try:
                     direction = order.get('direction', '多')
-                    logger.info(f"订单 #{i} {symbol} 方向: {direction}, 入场价格: {entry_price}, 当前价格: {current_price}")
+                    if debug_enabled:
+                        logger.debug(f"订单 #{i} {symbol} 方向: {direction}, 入场价格: {entry_price}, 当前价格: {current_price}")
                     
                     # 修正后的方向判断，支持"多"、"做多"、"空"、"做空"
-                    is_long = direction in ['多', '做多']
-                    is_short = direction in ['空', '做空']
+                    is_long = direction in LONG_DIRECTIONS
+                    is_short = direction in SHORT_DIRECTIONS
                     
                     if is_long:
                         profit_pct = ((float(current_price) - entry_price) / entry_price) * 100
-                        logger.info(f"做多盈亏计算: ({current_price} - {entry_price}) / {entry_price} * 100 = {profit_pct:.2f}%")
+                        if debug_enabled:
+                            logger.debug(f"做多盈亏计算: ({current_price} - {entry_price}) / {entry_price} * 100 = {profit_pct:.2f}%")
                     elif is_short:
                         profit_pct = ((entry_price - float(current_price)) / entry_price) * 100
-                        logger.info(f"做空盈亏计算: ({entry_price} - {current_price}) / {entry_price} * 100 = {profit_pct:.2f}%")
+                        if debug_enabled:
+                            logger.debug(f"做空盈亏计算: ({entry_price} - {current_price}) / {entry_price} * 100 = {profit_pct:.2f}%")
                     else:
                         logger.warning(f"订单 #{i} {symbol} 方向无效: {direction}，默认作为做多处理")
                         profit_pct = ((float(current_price) - entry_price) / entry_price) * 100
-                        logger.info(f"默认做多盈亏计算: ({current_price} - {entry_price}) / {entry_price} * 100 = {profit_pct:.2f}%")
+                        if debug_enabled:
+                            logger.debug(f"默认做多盈亏计算: ({current_price} - {entry_price}) / {entry_price} * 100 = {profit_pct:.2f}%")
                     
                     order['profit_pct'] = profit_pct
-                    logger.info(f"订单 #{i} {symbol} 盈亏百分比: {profit_pct:.2f}%")
+                    if debug_enabled:
+                        logger.debug(f"订单 #{i} {symbol} 盈亏百分比: {profit_pct:.2f}%")
                     
                     # 检查是否达到止盈或止损条件
                     target_price = order.get('target_price')
@@ -1941,7 +2315,8 @@ def update_order_prices():
                             is_completed = False
                             result = "-"
                             
-                            logger.info(f"订单 #{i} {symbol} 止盈价: {target_price}, 止损价: {stop_loss}")
+                            if debug_enabled:
+                                logger.debug(f"订单 #{i} {symbol} 止盈价: {target_price}, 止损价: {stop_loss}")
                             
                             if is_long:
                                 if float(current_price) >= target_price:
@@ -1969,27 +2344,17 @@ def update_order_prices():
                                 order['exit_price'] = current_price
                                 order['result'] = result
                                 order['source'] = '实时监控'  # 标记为实时监控产生的已完成订单
-                                current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                                current_time = now_str()
                                 order['exit_time'] = current_time
                                 
                                 # 计算持仓时间（分钟）
                                 try:
-                                    import math
                                     # 使用时间列（timestamp）或触发时间来计算持仓时间
                                     entry_time_str = order.get('timestamp') or order.get('triggered_time') or order.get('publish_time')
                                     if entry_time_str:
-                                        entry_time = datetime.strptime(entry_time_str, '%Y-%m-%d %H:%M:%S')
-                                        exit_time = datetime.strptime(current_time, '%Y-%m-%d %H:%M:%S')
-                                        hold_time_seconds = (exit_time - entry_time).total_seconds()
-                                        hold_time_minutes = hold_time_seconds / 60  # 转换为分钟
-                                        
-                                        # 确保时间值是有效的
-                                        if math.isnan(hold_time_minutes) or math.isinf(hold_time_minutes):
-                                            order['hold_time_minutes'] = 0
-                                            order['hold_time'] = 0
-                                        else:
-                                            order['hold_time_minutes'] = round(hold_time_minutes, 2)
-                                            order['hold_time'] = round(hold_time_minutes / 60, 2)  # 保留小时字段兼容性
+                                        hold_time_minutes = elapsed_seconds(entry_time_str, current_time) / 60  # 转换为分钟
+                                        order['hold_time_minutes'] = round(hold_time_minutes, 2)
+                                        order['hold_time'] = round(hold_time_minutes / 60, 2)  # 保留小时字段兼容性
                                         logger.info(f"订单 #{i} {symbol} 持仓时间: {hold_time_minutes:.2f}分钟")
                                     else:
                                         order['hold_time_minutes'] = 0
@@ -2000,32 +2365,10 @@ def update_order_prices():
                                     order['hold_time_minutes'] = 0
                                     order['hold_time'] = 0
                                 
-                                # 计算总加权盈亏（基于入场价格和出场价格）
-                                try:
-                                    entry_price = float(order.get('entry_price', 0))
-                                    exit_price = float(current_price)
-                                    direction = order.get('direction', '做多')
-                                    
-                                    if entry_price > 0 and exit_price > 0:
-                                        if direction == '做多':
-                                            # 多单：(出场价格 - 入场价格) / 入场价格 * 100
-                                            profit_pct = ((exit_price - entry_price) / entry_price) * 100
-                                        else:  # 做空
-                                            # 空单：(入场价格 - 出场价格) / 入场价格 * 100
-                                            profit_pct = ((entry_price - exit_price) / entry_price) * 100
-                                        
-                                        order['profit_pct'] = round(profit_pct, 2)
-                                        order['weighted_profit_pct'] = round(profit_pct, 2)  # 总加权盈亏
-                                        
-                                        logger.info(f"订单 #{i} {symbol} {direction} 盈亏: {profit_pct:.2f}% (入场:{entry_price}, 出场:{exit_price})")
-                                    else:
-                                        order['profit_pct'] = 0
-                                        order['weighted_profit_pct'] = 0
-                                        logger.warning(f"订单 #{i} {symbol} 价格信息不完整，无法计算盈亏")
-                                except Exception as e:
-                                    logger.error(f"计算盈亏出错: {e}")
-                                    order['profit_pct'] = 0
-                                    order['weighted_profit_pct'] = 0
+                                # 总加权盈亏：出场价格即当前价格，直接沿用上面按方向算出的盈亏
+                                order['profit_pct'] = round(profit_pct, 2)
+                                order['weighted_profit_pct'] = order['profit_pct']  # 总加权盈亏
+                                logger.info(f"订单 #{i} {symbol} {direction} 盈亏: {profit_pct:.2f}% (入场:{entry_price}, 出场:{current_price})")
                                 
                                 orders_to_complete.append(i)
                                 logger.info(f"订单 #{i} {symbol} 已完成: {result}, 出场价格: {current_price}, 盈亏: {order.get('profit_pct', 0)}%")
@@ -2034,32 +2377,23 @@ def update_order_prices():
                 
                 except Exception as e:
                     # 记录错误
-                    logger.error(f"更新订单价格时出错: {type(e).__name__}: {e}")
-                    traceback.print_exc()
+                    log_error_with_traceback(f"更新订单价格时出错: {type(e).__name__}: {e}")
             else:
                 logger.warning(f"订单 #{i} {symbol} 入场价格无效: {entry_price}")
             
         except Exception as e:
             # 记录错误
-            logger.error(f"更新订单价格时出错: {type(e).__name__}: {e}")
-            traceback.print_exc()
+            log_error_with_traceback(f"更新订单价格时出错: {type(e).__name__}: {e}")
+    
+    # 每个币种只汇总记录一条更新日志
+    if priced_orders:
+        logger.info("价格更新完成: " + ", ".join(f"{symbol} {count}个订单" for symbol, count in priced_orders.items()))
     
     # 从活跃订单中移除已完成的订单，并添加到已完成订单列表中
     if orders_to_complete:
         orders_updated = True
-        # 从后往前删除，避免索引变化
-        for i in sorted(orders_to_complete, reverse=True):
-            if i < len(active_orders):  # 确保索引有效
-                completed_orders.append(active_orders[i])
-                logger.info(f"将订单 #{i} {active_orders[i].get('symbol')} 移至已完成列表")
-                del active_orders[i]
-        
-        # 有新完成的订单时，保存到Excel文件
-        try:
-            save_completed_orders_to_excel()
-        except Exception as e:
-            logger.error(f"保存已完成订单到Excel文件时出错: {e}")
-            traceback.print_exc()
+        for i, order in complete_orders(orders_to_complete):
+            logger.info(f"将订单 #{i} {order.get('symbol')} 移至已完成列表")
     
     # 更新活跃订单的入场状态
     try:
@@ -2075,17 +2409,18 @@ def update_order_prices():
     if orders_updated:
         try:
             # 强制推送（因为订单状态已经发生变化）
-            global last_data_hash, last_push_time
-            last_data_hash = ""  # 重置哈希值，确保下次推送
+            global last_data_key, last_push_time
+            last_data_key = None  # 重置数据键，确保下次推送
             last_push_time = time.time()
             
-            # 发送完整的订单数据更新
+            # 发送完整的订单数据更新（同一周期内的多次推送会被合并）
             # WebSocket推送时不进行筛选，避免频繁API调用
-            socketio.emit('orders_update', {
-                'active_orders': make_json_serializable(active_orders),
-                'completed_orders': make_json_serializable(completed_orders),
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            queue_emit('orders_update', {
+                'active_orders': serialize_orders_cached('active', active_orders)[0],
+                'completed_orders': serialize_orders_cached('completed', completed_orders)[0],
+                'timestamp': now_str()
             })
+            mark_orders_pushed('active', 'completed')
             logger.info("🔄 订单状态变化，强制推送更新")
         except Exception as e:
             logger.error(f"发送订单更新到前端时出错: {e}")
@@ -2096,8 +2431,154 @@ def update_order_prices():
     return orders_updated  # 改为返回布尔值，表示是否有订单被更新
 
 # 主动更新所有订单的状态
-def update_all_orders_status():
-    """更新所有订单的状态，检查是否有完成的订单"""
+# 订单状态日志：完成的订单先追加到这里，定期合并进 all_analysis_results.csv，
+# 避免每次有订单完成都读取并重写整个CSV文件
+ORDER_STATUS_LOG_PATH = os.path.join('data', 'analysis_results', 'order_status_updates.csv')
+# 合并时先把日志改名为待合并文件，之后完成的订单写入新的日志，合并过程不需要持有日志锁
+ORDER_STATUS_PENDING_PATH = os.path.join('data', 'analysis_results', 'order_status_updates.merging.csv')
+ORDER_STATUS_COMPACT_INTERVAL = 300  # 5分钟合并一次
+ORDER_STATUS_KEY_COLUMNS = ['symbol', 'entry_price']
+ORDER_STATUS_FIELDS = ['status', 'result', 'exit_price', 'exit_time', 'hold_time', 'profit_pct', 'current_price']
+_order_status_lock = threading.Lock()
+last_order_status_compact_time: float = 0
+
+def append_order_status_log(orders):
+    """把订单的完成状态追加到状态日志（symbol和entry_price作为唯一标识）"""
+    if not orders:
+        return
+    rows = [[order.get('symbol'), order.get('entry_price'), 'completed']
+            + [order.get(field) for field in ORDER_STATUS_FIELDS[1:]] for order in orders]
+    log_df = pd.DataFrame(rows, columns=ORDER_STATUS_KEY_COLUMNS + ORDER_STATUS_FIELDS)
+    with _order_status_lock:
+        write_header = not os.path.exists(ORDER_STATUS_LOG_PATH)
+        log_df.to_csv(ORDER_STATUS_LOG_PATH, mode='a', header=write_header, index=False, encoding='utf-8')
+    logger.debug(f"记录了 {len(rows)} 个订单的完成状态")
+
+def complete_orders(indices):
+    """把active_orders中indices位置的订单移入completed_orders，返回 [(原索引, 订单)]
+    
+    update_order_prices 和 update_all_orders_status 完成订单都经过这里：
+    完成状态追加到状态日志（稍后合并进CSV），并保存到Excel文件。
+    """
+    moved = move_orders(indices, active_orders, completed_orders)
+    if not moved:
+        return moved
+    
+    # 只追加本次完成的订单，CSV文件由 compact_order_status_log 定期整体更新
+    try:
+        append_order_status_log([order for _, order in moved])
+    except Exception as e:
+        log_error_with_traceback(f"记录订单状态日志时出错: {str(e)}")
+    
+    # 有新完成的订单时，保存到Excel文件
+    try:
+        save_completed_orders_to_excel()
+    except Exception as e:
+        log_error_with_traceback(f"保存已完成订单到Excel文件时出错: {e}")
+    return moved
+
+def _detach_order_status_log():
+    """把状态日志改名为待合并文件，返回是否有待合并的数据
+    
+    上一份待合并文件还在（正在后台合并，或上次合并失败）时不改名，新的状态继续留在日志中。
+    """
+    with _order_status_lock:
+        if not os.path.exists(ORDER_STATUS_PENDING_PATH) and os.path.exists(ORDER_STATUS_LOG_PATH):
+            os.replace(ORDER_STATUS_LOG_PATH, ORDER_STATUS_PENDING_PATH)
+        return os.path.exists(ORDER_STATUS_PENDING_PATH)
+
+def _merge_pending_order_status(messages):
+    """把待合并文件合并进 all_analysis_results.csv 并删除，返回更新的行数
+    
+    同一订单有多条记录时以最后一条为准；CSV中交易币种相同、入场点位1数值相同的行都会被更新。
+    可能在后台线程中执行，不直接写日志，消息追加到messages。
+    """
+    if not os.path.exists(ORDER_STATUS_PENDING_PATH):
+        return 0
+    
+    csv_path = os.path.join('data', 'analysis_results', 'all_analysis_results.csv')
+    if not os.path.exists(csv_path):
+        return 0
+    
+    updates = pd.read_csv(ORDER_STATUS_PENDING_PATH, encoding='utf-8')
+    updates['entry_price'] = pd.to_numeric(updates['entry_price'], errors='coerce')
+    updates = updates.dropna(subset=ORDER_STATUS_KEY_COLUMNS).drop_duplicates(
+        ORDER_STATUS_KEY_COLUMNS, keep='last')
+    
+    updated_rows = 0
+    if not updates.empty:
+        df = pd.read_csv(csv_path)
+        if 'analysis.交易币种' in df.columns and 'analysis.入场点位1' in df.columns:
+            update_index = pd.MultiIndex.from_frame(updates[ORDER_STATUS_KEY_COLUMNS])
+            positions = update_index.get_indexer(
+                pd.MultiIndex.from_arrays([df['analysis.交易币种'],
+                                           pd.to_numeric(df['analysis.入场点位1'], errors='coerce')]))
+            matched = positions >= 0
+            updated_rows = int(matched.sum())
+            
+            if updated_rows:
+                for field in ORDER_STATUS_FIELDS:
+                    # 以object列写入，避免全空的float列无法写入字符串
+                    if field in df.columns:
+                        values = df[field].to_numpy(dtype=object, copy=True)
+                    else:
+                        values = np.full(len(df), np.nan, dtype=object)
+                    values[matched] = updates[field].to_numpy(dtype=object)[positions[matched]]
+                    df[field] = values
+                
+                # 整体替换，监控循环同时读取CSV时不会读到写了一半的文件
+                replace_file(csv_path, lambda path: df.to_csv(path, index=False, encoding='utf-8-sig'))
+                messages.append((logging.INFO, f"已将 {len(updates)} 个订单的完成状态合并到CSV文件，更新 {updated_rows} 行"))
+    
+    os.remove(ORDER_STATUS_PENDING_PATH)
+    return updated_rows
+
+def _merge_pending_order_status_job():
+    """submit_io 用的后台任务：合并待合并文件，返回 [(日志级别, 消息)]"""
+    messages = []
+    try:
+        _merge_pending_order_status(messages)
+    except Exception as e:
+        messages.append((logging.ERROR, f"合并订单状态日志时出错: {e}"))
+    return messages
+
+def compact_order_status_log():
+    """同步把状态日志合并进 all_analysis_results.csv（启动和退出时使用），返回更新的行数"""
+    global last_order_status_compact_time
+    last_order_status_compact_time = time.time()
+    
+    updated_rows = 0
+    messages = []
+    try:
+        # 先合并上次遗留的待合并文件，再合并当前日志
+        for _ in range(2):
+            if not _detach_order_status_log():
+                break
+            updated_rows += _merge_pending_order_status(messages)
+    finally:
+        log_io_messages(messages)
+    return updated_rows
+
+def schedule_order_status_compaction():
+    """监控循环中定期调用：合并放到后台执行，不阻塞监控循环（eventlet模式下也不阻塞事件循环）"""
+    global last_order_status_compact_time
+    last_order_status_compact_time = time.time()
+    if _detach_order_status_log():
+        submit_io(_merge_pending_order_status_job)
+
+@atexit.register
+def _compact_order_status_log_at_exit():
+    """退出前把尚未合并的订单状态写入CSV文件"""
+    try:
+        compact_order_status_log()
+    except Exception as e:
+        logger.error(f"合并订单状态日志时出错: {e}")
+
+def update_all_orders_status(symbols=None):
+    """更新所有订单的状态，检查是否有完成的订单
+    
+    symbols不为None时只检查这些交易对的订单（价格变化时的增量检查）。
+    """
     global active_orders, completed_orders
     
     try:
@@ -2105,7 +2586,15 @@ def update_all_orders_status():
         orders_updated = False
         orders_to_move = []
         
-        # 遍历所有活跃订单
+        # 一次取齐所有有效交易对的价格，与 update_order_prices 共用本轮快照
+        prices = get_tick_prices(
+            order.get('normalized_symbol') for order in active_orders
+            if order.get('normalized_symbol') and order.get('normalized_symbol') not in INVALID_PRICE_SYMBOLS
+            and (symbols is None or order.get('normalized_symbol') in symbols)
+        )
+        
+        # 遍历所有活跃订单，先收集能取到价格的订单
+        priced_orders = []
         for i, order in enumerate(active_orders):
             try:
                 # 跳过已标记为完成的订单
@@ -2114,18 +2603,15 @@ def update_all_orders_status():
                     continue
                     
                 symbol = order.get('normalized_symbol')
+                if symbols is not None and symbol not in symbols:
+                    continue
                 
                 # 验证交易对有效性
-                
-                invalid_symbols = [
-                    'ALCHUSDT', 'USDT', 'USDTUSDT', 
-                    'RFCUSDT', 'ZBCNUSDT', 'NANUSDT', 'TAIUSDT'
-                ]
-                if not symbol or symbol in invalid_symbols:
+                if not symbol or symbol in INVALID_PRICE_SYMBOLS:
                     logger.debug(f"跳过无效交易对: {symbol}")
                     continue
                 
-                current_price = monitor.get_current_price(symbol)
+                current_price = prices.get(symbol)
                 
                 if current_price is None:
                     logger.debug(f"无法获取 {symbol} 的价格，跳过该订单")
@@ -2133,91 +2619,61 @@ def update_all_orders_status():
                     
                 # 更新当前价格
                 order['current_price'] = current_price
-                
-                # 检查是否达到止盈或止损条件
-                direction = order.get('direction')
-                entry_price = order.get('entry_price')
-                target_price = order.get('target_price')
-                stop_loss = order.get('stop_loss')
-                
-                # 计算盈亏百分比
-                profit_pct = 0
-                if entry_price and entry_price != 0:  # 防止除零错误
-                    try:
-                        entry_price_float = float(entry_price)
-                        current_price_float = float(current_price)
-                        
-                        if entry_price_float != 0:  # 再次确认不为零
-                            # 修正后的方向判断，支持"多"、"做多"、"空"、"做空"
-                            is_long = direction in ['多', '做多']
-                            is_short = direction in ['空', '做空']
-                            
-                            if is_long:
-                                profit_pct = ((current_price_float - entry_price_float) / entry_price_float) * 100
-                                logger.debug(f"做多盈亏计算: ({current_price_float} - {entry_price_float}) / {entry_price_float} * 100 = {profit_pct:.2f}%")
-                            elif is_short:
-                                profit_pct = ((entry_price_float - current_price_float) / entry_price_float) * 100
-                                logger.debug(f"做空盈亏计算: ({entry_price_float} - {current_price_float}) / {entry_price_float} * 100 = {profit_pct:.2f}%")
-                            else:
-                                logger.warning(f"订单 {order.get('symbol')} 方向无效: {direction}，默认作为做多处理")
-                                profit_pct = ((current_price_float - entry_price_float) / entry_price_float) * 100
-                        else:
-                            logger.warning(f"订单 {order.get('symbol')} 入场价格为零，无法计算盈亏")
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"订单 {order.get('symbol')} 价格转换失败: entry_price={entry_price}, current_price={current_price}, error={e}")
-                        profit_pct = 0
-                else:
-                    logger.warning(f"订单 {order.get('symbol')} 入场价格无效: {entry_price}")
-                
-                order['profit_pct'] = profit_pct
-                
-                # 检查是否完成
-                is_completed = False
-                result = "-"
-                
-                # 确保target_price和stop_loss不为None才进行比较
-                if target_price is not None and stop_loss is not None:
-                    # 尝试转换为float
-                    try:
-                        target_price_float = float(target_price)
-                        stop_loss_float = float(stop_loss)
-                        
-                        # 修正后的方向判断，支持"多"、"做多"、"空"、"做空"
-                        is_long = direction in ['多', '做多']
-                        is_short = direction in ['空', '做空']
-                        
-                        if is_long:
-                            if current_price_float >= target_price_float:
-                                is_completed = True
-                                result = "止盈"
-                            elif current_price_float <= stop_loss_float:
-                                is_completed = True
-                                result = "止损"
-                        elif is_short:
-                            if current_price_float <= target_price_float:
-                                is_completed = True
-                                result = "止盈"
-                            elif current_price_float >= stop_loss_float:
-                                is_completed = True
-                                result = "止损"
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"无法转换价格值: target_price={target_price}, stop_loss={stop_loss}, error={e}")
-                        pass
-                
-                if is_completed:
+                priced_orders.append((i, order))
+            
+            except Exception as e:
+                log_error_with_traceback(f"更新订单状态时出错: {str(e)}")
+                continue
+        
+        if priced_orders:
+            orders = [order for _, order in priced_orders]
+            entry = float_array(order.get('entry_price') for order in orders)
+            current = float_array(order['current_price'] for order in orders)
+            target = float_array(order.get('target_price') for order in orders)
+            stop = float_array(order.get('stop_loss') for order in orders)
+            # 支持"多"、"做多"、"空"、"做空"，其他方向为0
+            sign = direction_signs([order.get('direction') for order in orders],
+                                   LONG_DIRECTIONS, SHORT_DIRECTIONS)
+            
+            # 计算盈亏百分比：方向无效时按做多处理，入场价格无效或为零时为0
+            entry_valid = (entry != 0) & ~np.isnan(entry)
+            profit_sign = np.where(entry_valid, np.where(sign == 0, 1, sign), 0).astype(np.int8)
+            profit = _profit_pct_kernel(profit_sign, entry, current)
+            
+            # 检查是否达到止盈或止损条件
+            take_profit, stop_loss_hit = _exit_hits_kernel(sign, current, target, stop)
+            
+            for (i, order), profit_pct, entry_ok, direction_code, tp_hit, sl_hit in zip(
+                    priced_orders, profit.tolist(), entry_valid.tolist(), sign.tolist(),
+                    take_profit.tolist(), stop_loss_hit.tolist()):
+                try:
+                    direction = order.get('direction')
+                    entry_price = order.get('entry_price')
+                    if not entry_ok:
+                        logger.warning(f"订单 {order.get('symbol')} 入场价格无效: {entry_price}")
+                    elif direction_code == 0:
+                        logger.warning(f"订单 {order.get('symbol')} 方向无效: {direction}，默认作为做多处理")
+                    
+                    order['profit_pct'] = profit_pct
+                    
+                    if not (tp_hit or sl_hit):
+                        continue
+                    
+                    result = "止盈" if tp_hit else "止损"
+                    current_price = order['current_price']
+                    
                     # 更新订单状态
                     order['is_completed'] = True
                     order['exit_price'] = current_price
-                    order['exit_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    order['exit_time'] = now_str()
                     order['result'] = result
                     order['status'] = 'completed'
                     
                     # 计算持仓时间
                     if order.get('publish_time'):
                         try:
-                            entry_time = datetime.strptime(order.get('triggered_time') or order.get('publish_time'), '%Y-%m-%d %H:%M:%S')
-                            exit_time = datetime.strptime(order['exit_time'], '%Y-%m-%d %H:%M:%S')
-                            hold_time = (exit_time - entry_time).total_seconds() / 3600  # 转换为小时
+                            entry_time = order.get('triggered_time') or order.get('publish_time')
+                            hold_time = elapsed_seconds(entry_time, order['exit_time']) / 3600  # 转换为小时
                             order['hold_time'] = round(hold_time, 2)
                         except:
                             order['hold_time'] = None
@@ -2230,95 +2686,139 @@ def update_all_orders_status():
                     logger.info(f"订单完成: {order.get('symbol')} {direction} {result} "
                               f"入场:{entry_price} 出场:{current_price} "
                               f"收益:{profit_pct:.2f}%")
-            
-            except Exception as e:
-                logger.error(f"更新订单状态时出错: {str(e)}")
-                traceback.print_exc()
-                continue
+                
+                except Exception as e:
+                    log_error_with_traceback(f"更新订单状态时出错: {str(e)}")
+                    continue
         
         # 从活跃订单列表中移除，并添加到已完成订单列表
         if orders_to_move:
-            # 从后往前删除，避免索引变化问题
-            for i in sorted(orders_to_move, reverse=True):
-                if i < len(active_orders):  # 确保索引有效
-                    completed_orders.append(active_orders[i])
-                    del active_orders[i]
+            complete_orders(orders_to_move)
             logger.debug(f"移动了 {len(orders_to_move)} 个已完成订单到已完成列表")
-            
-            # 有新完成的订单时，保存到Excel文件
-            try:
-                save_completed_orders_to_excel()
-            except Exception as e:
-                logger.error(f"保存已完成订单到Excel文件时出错: {e}")
-                traceback.print_exc()
         
         logger.debug(f"状态更新后 - 活跃订单: {len(active_orders)}, 已完成订单: {len(completed_orders)}")
         
-        # 如果有订单状态更新，同步到CSV文件并发送WebSocket更新
+        # 如果有订单状态更新，发送WebSocket更新
         if orders_updated:
-            try:
-                # 读取当前CSV文件
-                csv_path = os.path.join('data', 'analysis_results', 'all_analysis_results.csv')
-                if os.path.exists(csv_path):
-                    df = pd.read_csv(csv_path)
-                    
-                    # 更新订单状态
-                    for order in completed_orders:
-                        # 使用symbol和entry_price作为唯一标识
-                        mask = (
-                            (df['analysis.交易币种'] == order.get('symbol')) & 
-                            (df['analysis.入场点位1'] == order.get('entry_price'))
-                        )
-                        
-                        if mask.any():
-                            # 更新状态相关字段
-                            df.loc[mask, 'status'] = 'completed'
-                            df.loc[mask, 'result'] = order.get('result')
-                            df.loc[mask, 'exit_price'] = order.get('exit_price')
-                            df.loc[mask, 'exit_time'] = order.get('exit_time')
-                            df.loc[mask, 'hold_time'] = order.get('hold_time')
-                            df.loc[mask, 'profit_pct'] = order.get('profit_pct')
-                            df.loc[mask, 'current_price'] = order.get('current_price')
-                            
-                            # 记录CSV更新日志
-                            logger.info(f"更新CSV文件中的订单状态: {order.get('symbol')} {order.get('direction')} "
-                                      f"结果:{order.get('result')} 收益:{order.get('profit_pct', 0):.2f}%")
-                    
-                    # 保存更新后的CSV文件
-                    df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-                    logger.info("已更新CSV文件中的订单状态")
-            
-            except Exception as e:
-                logger.error(f"更新CSV文件时出错: {str(e)}")
-                traceback.print_exc()
-                
             # 发送完整的订单数据更新
             try:
                 # 强制推送（因为订单状态已经发生变化）
-                global last_data_hash, last_push_time
-                last_data_hash = ""  # 重置哈希值，确保下次推送
+                global last_data_key, last_push_time
+                last_data_key = None  # 重置数据键，确保下次推送
                 last_push_time = time.time()
                 
-                # WebSocket推送时不进行筛选，避免频繁API调用
-                socketio.emit('orders_update', {
-                    'active_orders': make_json_serializable(active_orders),
-                    'completed_orders': make_json_serializable(completed_orders),
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                # WebSocket推送时不进行筛选，避免频繁API调用（同一周期内的多次推送会被合并）
+                queue_emit('orders_update', {
+                    'active_orders': serialize_orders_cached('active', active_orders)[0],
+                    'completed_orders': serialize_orders_cached('completed', completed_orders)[0],
+                    'timestamp': now_str()
                 })
+                mark_orders_pushed('active', 'completed')
                 logger.info("🔄 订单状态变化，强制推送更新")
             except Exception as e:
-                logger.error(f"发送订单更新到前端时出错: {e}")
-                traceback.print_exc()
+                log_error_with_traceback(f"发送订单更新到前端时出错: {e}")
         
         return orders_updated
         
     except Exception as e:
-        logger.error(f"更新订单状态时出错: {str(e)}")
-        traceback.print_exc()
+        log_error_with_traceback(f"更新订单状态时出错: {str(e)}")
         return False
 
-def save_completed_orders_to_excel():
-    """将程序运行期间新完成的订单保存到单独的文件"""
+# 后台文件写入：Excel/parquet的读取、合并和写入不在监控循环中同步执行。
+# 只有一个worker，同一文件的写入按提交顺序依次执行；threading模式下用单线程的线程池：
+# 任务主要是openpyxl/parquet的文件I/O，而进程池在已有多个线程（日志、监控、推送、Flask）时fork，
+# 子进程可能继承被占用的锁而卡死，spawn方式又会重新执行本模块的全部初始化。
+# eventlet模式下标准线程池的线程和锁会被monkey_patch成协程版本，阻塞的文件写入仍会卡住事件循环，改用eventlet的原生线程池（tpool）。
+_io_executor = None
+_io_semaphore = None
+
+def log_io_messages(messages):
+    """记录后台任务返回的 [(日志级别, 消息)]"""
+    for level, message in messages:
+        logger.log(level, message)
+
+def _log_io_future(future):
+    try:
+        log_io_messages(future.result())
+    except Exception as e:
+        logger.error(f"后台文件写入任务出错: {e}")
+
+def _run_io_green(fn, args):
+    from eventlet import tpool
+    with _io_semaphore:
+        try:
+            log_io_messages(tpool.execute(fn, *args))
+        except Exception as e:
+            logger.error(f"后台文件写入任务出错: {e}")
+
+def submit_io(fn, *args):
+    """在后台执行文件写入任务fn(*args)，fn不写日志，返回 [(日志级别, 消息)] 由调用方记录"""
+    global _io_executor, _io_semaphore
+    if SOCKETIO_ASYNC_MODE == 'eventlet':
+        if _io_semaphore is None:
+            from eventlet.semaphore import Semaphore
+            _io_semaphore = Semaphore(1)
+        eventlet.spawn_n(_run_io_green, fn, args)
+        return
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-io')
+    _io_executor.submit(fn, *args).add_done_callback(_log_io_future)
+
+# 新完成订单表：安装了pyarrow时以parquet存储（写入快），Excel只在导出时生成；否则直接存储为Excel
+NEW_COMPLETED_ORDERS_XLSX = os.path.join('data', 'analysis_results', 'new_completed_orders.xlsx')
+NEW_COMPLETED_ORDERS_PARQUET = os.path.join('data', 'analysis_results', 'new_completed_orders.parquet')
+
+def replace_file(path, write):
+    """先用write(临时路径)写出完整文件，再原子替换path，读取方不会读到写了一半的文件"""
+    # 临时文件保留原扩展名，pandas按扩展名选择Excel引擎
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.tmp{ext}"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_new_completed_orders():
+    """读取新完成订单表：优先读取parquet存储，没有时读取Excel；都不存在时返回None"""
+    if PARQUET_AVAILABLE and os.path.exists(NEW_COMPLETED_ORDERS_PARQUET):
+        return pd.read_parquet(NEW_COMPLETED_ORDERS_PARQUET)
+    if os.path.exists(NEW_COMPLETED_ORDERS_XLSX):
+        return read_excel_fast(NEW_COMPLETED_ORDERS_XLSX)
+    return None
+
+def export_new_completed_orders_excel():
+    """把parquet存储的新完成订单导出为Excel（Excel已是最新时跳过），返回Excel路径，没有数据时返回None"""
+    if PARQUET_AVAILABLE and os.path.exists(NEW_COMPLETED_ORDERS_PARQUET):
+        if (not os.path.exists(NEW_COMPLETED_ORDERS_XLSX)
+                or os.path.getmtime(NEW_COMPLETED_ORDERS_XLSX) < os.path.getmtime(NEW_COMPLETED_ORDERS_PARQUET)):
+            df = pd.read_parquet(NEW_COMPLETED_ORDERS_PARQUET)
+            replace_file(NEW_COMPLETED_ORDERS_XLSX, lambda path: df.to_excel(path, index=False, engine='openpyxl'))
+            logger.info(f"已导出新完成订单到Excel文件: {NEW_COMPLETED_ORDERS_XLSX}")
+    return NEW_COMPLETED_ORDERS_XLSX if os.path.exists(NEW_COMPLETED_ORDERS_XLSX) else None
+
+def _write_new_completed_orders(df, messages):
+    """保存新完成订单表：优先写parquet，写入失败（如列中混有不同类型）时改为写Excel并删除旧的parquet"""
+    if PARQUET_AVAILABLE:
+        try:
+            # 空字符串按缺失值保存，与Excel空单元格读回的结果一致
+            parquet_df = df.replace('', None)
+            replace_file(NEW_COMPLETED_ORDERS_PARQUET,
+                         lambda path: parquet_df.to_parquet(path, index=False, compression='zstd'))
+            return NEW_COMPLETED_ORDERS_PARQUET
+        except Exception as e:
+            messages.append((logging.WARNING, f"写入parquet失败，改为保存Excel文件: {e}"))
+            if os.path.exists(NEW_COMPLETED_ORDERS_PARQUET):
+                os.remove(NEW_COMPLETED_ORDERS_PARQUET)
+    replace_file(NEW_COMPLETED_ORDERS_XLSX, lambda path: df.to_excel(path, index=False, engine='openpyxl'))
+    return NEW_COMPLETED_ORDERS_XLSX
+
+def save_completed_orders_to_excel(background=True):
+    """将程序运行期间新完成的订单保存到单独的文件
+    
+    读取、合并和写文件默认交给 submit_io 在后台执行，不阻塞监控循环；background=False 时同步执行。
+    """
     global completed_orders
     
     try:
@@ -2330,11 +2830,7 @@ def save_completed_orders_to_excel():
             return
             
         # 确保目录存在
-        results_dir = os.path.join('data', 'analysis_results')
-        os.makedirs(results_dir, exist_ok=True)
-        
-        # 构建新的Excel文件路径（与历史数据分开）
-        excel_file_path = os.path.join(results_dir, 'new_completed_orders.xlsx')
+        os.makedirs(os.path.dirname(NEW_COMPLETED_ORDERS_XLSX), exist_ok=True)
         
         # 准备要保存的数据
         excel_data = []
@@ -2358,24 +2854,44 @@ def save_completed_orders_to_excel():
                 'original_content': order.get('original_content', '')
             })
         
+        if background:
+            submit_io(merge_new_completed_orders, excel_data)
+        else:
+            log_io_messages(merge_new_completed_orders(excel_data))
+        
+    except Exception as e:
+        logger.error(f"保存已完成订单到Excel文件时出错: {str(e)}")
+        traceback.print_exc()
+
+def merge_new_completed_orders(excel_data):
+    """把新完成订单与现有数据合并去重后保存，返回 [(日志级别, 消息)]
+    
+    在后台线程中执行，不直接写日志，由调用方用 log_io_messages 记录返回的消息。
+    """
+    messages = []
+    try:
         # 转换为DataFrame
         df = pd.DataFrame(excel_data)
         
-        # 检查文件是否存在
-        if os.path.exists(excel_file_path):
-            # 如果文件存在，读取现有数据
+        # 读取现有数据（parquet存储或Excel文件）
+        existing_df = None
+        try:
+            existing_df = read_new_completed_orders()
+        except Exception as e:
+            messages.append((logging.WARNING, f"读取现有新完成订单数据失败，将创建新文件: {e}"))
+        
+        if existing_df is not None:
             try:
-                existing_df = pd.read_excel(excel_file_path)
-                logger.info(f"成功读取现有Excel文件，包含 {len(existing_df)} 条记录")
-                logger.info(f"现有文件的列名: {list(existing_df.columns)}")
+                messages.append((logging.INFO, f"成功读取现有新完成订单数据，包含 {len(existing_df)} 条记录"))
+                messages.append((logging.INFO, f"现有文件的列名: {list(existing_df.columns)}"))
                 
                 # 检查必要的列是否存在
                 required_columns = ['订单ID', '交易币种', '入场点位1']
                 missing_columns = [col for col in required_columns if col not in existing_df.columns]
                 
                 if missing_columns:
-                    logger.warning(f"现有Excel文件缺少必要的列: {missing_columns}")
-                    logger.warning("将创建新的Excel文件以保持格式一致")
+                    messages.append((logging.WARNING, f"现有Excel文件缺少必要的列: {missing_columns}"))
+                    messages.append((logging.WARNING, "将创建新的Excel文件以保持格式一致"))
                     final_df = df
                 else:
                     # 合并数据，避免重复
@@ -2389,35 +2905,133 @@ def save_completed_orders_to_excel():
                     )
                     
                     final_df = merged_df
-                    logger.info(f"合并现有Excel数据，总共{len(final_df)}条记录")
+                    messages.append((logging.INFO, f"合并现有Excel数据，总共{len(final_df)}条记录"))
                 
             except Exception as e:
-                logger.warning(f"读取现有Excel文件失败，将创建新文件: {e}")
+                messages.append((logging.WARNING, f"读取现有Excel文件失败，将创建新文件: {e}"))
                 # 如果是因为列名不匹配导致的错误，记录详细信息
                 if "Index" in str(e) and "dtype='object'" in str(e):
-                    logger.warning("列名不匹配，可能是Excel文件格式与当前代码不兼容")
-                    logger.warning(f"期望的列名: ['订单ID', '交易币种', '入场点位1']")
-                    if 'existing_df' in locals():
-                        logger.warning(f"实际文件中的列名: {list(existing_df.columns)}")
+                    messages.append((logging.WARNING, "列名不匹配，可能是Excel文件格式与当前代码不兼容"))
+                    messages.append((logging.WARNING, f"期望的列名: ['订单ID', '交易币种', '入场点位1']"))
+                    messages.append((logging.WARNING, f"实际文件中的列名: {list(existing_df.columns)}"))
                 final_df = df
         else:
             final_df = df
-            logger.info(f"创建新的Excel文件: {excel_file_path}")
+            messages.append((logging.INFO, "创建新的新完成订单文件"))
         
-        # 保存到Excel文件
-        final_df.to_excel(excel_file_path, index=False, engine='openpyxl')
+        # 保存（安装了pyarrow时为parquet，Excel在导出时生成）
+        saved_path = _write_new_completed_orders(final_df, messages)
         
-        logger.info(f"成功保存{len(df)}个已完成订单到Excel文件: {excel_file_path}")
+        messages.append((logging.INFO, f"成功保存{len(df)}个已完成订单到: {saved_path}"))
         
     except Exception as e:
-        logger.error(f"保存已完成订单到Excel文件时出错: {str(e)}")
-        traceback.print_exc()
+        messages.append((logging.ERROR, f"保存已完成订单到Excel文件时出错: {str(e)}\n{traceback.format_exc()}"))
+    return messages
+
+# 完整监控循环（价格记录、CSV检查、推送）的间隔，配合智能推送控制减少频率
+MONITOR_LOOP_INTERVAL = 20
+# 两轮完整循环之间检查主要币种价格变化的间隔，与价格监控器的轮询间隔一致
+PRICE_CHANGE_CHECK_INTERVAL = 3
+
+def wait_for_price_changes(duration):
+    """等待duration秒，期间每 PRICE_CHANGE_CHECK_INTERVAL 秒检查一次主要币种价格
+    
+    只对价格发生变化、且有活跃订单的交易对调用 update_all_orders_status，
+    止盈止损的检测延迟从一个完整循环缩短到一个价格轮询间隔，其他订单不重复处理。
+    """
+    deadline = time.time() + duration
+    last_prices = {symbol: tick_prices.get(symbol) for symbol in REALTIME_SYMBOLS}
+    while monitoring_active and time.time() + PRICE_CHANGE_CHECK_INTERVAL < deadline:
+        time.sleep(PRICE_CHANGE_CHECK_INTERVAL)
+        try:
+            begin_price_tick()
+            prices = get_tick_prices(REALTIME_SYMBOLS)
+            changed = {symbol for symbol in REALTIME_SYMBOLS
+                       if prices.get(symbol) is not None and prices[symbol] != last_prices.get(symbol)}
+            last_prices.update((symbol, prices[symbol]) for symbol in changed)
+            if changed and any(order.get('normalized_symbol') in changed for order in active_orders):
+                update_all_orders_status(symbols=changed)
+        except Exception as e:
+            log_error_with_traceback(f"检查价格变化时出错: {str(e)}")
+    time.sleep(max(0, deadline - time.time()))
+
+# 价格历史CSV的列
+PRICE_HISTORY_COLUMNS = ['timestamp', 'symbol', 'bid', 'ask', 'mid', 'change_24h', 'volume', 'high_price', 'low_price']
+# 当天的价格历史写入 price_history.csv，跨天时归档为 price_history_YYYYMMDD.csv
+PRICE_HISTORY_FILE = os.path.join('data', 'price_history.csv')
+PRICE_HISTORY_ARCHIVE_RE = re.compile(r'price_history_\d{8}(_\d+)?\.csv$')
+
+def price_history_day():
+    """price_history.csv 中数据所属的日期（YYYY-MM-DD，按文件最后修改时间），文件不存在或为空时为今天"""
+    if os.path.exists(PRICE_HISTORY_FILE) and os.path.getsize(PRICE_HISTORY_FILE) > 0:
+        return datetime.fromtimestamp(os.path.getmtime(PRICE_HISTORY_FILE)).strftime('%Y-%m-%d')
+    return now_str()[:10]
+
+def archive_price_history(day):
+    """把 price_history.csv 归档为 price_history_{day}.csv（同名归档已存在时加序号）"""
+    if not os.path.exists(PRICE_HISTORY_FILE) or os.path.getsize(PRICE_HISTORY_FILE) == 0:
+        return
+    base = os.path.join('data', f"price_history_{day.replace('-', '')}")
+    target = base + '.csv'
+    n = 1
+    while os.path.exists(target):
+        target = f"{base}_{n}.csv"
+        n += 1
+    os.replace(PRICE_HISTORY_FILE, target)
+    logger.info(f"价格历史已归档: {target}")
+
+def price_history_paths():
+    """全部价格历史文件：按日期排序的归档文件，加上当天的 price_history.csv"""
+    paths = sorted(path for path in glob.glob(os.path.join('data', 'price_history_*.csv'))
+                   if PRICE_HISTORY_ARCHIVE_RE.match(os.path.basename(path)))
+    if os.path.exists(PRICE_HISTORY_FILE):
+        paths.append(PRICE_HISTORY_FILE)
+    return paths
+
+def price_history_segments():
+    """[(路径, 上一个文件的日期, 本文件的日期)]，从旧到新，日期为YYYY-MM-DD
+    
+    每个文件的数据不早于上一个文件的日期、不晚于本文件的日期，按时间范围查询时据此跳过文件。
+    最早的文件（可能是归档前的完整历史）没有下界，当天的 price_history.csv 没有上界，都为None。
+    """
+    segments = []
+    previous_day = None
+    for path in price_history_paths():
+        day = None
+        if path != PRICE_HISTORY_FILE:
+            digits = os.path.basename(path)[len('price_history_'):len('price_history_') + 8]
+            day = f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+        segments.append((path, previous_day, day))
+        previous_day = day
+    return segments
+
+def read_price_history(since_day=None):
+    """读取价格历史，没有文件时返回None
+    
+    since_day（YYYY-MM-DD）不为None时跳过全部数据都早于这一天的归档文件。
+    归档文件不再变化，由 read_table_cached 缓存解析结果；当天的文件只追加，只解析新增的行。
+    """
+    frames = [read_table_cached(path) for path, _, day in price_history_segments()
+              if since_day is None or day is None or day >= since_day]
+    if not frames:
+        return None
+    # concat 返回新的DataFrame，调用方可以修改，不影响缓存
+    return pd.concat(frames, ignore_index=True)
+
+def open_price_history_writer(path):
+    """以追加模式打开价格历史CSV，返回 (文件句柄, DictWriter)；新文件或空文件先写入表头"""
+    price_fh = open(path, 'a', buffering=65536, newline='', encoding='utf-8')
+    writer = csv.DictWriter(price_fh, fieldnames=PRICE_HISTORY_COLUMNS, lineterminator='\n')
+    if price_fh.tell() == 0:
+        writer.writeheader()
+    return price_fh, writer
 
 # 接收和发送价格数据的函数
 def background_monitoring():
     """在后台运行价格和订单监控"""
     global monitor, active_orders, completed_orders, last_csv_check_time, csv_check_interval, monitoring_active
     
+    price_fh = None
     try:
         logger.info("后台监控线程启动")
         
@@ -2460,8 +3074,11 @@ def background_monitoring():
         logger.info("价格监控器初始化完成，开始监控BTC和ETH")
         
         # 初始化价格数据历史记录保存
-        price_history_file = os.path.join('data', 'price_history.csv')
+        price_history_file = PRICE_HISTORY_FILE
         os.makedirs('data', exist_ok=True)
+        # 文件只打开一次，每轮直接追加几行，不再为每批数据构造DataFrame；跨天时归档后重新打开
+        current_history_day = price_history_day()
+        price_fh, price_writer = open_price_history_writer(price_history_file)
         
         # 定义要监控的交易对 - 只监控主要币种
         symbols_to_monitor = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
@@ -2479,9 +3096,13 @@ def background_monitoring():
                 # 添加调试信息
                 logger.debug(f"当前活跃订单数量: {len(active_orders)}, 已完成订单数量: {len(completed_orders)}")
                 
+                # 新一轮价格快照
+                begin_price_tick()
+                
                 # 收集实时价格数据并保存到本地
                 try:
-                    current_time = datetime.now()
+                    # 本轮所有价格记录和推送共用同一个时间字符串
+                    tick_time = now_str()
                     price_data_batch = []
                     
                     for symbol in symbols_to_monitor:
@@ -2490,7 +3111,7 @@ def background_monitoring():
                             if price_info:
                                 # 构造价格记录
                                 price_record = {
-                                    'timestamp': current_time.strftime('%Y-%m-%d %H:%M:%S'),
+                                    'timestamp': tick_time,
                                     'symbol': symbol,
                                     'bid': price_info['bid'],
                                     'ask': price_info['ask'],
@@ -2502,29 +3123,27 @@ def background_monitoring():
                                 }
                                 price_data_batch.append(price_record)
                                 
-                                # 发送实时价格更新到前端
-                                try:
-                                    socketio.emit('price_update', {
-                                        'symbol': symbol,
-                                        'price': price_info['mid'],
-                                        'change_24h': price_info.get('change_24h', 0),
-                                        'timestamp': current_time.strftime('%Y-%m-%d %H:%M:%S')
-                                    })
-                                except Exception as e:
-                                    logger.debug(f"发送价格更新到前端时出错: {e}")
-                                    pass
+                                # 发送实时价格更新到前端（由推送任务合并发送）
+                                queue_emit('price_update', {
+                                    'symbol': symbol,
+                                    'price': price_info['mid'],
+                                    'change_24h': price_info.get('change_24h', 0),
+                                    'timestamp': tick_time
+                                }, key=symbol)
                         except Exception as e:
                             logger.warning(f"获取{symbol}价格数据失败: {e}")
                     
                     # 批量保存价格数据到CSV文件
                     if price_data_batch:
                         try:
-                            price_df = pd.DataFrame(price_data_batch)
-                            # 如果文件存在，则追加数据；否则创建新文件
-                            if os.path.exists(price_history_file):
-                                price_df.to_csv(price_history_file, mode='a', header=False, index=False)
-                            else:
-                                price_df.to_csv(price_history_file, index=False)
+                            if tick_time[:10] != current_history_day:
+                                price_fh.close()
+                                archive_price_history(current_history_day)
+                                price_fh, price_writer = open_price_history_writer(price_history_file)
+                                current_history_day = tick_time[:10]
+                            price_writer.writerows(price_data_batch)
+                            # 每批都flush，读取价格历史的地方能立即看到完整的行
+                            price_fh.flush()
                             
                             price_update_counter += len(price_data_batch)
                             if price_update_counter % 50 == 0:  # 每50条记录记录一次日志
@@ -2533,15 +3152,13 @@ def background_monitoring():
                             logger.error(f"保存价格数据到CSV文件失败: {e}")
                             
                 except Exception as e:
-                    logger.error(f"收集实时价格数据时出错: {e}")
-                    traceback.print_exc()
+                    log_error_with_traceback(f"收集实时价格数据时出错: {e}")
                     
                 # 更新所有订单的价格
                 try:
                     update_order_prices()
                 except Exception as e:
-                    logger.error(f"更新订单价格时出错: {str(e)}")
-                    traceback.print_exc()
+                    log_error_with_traceback(f"更新订单价格时出错: {str(e)}")
                 
                 # 更新山寨币订单的价格
                 try:
@@ -2552,18 +3169,23 @@ def background_monitoring():
                     else:
                         logger.debug("没有活跃的山寨币订单需要更新价格")
                 except Exception as e:
-                    logger.error(f"更新山寨币价格时出错: {str(e)}")
-                    traceback.print_exc()
+                    log_error_with_traceback(f"更新山寨币价格时出错: {str(e)}")
                 
                 # 更新所有订单的状态
                 try:
                     update_all_orders_status()
                 except Exception as e:
-                    logger.error(f"更新订单状态时出错: {str(e)}")
-                    traceback.print_exc()
+                    log_error_with_traceback(f"更新订单状态时出错: {str(e)}")
                 
-                # 检查CSV文件更新
+                # 定期把订单状态日志合并进CSV文件
                 current_time = time.time()
+                if current_time - last_order_status_compact_time >= ORDER_STATUS_COMPACT_INTERVAL:
+                    try:
+                        schedule_order_status_compaction()
+                    except Exception as e:
+                        log_error_with_traceback(f"合并订单状态日志时出错: {str(e)}")
+                
+                # 检查CSV文件更新
                 if current_time - last_csv_check_time >= csv_check_interval:
                     try:
                         monitor_csv_file()
@@ -2574,20 +3196,19 @@ def background_monitoring():
                         monitor_altcoin_csv_updates()
                         
                     except Exception as e:
-                        logger.error(f"检查CSV文件更新时出错: {str(e)}")
-                        traceback.print_exc()
+                        log_error_with_traceback(f"检查CSV文件更新时出错: {str(e)}")
                 last_csv_check_time = current_time
                 
                 # 智能数据推送 - 只有在数据真正变化时才推送
                 try:
                     if should_push_data():
-                        # 智能推送时不进行筛选，避免频繁API调用
-                        active_orders_data = make_json_serializable(active_orders)
-                        completed_orders_data = make_json_serializable(completed_orders)
+                        # 智能推送时不进行筛选，避免频繁API调用；内容未变化的列表直接复用上次的序列化结果
+                        active_orders_data, _ = serialize_orders_cached('active', active_orders)
+                        completed_orders_data, _ = serialize_orders_cached('completed', completed_orders)
                         
                         # 同时推送山寨币数据
-                        altcoin_active_data = make_json_serializable(altcoin_active_orders)
-                        altcoin_completed_data = make_json_serializable(altcoin_completed_orders)
+                        altcoin_active_data, altcoin_active_changed = serialize_orders_cached('altcoin_active', altcoin_active_orders)
+                        altcoin_completed_data, altcoin_completed_changed = serialize_orders_cached('altcoin_completed', altcoin_completed_orders)
                         
                         # 记录盈亏数据的调试信息
                         if active_orders_data:
@@ -2595,45 +3216,45 @@ def background_monitoring():
                             logger.info(f"推送活跃订单盈亏数据样本: {profit_data}")
                         
                         # 推送主要订单数据
-                        socketio.emit('orders_update', {
+                        queue_emit('orders_update', {
                             'active_orders': active_orders_data,
                             'completed_orders': completed_orders_data,
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                            'timestamp': now_str()
                         })
                         
-                        # 推送山寨币数据
-                        try:
-                            socketio.emit('altcoin_orders_update', {
+                        mark_orders_pushed('active', 'completed')
+                        
+                        # 推送山寨币数据（山寨币订单自上次推送后没有变化时跳过）
+                        if altcoin_active_changed or altcoin_completed_changed:
+                            queue_emit('altcoin_orders_update', {
                                 'active_orders': altcoin_active_data,
                                 'completed_orders': altcoin_completed_data,
-                                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                                'timestamp': now_str()
                             })
+                            mark_orders_pushed('altcoin_active', 'altcoin_completed')
                             logger.info(f"✅ 智能推送山寨币更新: 活跃山寨币 {len(altcoin_active_data)}, 已完成山寨币 {len(altcoin_completed_data)}")
-                        except Exception as e:
-                            logger.error(f"推送山寨币数据到前端失败: {e}")
                         
                         logger.info(f"✅ 智能推送订单更新: 活跃订单 {len(active_orders_data)}, 已完成订单 {len(completed_orders_data)}")
                     else:
                         logger.debug("📊 数据无变化，跳过推送")
                 except Exception as e:
-                    logger.error(f"发送更新到前端时出错: {str(e)}")
-                    traceback.print_exc()
+                    log_error_with_traceback(f"发送更新到前端时出错: {str(e)}")
                 
-                # 等待下一次更新
-                time.sleep(20)  # 从10秒改为20秒更新一次，配合智能推送控制进一步减少频率
+                # 等待下一次更新：期间主要币种价格有变化时立即检查相关订单的止盈止损
+                wait_for_price_changes(MONITOR_LOOP_INTERVAL)
                 
             except Exception as e:
-                logger.error(f"监控循环中出错: {str(e)}")
-                traceback.print_exc()
-                time.sleep(20)  # 出错后等待20秒再继续，与正常循环间隔保持一致
+                log_error_with_traceback(f"监控循环中出错: {str(e)}")
+                time.sleep(MONITOR_LOOP_INTERVAL)  # 出错后等待一个完整周期再继续
                 
     except Exception as e:
-        logger.error(f"后台监控线程出错: {str(e)}")
-        traceback.print_exc()
+        log_error_with_traceback(f"后台监控线程出错: {str(e)}")
     finally:
         monitoring_active = False
         if monitor:
             monitor.keep_running = False
+        if price_fh is not None:
+            price_fh.close()
         logger.info("后台监控线程已停止")
 
 @app.route('/charts/<path:filename>')
@@ -2685,7 +3306,6 @@ def list_charts():
 def connectivity_test():
     """外部连接测试路由"""
     import socket
-    import time
     
     # 获取服务器信息
     hostname = socket.gethostname()
@@ -2704,7 +3324,7 @@ def connectivity_test():
         'server_info': {
             'hostname': hostname,
             'local_ip': local_ip,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         },
         'client_info': {
             'ip': client_ip,
@@ -2732,31 +3352,42 @@ def get_price_history():
         end_time = request.args.get('end_time')    # 格式: YYYY-MM-DD HH:MM:SS
         export_format = request.args.get('format', 'json')  # json 或 csv
         
-        # 检查价格历史文件是否存在，如果不存在则生成模拟数据
-        price_history_file = os.path.join('data', 'price_history.csv')
-        
-        if os.path.exists(price_history_file):
-            # 读取真实的价格历史数据
-            df = pd.read_csv(price_history_file)
-            
-            # 按时间戳排序
-            df = df.sort_values('timestamp', ascending=False)
-            
-            # 筛选交易对
-            if symbol:
-                df = df[df['symbol'] == symbol]
-            
-            # 筛选时间范围
-            if start_time:
-                df = df[df['timestamp'] >= start_time]
-            if end_time:
-                df = df[df['timestamp'] <= end_time]
+        # 读取价格历史（包括按天归档的文件），没有任何文件时生成模拟数据
+        segments = price_history_segments()
+        
+        if segments:
+            # 从最新的文件往前读：跳过时间范围之外的文件，已够limit条时不再读取更早的文件
+            start_day = start_time[:10] if start_time else None
+            end_day = end_time[:10] if end_time else None
+            frames = []
+            row_count = 0
+            for path, previous_day, day in reversed(segments):
+                if start_day and day is not None and day < start_day:
+                    break
+                if end_day and previous_day is not None and previous_day > end_day:
+                    continue
+                part = read_table_cached(path)
+                
+                # 筛选交易对
+                if symbol:
+                    part = part[part['symbol'] == symbol]
+                
+                # 筛选时间范围
+                if start_time:
+                    part = part[part['timestamp'] >= start_time]
+                if end_time:
+                    part = part[part['timestamp'] <= end_time]
+                
+                frames.append(part)
+                row_count += len(part)
+                if row_count >= limit:
+                    break
             
-            # 限制返回数量
-            df = df.head(limit)
+            # 按时间戳排序，限制返回数量
+            df = pd.concat(frames, ignore_index=True) if frames else read_table_cached(segments[-1][0]).head(0)
+            df = df.sort_values('timestamp', ascending=False, kind='stable').head(limit)
         else:
             # 生成模拟价格历史数据
-            from datetime import datetime, timedelta
             import random
             
             now = datetime.now()
@@ -2835,7 +3466,7 @@ def get_current_prices():
                         'bid': price_info['bid'],
                         'ask': price_info['ask'],
                         'change_24h': price_info.get('change_24h', 0),
-                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        'timestamp': now_str()
                     }
             except Exception as e:
                 logger.warning(f"获取{symbol}价格失败: {e}")
@@ -2844,7 +3475,7 @@ def get_current_prices():
         return jsonify({
             'status': 'success',
             'data': current_prices,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
     except Exception as e:
@@ -2871,66 +3502,59 @@ def calculate_win_rate_statistics_from_orders():
         try:
             excel_file_path = os.path.join('data', 'analysis_results', 'results.xlsx')
             if os.path.exists(excel_file_path):
-                import pandas as pd
-                df = pd.read_excel(excel_file_path)
+                df = read_excel_fast(excel_file_path)
                 
-                # 转换Excel数据为订单格式
-                for _, row in df.iterrows():
-                    try:
-                        # 获取盈亏数据
-                        profit_pct = None
-                        if 'profit' in df.columns and not pd.isna(row['profit']):
-                            profit_pct = float(row['profit'])
-                        elif 'weighted_profit_pct' in df.columns and not pd.isna(row['weighted_profit_pct']):
-                            profit_pct = float(row['weighted_profit_pct'])
-                        
-                        # 只处理有有效盈亏数据的订单
-                        if profit_pct is not None:
-                            order = {
-                                'profit_pct': profit_pct,
-                                'weighted_profit_pct': profit_pct,
-                                'result': row.get('result', ''),
-                                'channel': row.get('channel', ''),
-                                'symbol': row.get('交易币种', ''),
-                                'direction': row.get('方向', ''),
-                                'source': 'results.xlsx'
-                            }
-                            all_completed_orders.append(order)
-                    except Exception as e:
-                        logger.debug(f"处理Excel订单行时出错: {e}")
-                        continue
+                # 转换Excel数据为订单格式：只取需要的列并改为可用作属性名的列名
+                rows_df = pd.DataFrame({
+                    'profit': profit_column(df),
+                    'result': raw_column(df, 'result', ''),
+                    'channel': raw_column(df, 'channel', ''),
+                    'symbol': raw_column(df, '交易币种', ''),
+                    'direction': raw_column(df, '方向', ''),
+                })
+                # 只处理有有效盈亏数据的订单
+                rows_df = rows_df[rows_df['profit'].notna()]
+                for row in rows_df.itertuples(index=False):
+                    profit_pct = float(row.profit)
+                    order = {
+                        'profit_pct': profit_pct,
+                        'weighted_profit_pct': profit_pct,
+                        'result': row.result,
+                        'channel': row.channel,
+                        'symbol': row.symbol,
+                        'direction': row.direction,
+                        'source': 'results.xlsx'
+                    }
+                    all_completed_orders.append(order)
         except Exception as e:
             logger.warning(f"读取Excel历史数据时出错: {e}")
         
         # 3. 从新完成订单Excel文件获取
         try:
-            new_excel_file_path = os.path.join('data', 'analysis_results', 'new_completed_orders.xlsx')
-            if os.path.exists(new_excel_file_path):
-                import pandas as pd
-                df = pd.read_excel(new_excel_file_path)
+            df = read_new_completed_orders()
+            if df is not None:
                 
-                for _, row in df.iterrows():
-                    try:
-                        # 获取盈亏数据
-                        profit_pct = None
-                        if '总加权盈亏%' in df.columns and not pd.isna(row['总加权盈亏%']):
-                            profit_str = str(row['总加权盈亏%']).replace('%', '')
-                            profit_pct = float(profit_str)
-                        
-                        if profit_pct is not None:
-                            order = {
-                                'profit_pct': profit_pct,
-                                'weighted_profit_pct': profit_pct,
-                                'result': row.get('最终结果', ''),
-                                'channel': row.get('channel', ''),
-                                'symbol': row.get('交易币种', ''),
-                                'direction': row.get('方向', ''),
-                                'source': 'new_completed_orders.xlsx'
-                            }
-                            all_completed_orders.append(order)
-                    except Exception as e:
-                        logger.debug(f"处理新完成订单行时出错: {e}")
-                        continue
+                # 向量化解析盈亏百分比，只保留有效盈亏数据的订单
+                profits = percent_column(df, '总加权盈亏%')
+                valid = profits.notna().to_numpy()
+                columns = zip(
+                    profits.to_numpy()[valid],
+                    raw_column(df, '最终结果', '').to_numpy()[valid],
+                    raw_column(df, 'channel', '').to_numpy()[valid],
+                    raw_column(df, '交易币种', '').to_numpy()[valid],
+                    raw_column(df, '方向', '').to_numpy()[valid],
+                )
+                for profit_pct, result, channel, symbol, direction in columns:
+                    profit_pct = float(profit_pct)
+                    all_completed_orders.append({
+                        'profit_pct': profit_pct,
+                        'weighted_profit_pct': profit_pct,
+                        'result': result,
+                        'channel': channel,
+                        'symbol': symbol,
+                        'direction': direction,
+                        'source': 'new_completed_orders.xlsx'
+                    })
         except Exception as e:
             logger.warning(f"读取新完成订单数据时出错: {e}")
         
@@ -2960,95 +3584,43 @@ def calculate_win_rate_statistics_from_orders():
                 'max_consecutive_losses': 0,
                 'total_profit': 0.0,
                 'total_loss': 0.0,
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'last_updated': now_str()
             }
         
-        # 计算统计数据
+        # 计算统计数据：逐个解析盈亏后，计数与求和都在numpy数组上用掩码完成
         total_trades = len(all_completed_orders)
-        winning_trades = 0
-        losing_trades = 0
-        total_profit = 0.0
-        total_loss = 0.0
-        profit_trades = []
-        loss_trades = []
-        
-        # 按时间排序（用于计算连续胜负）
-        results_sequence = []
-        
-        for order in all_completed_orders:
-            try:
-                # 获取盈亏数据
-                profit_pct = order.get('profit_pct') or order.get('weighted_profit_pct') or 0
-                
-                if isinstance(profit_pct, str):
-                    profit_pct = float(profit_pct.replace('%', ''))
-                else:
-                    profit_pct = float(profit_pct)
-                
-                if profit_pct > 0:
-                    winning_trades += 1
-                    total_profit += profit_pct
-                    profit_trades.append(profit_pct)
-                    results_sequence.append(True)  # 盈利
-                elif profit_pct < 0:
-                    losing_trades += 1
-                    total_loss += abs(profit_pct)
-                    loss_trades.append(abs(profit_pct))
-                    results_sequence.append(False)  # 亏损
-                # profit_pct == 0 的情况不计入胜负统计
-                
-            except Exception as e:
-                logger.debug(f"处理订单盈亏数据时出错: {e}, 订单数据: {order}")
-                continue
+        parsed_profits = [_order_profit_pct(order) for order in all_completed_orders]
+        # 解析失败的订单不计入任何统计；NaN盈亏是可解析的值，需与解析失败区分
+        parsed = np.fromiter((profit is not None for profit in parsed_profits), dtype=bool, count=total_trades)
+        profits = np.fromiter((np.nan if profit is None else profit for profit in parsed_profits),
+                              dtype=np.float64, count=total_trades)
+        
+        # profit_pct == 0（及NaN）的情况不计入胜负统计
+        wins = profits > 0
+        losses = profits < 0
+        winning_trades = int(np.count_nonzero(wins))
+        losing_trades = int(np.count_nonzero(losses))
+        total_profit = float(profits[wins].sum())
+        total_loss = float(np.abs(profits[losses]).sum())
         
         # 计算胜率
         effective_trades = winning_trades + losing_trades  # 排除盈亏为0的交易
         overall_win_rate = winning_trades / effective_trades if effective_trades > 0 else 0.0
         
         # 计算平均盈利和亏损
-        avg_profit = sum(profit_trades) / len(profit_trades) if profit_trades else 0.0
-        avg_loss = sum(loss_trades) / len(loss_trades) if loss_trades else 0.0
+        avg_profit = total_profit / winning_trades if winning_trades else 0.0
+        avg_loss = total_loss / losing_trades if losing_trades else 0.0
         
         # 计算盈利因子
         profit_factor = total_profit / total_loss if total_loss > 0 else 0.0
         
-        # 计算最大连续胜负次数
-        max_consecutive_wins = 0
-        max_consecutive_losses = 0
-        current_consecutive_wins = 0
-        current_consecutive_losses = 0
-        
-        for result in results_sequence:
-            if result:  # 盈利
-                current_consecutive_wins += 1
-                current_consecutive_losses = 0
-                max_consecutive_wins = max(max_consecutive_wins, current_consecutive_wins)
-            else:  # 亏损
-                current_consecutive_losses += 1
-                current_consecutive_wins = 0
-                max_consecutive_losses = max(max_consecutive_losses, current_consecutive_losses)
-        
-        # 计算近期胜率（最近20笔交易）
-        recent_orders = all_completed_orders[-20:] if len(all_completed_orders) > 20 else all_completed_orders
-        recent_winning = 0
-        recent_total = 0
-        
-        for order in recent_orders:
-            try:
-                profit_pct = order.get('profit_pct') or order.get('weighted_profit_pct') or 0
-                
-                if isinstance(profit_pct, str):
-                    profit_pct = float(profit_pct.replace('%', ''))
-                else:
-                    profit_pct = float(profit_pct)
-                
-                if profit_pct != 0:  # 只计算有效交易
-                    recent_total += 1
-                    if profit_pct > 0:
-                        recent_winning += 1
-            except Exception as e:
-                logger.debug(f"处理近期订单数据时出错: {e}")
-                continue
+        # 计算最大连续胜负次数（只看有胜负的交易，按原顺序）
+        max_consecutive_wins, max_consecutive_losses = max_consecutive_runs(profits[wins | losses] > 0)
+        
+        # 计算近期胜率（最近20笔交易，只计算解析成功且盈亏不为0的有效交易）
+        recent = parsed[-20:] & (profits[-20:] != 0)
+        recent_total = int(np.count_nonzero(recent))
+        recent_winning = int(np.count_nonzero(recent & (profits[-20:] > 0)))
         
         recent_win_rate = recent_winning / recent_total if recent_total > 0 else 0.0
         
@@ -3069,12 +3641,11 @@ def calculate_win_rate_statistics_from_orders():
             'max_consecutive_losses': max_consecutive_losses,
             'total_profit': total_profit,
             'total_loss': total_loss,
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'last_updated': now_str()
         }
         
     except Exception as e:
         logger.error(f"计算胜率统计时出错: {e}")
-        import traceback
         traceback.print_exc()
         return {
             'overall_win_rate': 0.0,
@@ -3089,7 +3660,7 @@ def calculate_win_rate_statistics_from_orders():
             'max_consecutive_losses': 0,
             'total_profit': 0.0,
             'total_loss': 0.0,
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'last_updated': now_str()
         }
 
 @app.route('/api/win_rate_stats')
@@ -3101,7 +3672,7 @@ def get_win_rate_stats():
         return jsonify({
             'status': 'success',
             'data': win_stats,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
     except Exception as e:
         logger.error(f"获取胜率统计失败: {e}")
@@ -3119,9 +3690,9 @@ def get_win_rate_stats():
                 'profit_factor': 0.0,
                 'max_consecutive_wins': 0,
                 'max_consecutive_losses': 0,
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'last_updated': now_str()
             },
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
 @app.route('/api/win_rate_stats_detailed')
@@ -3142,29 +3713,26 @@ def get_win_rate_stats_detailed():
         try:
             excel_file_path = os.path.join('data', 'analysis_results', 'results.xlsx')
             if os.path.exists(excel_file_path):
-                import pandas as pd
-                df = pd.read_excel(excel_file_path)
+                df = read_excel_fast(excel_file_path)
                 
-                for _, row in df.iterrows():
-                    try:
-                        profit_pct = None
-                        if 'profit' in df.columns and not pd.isna(row['profit']):
-                            profit_pct = float(row['profit'])
-                        elif 'weighted_profit_pct' in df.columns and not pd.isna(row['weighted_profit_pct']):
-                            profit_pct = float(row['weighted_profit_pct'])
-                        
-                        if profit_pct is not None:
-                            order = {
-                                'profit_pct': profit_pct,
-                                'symbol': row.get('交易币种', ''),
-                                'channel': row.get('channel', ''),
-                                'direction': row.get('方向', ''),
-                                'timestamp': row.get('timestamp', ''),
-                                'source': 'results.xlsx'
-                            }
-                            all_completed_orders.append(order)
-                    except Exception as e:
-                        continue
+                rows_df = pd.DataFrame({
+                    'profit': profit_column(df),
+                    'symbol': raw_column(df, '交易币种', ''),
+                    'channel': raw_column(df, 'channel', ''),
+                    'direction': raw_column(df, '方向', ''),
+                    'timestamp': raw_column(df, 'timestamp', ''),
+                })
+                rows_df = rows_df[rows_df['profit'].notna()]
+                for row in rows_df.itertuples(index=False):
+                    order = {
+                        'profit_pct': float(row.profit),
+                        'symbol': row.symbol,
+                        'channel': row.channel,
+                        'direction': row.direction,
+                        'timestamp': row.timestamp,
+                        'source': 'results.xlsx'
+                    }
+                    all_completed_orders.append(order)
         except Exception as e:
             logger.warning(f"读取Excel历史数据时出错: {e}")
         
@@ -3270,7 +3838,7 @@ def get_win_rate_stats_detailed():
                 'by_direction': direction_stats,
                 'total_orders_analyzed': len(all_completed_orders)
             },
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
     except Exception as e:
@@ -3278,7 +3846,7 @@ def get_win_rate_stats_detailed():
         return jsonify({
             'status': 'error',
             'message': str(e),
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
 @app.route('/api/position_suggestion')
@@ -3297,7 +3865,7 @@ def get_position_suggestion():
         return jsonify({
             'status': 'success',
             'data': position_suggestion,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
     except Exception as e:
@@ -3319,7 +3887,7 @@ def get_position_suggestion():
                 'max_loss_usd': 45.0,
                 'max_profit_usd': 90.0
             },
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
 @app.route('/api/trading_performance')
@@ -3350,7 +3918,7 @@ def get_trading_performance():
         return jsonify({
             'status': 'success',
             'data': performance_metrics,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
     except Exception as e:
@@ -3372,7 +3940,7 @@ def get_trading_performance():
                 'annual_return': 0.102,
                 'volatility': 0.18
             },
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
 # ========== 控制面板API端点 ==========
@@ -3388,20 +3956,20 @@ def start_monitoring_endpoint():
             return jsonify({
                 'status': 'success',
                 'message': '监控已启动',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': now_str()
             })
         else:
             return jsonify({
                 'status': 'error',
                 'message': '监控器未初始化',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': now_str()
             })
     except Exception as e:
         logger.error(f"启动监控失败: {e}")
         return jsonify({
             'status': 'error',
             'message': f'启动监控失败: {str(e)}',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
 @app.route('/socket_stop_monitoring', methods=['POST'])
@@ -3415,20 +3983,20 @@ def stop_monitoring_endpoint():
             return jsonify({
                 'status': 'success',
                 'message': '监控已停止',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': now_str()
             })
         else:
             return jsonify({
                 'status': 'error',
                 'message': '监控器未初始化',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': now_str()
             })
     except Exception as e:
         logger.error(f"停止监控失败: {e}")
         return jsonify({
             'status': 'error',
             'message': f'停止监控失败: {str(e)}',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
 @app.route('/api/clear_data', methods=['POST'])
@@ -3443,7 +4011,6 @@ def clear_data_endpoint():
         orders_by_symbol.clear()
         
         # 清空CSV文件（保留表头）
-        import pandas as pd
         if csv_file_path and os.path.exists(csv_file_path):
             # 创建空的DataFrame但保留表头
             empty_df = pd.DataFrame(columns=[
@@ -3457,20 +4024,20 @@ def clear_data_endpoint():
         
         # 通过WebSocket发送更新
         # 强制推送（因为数据已被清空）
-        global last_data_hash, last_push_time
-        last_data_hash = ""  # 重置哈希值，确保下次推送
+        global last_data_key, last_push_time
+        last_data_key = None  # 重置数据键，确保下次推送
         last_push_time = time.time()
         
         socketio.emit('orders_update', {
             'active_orders': [],
             'completed_orders': [],
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
         return jsonify({
             'status': 'success',
             'message': '所有数据已清空',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
     except Exception as e:
@@ -3478,22 +4045,23 @@ def clear_data_endpoint():
         return jsonify({
             'status': 'error',
             'message': f'清空数据失败: {str(e)}',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
 @app.route('/api/save_excel', methods=['POST'])
 def save_excel_endpoint():
     """手动保存已完成订单到Excel文件的API接口"""
     try:
-        # 调用保存函数
-        save_completed_orders_to_excel()
+        # 调用保存函数，并把parquet存储的数据导出为Excel
+        save_completed_orders_to_excel(background=False)
+        export_new_completed_orders_excel()
         
         return jsonify({
             'status': 'success',
             'message': f'已保存{len(completed_orders)}个已完成订单到Excel文件',
             'file_path': 'data/analysis_results/results.xlsx',
             'count': len(completed_orders),
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
     except Exception as e:
@@ -3501,9 +4069,23 @@ def save_excel_endpoint():
         return jsonify({
             'status': 'error',
             'message': f'保存Excel失败: {str(e)}',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
+@app.route('/export/excel')
+def export_excel_endpoint():
+    """下载新完成订单的Excel文件（按需从parquet存储导出）"""
+    try:
+        excel_path = export_new_completed_orders_excel()
+        if excel_path is None:
+            return jsonify({'error': '没有新完成订单数据'}), 404
+        return send_from_directory(os.path.abspath(os.path.dirname(excel_path)),
+                                   os.path.basename(excel_path), as_attachment=True)
+    except Exception as e:
+        logger.error(f"导出Excel失败: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/completed_orders')
 def get_completed_orders():
     """获取已完成订单列表的API接口"""
@@ -3512,7 +4094,7 @@ def get_completed_orders():
             'status': 'success',
             'data': make_json_serializable(completed_orders),
             'count': len(completed_orders),
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
     except Exception as e:
@@ -3520,16 +4102,11 @@ def get_completed_orders():
         return jsonify({
             'status': 'error',
             'message': f'获取已完成订单失败: {str(e)}',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
 
 @app.route('/trade_report')
 def trade_report():
-    import pandas as pd
-    import numpy as np
-    import json
-    from datetime import datetime
-    import traceback
     
     try:
         logger.info("开始处理交易分析报告请求...")
@@ -3587,11 +4164,10 @@ def trade_report():
                         df = xl.parse(sheet)
                         # 清理数据
                         df = clean_dataframe(df)
-                        # 转换为列表并处理特殊值
+                        # 转换为列表并处理特殊值（to_dict('records') 不为每行构造Series）
                         rows = []
-                        for _, row in df.iterrows():
+                        for row_dict in df.to_dict('records'):
                             try:
-                                row_dict = row.to_dict()
                                 # 处理每个值
                                 for key, value in row_dict.items():
                                     if pd.isna(value):
@@ -3685,7 +4261,7 @@ def trade_analysis_data():
 
         # 读取各个Sheet
         print("开始读取Excel文件...")
-        with pd.ExcelFile(excel_path) as xl:
+        with pd.ExcelFile(excel_path, engine=EXCEL_READ_ENGINE) as xl:
             print(f"Excel文件包含以下sheet: {xl.sheet_names}")
             
             # 1. 读取总体统计
@@ -3838,8 +4414,6 @@ def get_csv_data():
             try:
                 # 检查pandas依赖
                 try:
-                    import pandas as pd
-                    from datetime import datetime
                     logger.info("pandas导入成功")
                 except ImportError as e:
                     logger.error(f"pandas未安装: {e}")
@@ -3871,7 +4445,7 @@ def get_csv_data():
                 if os.path.exists(historical_file):
                     try:
                         logger.info(f"读取历史已完成订单: {historical_file}")
-                        historical_df = pd.read_excel(historical_file, engine='openpyxl')
+                        historical_df = read_table_cached(historical_file)
                         # 过滤掉杠杆列
                         historical_columns = [col for col in historical_df.columns if '杠杆' not in col]
                         historical_df = historical_df[historical_columns]
@@ -3882,11 +4456,10 @@ def get_csv_data():
                         logger.warning(f"读取历史已完成订单失败: {e}")
                 
                 # 2. 读取新完成订单（new_completed_orders.xlsx）
-                new_file = os.path.join('data', 'analysis_results', 'new_completed_orders.xlsx')
-                if os.path.exists(new_file):
+                if os.path.exists(NEW_COMPLETED_ORDERS_PARQUET) or os.path.exists(NEW_COMPLETED_ORDERS_XLSX):
                     try:
-                        logger.info(f"读取新完成订单: {new_file}")
-                        new_df = pd.read_excel(new_file, engine='openpyxl')
+                        logger.info("读取新完成订单")
+                        new_df = read_new_completed_orders()
                         
                         # 标准化列名，使其与历史数据一致
                         column_mapping = {
@@ -3993,7 +4566,6 @@ def get_csv_data():
                 
             except Exception as e:
                 logger.error(f"读取已完成订单失败: {str(e)}")
-                import traceback
                 traceback.print_exc()
                 return jsonify({
                     'status': 'error',
@@ -4014,20 +4586,12 @@ def get_csv_data():
                 })
             
             # 读取CSV文件
-            import pandas as pd
             df = pd.read_csv(file_path)
         
         # 处理NaN值
         df = df.fillna('')
         
         # 只保留BTC、ETH、SOL相关数据
-        allowed_symbols = ['BTC', 'ETH', 'SOL']
-        def is_allowed_symbol(symbol):
-            symbol = str(symbol).strip().upper()
-            if symbol.endswith('USDT'):
-                symbol = symbol[:-4]
-            return symbol in allowed_symbols
-        
         # 根据数据类型选择不同的币种列名
         if data_type == 'completed':
             symbol_column = '交易币种'  # Excel文件使用这个列名
@@ -4035,7 +4599,7 @@ def get_csv_data():
             symbol_column = 'analysis.交易币种'  # CSV文件使用这个列名
             
         if symbol_column in df.columns:
-            df = df[df[symbol_column].apply(is_allowed_symbol)]
+            df = df[major_symbol_mask(df[symbol_column])]
         
         # 严格筛选：只保留交易币种和入场点位1都有有效数据的行
         # 根据数据类型选择正确的列名
@@ -4079,34 +4643,7 @@ def get_csv_data():
             
             # 新增筛选条件2：止盈点位1和止损点位1至少有一个
             if target1_column in df.columns and stop1_column in df.columns:
-                def has_valid_target_or_stop(row):
-                    try:
-                        target1 = row.get(target1_column)
-                        stop1 = row.get(stop1_column)
-                        
-                        # 检查止盈点位1是否有效
-                        has_target = False
-                        if pd.notna(target1) and target1 != '' and target1 != 0:
-                            try:
-                                float(target1)
-                                has_target = True
-                            except (ValueError, TypeError):
-                                pass
-                        
-                        # 检查止损点位1是否有效
-                        has_stop = False
-                        if pd.notna(stop1) and stop1 != '' and stop1 != 0:
-                            try:
-                                float(stop1)
-                                has_stop = True
-                            except (ValueError, TypeError):
-                                pass
-                        
-                        return has_target or has_stop
-                    except Exception:
-                        return False
-                
-                target_stop_mask = df.apply(has_valid_target_or_stop, axis=1)
+                target_stop_mask = target_or_stop_mask(df, target1_column, stop1_column)
                 valid_mask = valid_mask & target_stop_mask
                 logger.info(f"应用止盈止损筛选后保留 {valid_mask.sum()} 条记录")
             
@@ -4124,9 +4661,9 @@ def get_csv_data():
             if data_type == 'active':
                 # 过滤条件：排除已完成的订单
                 active_mask = (
-                    (df.get('status') != 'completed') &
-                    (df.get('exit_price').isna() | (df.get('exit_price') == '')) &
-                    (df.get('result').isna() | (df.get('result') == ''))
+                    ~status_completed_mask(df) &
+                    empty_mask(df, 'exit_price') &
+                    empty_mask(df, 'result')
                 )
                 final_mask = valid_mask & valid_price_mask & active_mask
             else:
@@ -4206,7 +4743,6 @@ def get_csv_data():
         filtered_df = filtered_df.rename(columns=column_mapping)
         
         # 统一时间格式（2025-04-27 20:17:12）
-        from datetime import datetime
         def format_time(val):
             if pd.isna(val) or str(val).strip() == '':
                 return ''
@@ -4732,7 +5268,8 @@ def monitor_csv_file():
         
         # 读取CSV文件
         try:
-            csv_df = pd.read_csv(csv_file_path)
+            csv_df = read_table_cached(csv_file_path, usecols=monitor_csv_columns(csv_file_path),
+                                       dtype=ANALYSIS_CSV_DTYPES)
             logger.info(f"成功读取CSV文件，共 {len(csv_df)} 行数据")
             
             # 获取列名
@@ -4766,99 +5303,93 @@ def monitor_csv_file():
             
             # 处理筛选出的数据
             new_orders_count = 0
-            for _, row in filtered_df.iterrows():
-                try:
-                    # 再次验证基本信息
-                    original_symbol = str(row[symbol_col]).strip().upper()
-                    if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
-                        continue
-                    
-                    # 验证和标准化交易对
-                    normalized_symbol = normalize_symbol(original_symbol)
-                    if not normalized_symbol:
-                        logger.debug(f"跳过无效交易对: {original_symbol}")
-                        continue
-                    
-                    direction = str(row[direction_col]).strip() if direction_col and pd.notna(row[direction_col]) else None
-                    
-                    # 严格验证入场价格
-                    entry_price = safe_convert_float(row[entry_col])
-                    if not entry_price or entry_price <= 0:
-                        logger.debug(f"跳过无效入场价格: {row[entry_col]}")
-                        continue
-                        
-                    # 获取止损价格
-                    stop_loss = safe_convert_float(row[stop_loss_col]) if stop_loss_col and pd.notna(row[stop_loss_col]) else None
-                    
-                    # 获取止盈价格
-                    target_price = None
-                    for col in columns:
-                        if '止盈' in col and pd.notna(row[col]):
-                            target_price = safe_convert_float(row[col])
-                            break
-                    
-                    # 生成订单ID
-                    order_id = f"{normalized_symbol}_{entry_price}_{int(time.time())}"
-                    
-                    # 获取频道信息
-                    channel = row.get('channel', 'unknown')
-                    
-                    # 获取发布时间
-                    publish_time = None
-                    for col in columns:
-                        if 'time' in col.lower() or '时间' in col or 'date' in col:
-                            time_val = row.get(col)
-                            if not pd.isna(time_val):
-                                if isinstance(time_val, str):
-                                    publish_time = time_val
-                                elif isinstance(time_val, (pd.Timestamp, datetime)):
-                                    publish_time = time_val.strftime('%Y-%m-%d %H:%M:%S')
-                                break
-                    
-                    # 计算风险收益比
-                    risk_reward_ratio = calculate_risk_reward_ratio(direction, entry_price, target_price, stop_loss)
-                    
-                    # 检查订单是否已存在
-                    order_exists = False
-                    for existing_order in active_orders + completed_orders:
-                        if (existing_order['symbol'] == original_symbol and 
-                            existing_order['entry_price'] == entry_price):
-                            order_exists = True
-                            break
-                    
-                    if not order_exists:
-                        # 创建订单对象
-                        new_order = create_order_object(
-                            id_num=order_id,
-                            symbol=original_symbol,
-                            normalized_symbol=normalized_symbol,
-                            direction=direction,
-                            entry_price=entry_price,
-                            average_entry_cost=None,
-                            profit_pct=None,
-                            target_price=target_price,
-                            stop_loss=stop_loss,
-                            exit_price=None,
-                            exit_time=None,
-                            is_completed=False,
-                            channel=channel,
-                            publish_time=publish_time,
-                            risk_reward_ratio=risk_reward_ratio,
-                            hold_time=None,
-                            result="-",
-                            source="all_analysis_results.csv"
-                        )
-                        
-                        # 添加到活跃订单列表
-                        active_orders.append(new_order)
-                        new_orders_count += 1
-                        logger.info(f"添加新订单: {original_symbol} {direction} 入场价:{entry_price}")
+            # 已有订单的(币种, 入场价)集合，重复判断为O(1)；新订单先放入批次，循环结束后一次性加入
+            existing_keys = {(order.get('symbol'), order.get('entry_price')) for order in active_orders + completed_orders}
+            new_batch = []
+            # 循环用到的列预先取出为数组，循环内按位置取值，不再逐行访问Series
+            symbols = filtered_df[symbol_col].astype(str).str.strip().str.upper().to_numpy()
+            directions = text_values(filtered_df, direction_col)
+            raw_entries = filtered_df[entry_col].to_numpy()
+            entries = numeric_column(filtered_df, entry_col).tolist()
+            stops = numeric_column(filtered_df, stop_loss_col).tolist()
+            targets = first_numeric_column(filtered_df, [col for col in columns if '止盈' in col]).tolist()
+            channels = raw_column(filtered_df, 'channel', 'unknown').to_numpy()
+            publish_times = publish_time_column(filtered_df, columns).to_numpy()
+            # 风险收益比整组一次计算
+            ratios = risk_reward_ratios(directions, entries, targets, stops).tolist()
+            for i in range(len(filtered_df)):
+                # 再次验证基本信息
+                original_symbol = symbols[i]
+                if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
+                    continue
                 
-                except Exception as e:
-                    logger.error(f"处理订单数据时出错: {str(e)}")
-                    traceback.print_exc()
+                # 验证和标准化交易对
+                normalized_symbol = normalize_symbol(original_symbol)
+                if not normalized_symbol:
+                    logger.debug(f"跳过无效交易对: {original_symbol}")
+                    continue
+                
+                direction = directions[i]
+                
+                # 严格验证入场价格
+                entry_price = entries[i]
+                if not entry_price > 0:
+                    logger.debug(f"跳过无效入场价格: {raw_entries[i]}")
                     continue
+                    
+                # 获取止损价格
+                stop_loss = None if math.isnan(stops[i]) else stops[i]
+                
+                # 获取止盈价格
+                target_price = None if math.isnan(targets[i]) else targets[i]
+                
+                # 生成订单ID
+                order_id = f"{normalized_symbol}_{entry_price}_{int(time.time())}"
+                
+                # 获取频道信息
+                channel = channels[i]
+                
+                # 获取发布时间（循环前已整列格式化）
+                publish_time = publish_times[i]
+                
+                # 计算风险收益比
+                risk_reward_ratio = None if math.isnan(ratios[i]) else ratios[i]
+                
+                # 检查订单是否已存在
+                order_key = (original_symbol, entry_price)
+                if order_key not in existing_keys:
+                    existing_keys.add(order_key)
+                    # 创建订单对象
+                    new_order = create_order_object(
+                        id_num=order_id,
+                        symbol=original_symbol,
+                        normalized_symbol=normalized_symbol,
+                        direction=direction,
+                        entry_price=entry_price,
+                        average_entry_cost=None,
+                        profit_pct=None,
+                        target_price=target_price,
+                        stop_loss=stop_loss,
+                        exit_price=None,
+                        exit_time=None,
+                        is_completed=False,
+                        channel=channel,
+                        publish_time=publish_time,
+                        risk_reward_ratio=risk_reward_ratio,
+                        hold_time=None,
+                        result="-",
+                        source="all_analysis_results.csv"
+                    )
+                    
+                    # 添加到活跃订单列表
+                    new_batch.append(new_order)
+                    new_orders_count += 1
+                    logger.info(f"添加新订单: {original_symbol} {direction} 入场价:{entry_price}")
             
+            active_orders.extend(new_batch)
+            # 与加载时一致，新订单同时加入按币种分类的字典
+            for order in new_batch:
+                orders_by_symbol[order['symbol']].append(order)
             if new_orders_count > 0:
                 logger.info(f"成功添加 {new_orders_count} 个新订单")
                 return True
@@ -4897,7 +5428,8 @@ def monitor_altcoin_csv_updates():
         
         # 读取CSV文件
         try:
-            csv_df = pd.read_csv(csv_file_path)
+            csv_df = read_table_cached(csv_file_path, usecols=monitor_csv_columns(csv_file_path),
+                                       dtype=ANALYSIS_CSV_DTYPES)
             logger.debug(f"山寨币监控：读取CSV文件，共 {len(csv_df)} 行数据")
             
             # 获取列名
@@ -4913,23 +5445,12 @@ def monitor_altcoin_csv_updates():
                 logger.debug("山寨币监控：缺少必要的列：入场点位或交易币种")
                 return False
             
-            # 排除BTC、ETH、SOL，只保留山寨币
-            excluded_symbols = ['BTC', 'ETH', 'SOL']
-            def is_altcoin_symbol(symbol):
-                symbol = str(symbol).strip().upper()
-                if symbol.endswith('USDT'):
-                    symbol = symbol[:-4]
-                return symbol not in excluded_symbols
-            
             # 筛选山寨币数据
             filtered_df = csv_df[
-                csv_df[entry_col].notna() & 
-                csv_df[symbol_col].notna() &
+                csv_df[entry_col].notna() &
                 (csv_df[entry_col] != '') &
-                (csv_df[symbol_col] != '') &
                 (csv_df[entry_col] != 0) &
-                (csv_df[symbol_col].astype(str).str.strip() != '') &
-                (csv_df[symbol_col].apply(is_altcoin_symbol))  # 只保留山寨币
+                altcoin_symbol_mask(csv_df[symbol_col])  # 只保留山寨币
             ]
             
             if len(filtered_df) == 0:
@@ -4938,99 +5459,91 @@ def monitor_altcoin_csv_updates():
             
             # 处理筛选出的山寨币数据
             new_altcoin_orders_count = 0
-            for _, row in filtered_df.iterrows():
-                try:
-                    # 验证基本信息
-                    original_symbol = str(row[symbol_col]).strip().upper()
-                    if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
-                        continue
-                    
-                    # 验证和标准化交易对
-                    normalized_symbol = normalize_symbol(original_symbol)
-                    if not normalized_symbol:
-                        logger.debug(f"山寨币监控：跳过无效交易对: {original_symbol}")
-                        continue
-                    
-                    direction = str(row[direction_col]).strip() if direction_col and pd.notna(row[direction_col]) else "做多"
-                    if direction not in ["做多", "做空"]:
-                        direction = "做多"
-                    
-                    # 验证入场价格
-                    entry_price = safe_convert_float(row[entry_col])
-                    if not entry_price or entry_price <= 0:
-                        logger.debug(f"山寨币监控：跳过无效入场价格: {row[entry_col]}")
-                        continue
-                        
-                    # 获取止损和止盈价格
-                    stop_loss = safe_convert_float(row[stop_loss_col]) if stop_loss_col and pd.notna(row[stop_loss_col]) else None
-                    
-                    target_price = None
-                    for col in columns:
-                        if '止盈' in col and pd.notna(row[col]):
-                            target_price = safe_convert_float(row[col])
-                            break
-                    
-                    # 获取频道信息
-                    channel = row.get('channel', 'unknown')
-                    
-                    # 获取发布时间
-                    publish_time = None
-                    for col in columns:
-                        if 'time' in col.lower() or '时间' in col or 'date' in col:
-                            time_val = row.get(col)
-                            if not pd.isna(time_val):
-                                if isinstance(time_val, str):
-                                    publish_time = time_val
-                                elif isinstance(time_val, (pd.Timestamp, datetime)):
-                                    publish_time = time_val.strftime('%Y-%m-%d %H:%M:%S')
-                                break
+            # 已有订单的(币种, 入场价)集合，重复判断为O(1)；新订单先放入批次，循环结束后一次性加入
+            existing_keys = {(order.get('symbol'), order.get('entry_price')) for order in altcoin_active_orders + altcoin_completed_orders}
+            new_batch = []
+            # 循环用到的列预先取出为数组，循环内按位置取值，不再逐行访问Series
+            symbols = filtered_df[symbol_col].astype(str).str.strip().str.upper().to_numpy()
+            directions = direction_series(filtered_df, direction_col).to_numpy()
+            raw_entries = filtered_df[entry_col].to_numpy()
+            entries = numeric_column(filtered_df, entry_col).tolist()
+            stops = numeric_column(filtered_df, stop_loss_col).tolist()
+            targets = first_numeric_column(filtered_df, [col for col in columns if '止盈' in col]).tolist()
+            channels = raw_column(filtered_df, 'channel', 'unknown').to_numpy()
+            publish_times = publish_time_column(filtered_df, columns).to_numpy()
+            # 风险收益比整组一次计算
+            ratios = risk_reward_ratios(directions, entries, targets, stops).tolist()
+            for i in range(len(filtered_df)):
+                # 验证基本信息
+                original_symbol = symbols[i]
+                if not original_symbol or original_symbol in ['', 'NAN', 'NULL']:
+                    continue
+                
+                # 验证和标准化交易对
+                normalized_symbol = normalize_symbol(original_symbol)
+                if not normalized_symbol:
+                    logger.debug(f"山寨币监控：跳过无效交易对: {original_symbol}")
+                    continue
+                
+                direction = directions[i]
+                
+                # 验证入场价格
+                entry_price = entries[i]
+                if not entry_price > 0:
+                    logger.debug(f"山寨币监控：跳过无效入场价格: {raw_entries[i]}")
+                    continue
                     
-                    # 计算风险收益比
-                    risk_reward_ratio = calculate_risk_reward_ratio(direction, entry_price, target_price, stop_loss)
+                # 获取止损和止盈价格
+                stop_loss = None if math.isnan(stops[i]) else stops[i]
+                
+                target_price = None if math.isnan(targets[i]) else targets[i]
+                
+                # 获取频道信息
+                channel = channels[i]
+                
+                # 获取发布时间（循环前已整列格式化）
+                publish_time = publish_times[i]
+                
+                # 计算风险收益比
+                risk_reward_ratio = None if math.isnan(ratios[i]) else ratios[i]
+                
+                # 检查山寨币订单是否已存在
+                order_key = (original_symbol, entry_price)
+                if order_key not in existing_keys:
+                    existing_keys.add(order_key)
+                    # 生成订单ID
+                    order_id = f"altcoin_{normalized_symbol}_{entry_price}_{int(time.time())}"
                     
-                    # 检查山寨币订单是否已存在
-                    order_exists = False
-                    for existing_order in altcoin_active_orders + altcoin_completed_orders:
-                        if (existing_order['symbol'] == original_symbol and 
-                            existing_order['entry_price'] == entry_price):
-                            order_exists = True
-                            break
+                    # 创建山寨币订单对象
+                    new_altcoin_order = create_order_object(
+                        id_num=order_id,
+                        symbol=original_symbol,
+                        normalized_symbol=normalized_symbol,
+                        direction=direction,
+                        entry_price=entry_price,
+                        average_entry_cost=None,
+                        profit_pct=None,
+                        target_price=target_price,
+                        stop_loss=stop_loss,
+                        exit_price=None,
+                        exit_time=None,
+                        is_completed=False,
+                        channel=channel,
+                        publish_time=publish_time,
+                        risk_reward_ratio=risk_reward_ratio,
+                        hold_time=None,
+                        result="-",
+                        source="all_analysis_results.csv_altcoin"
+                    )
                     
-                    if not order_exists:
-                        # 生成订单ID
-                        order_id = f"altcoin_{normalized_symbol}_{entry_price}_{int(time.time())}"
-                        
-                        # 创建山寨币订单对象
-                        new_altcoin_order = create_order_object(
-                            id_num=order_id,
-                            symbol=original_symbol,
-                            normalized_symbol=normalized_symbol,
-                            direction=direction,
-                            entry_price=entry_price,
-                            average_entry_cost=None,
-                            profit_pct=None,
-                            target_price=target_price,
-                            stop_loss=stop_loss,
-                            exit_price=None,
-                            exit_time=None,
-                            is_completed=False,
-                            channel=channel,
-                            publish_time=publish_time,
-                            risk_reward_ratio=risk_reward_ratio,
-                            hold_time=None,
-                            result="-",
-                            source="all_analysis_results.csv_altcoin"
-                        )
-                        
-                        # 添加到山寨币活跃订单列表
-                        altcoin_active_orders.append(new_altcoin_order)
-                        new_altcoin_orders_count += 1
-                        logger.info(f"添加新山寨币订单: {original_symbol} {direction} 入场价:{entry_price}")
-                
-                except Exception as e:
-                    logger.error(f"处理山寨币订单数据时出错: {str(e)}")
-                    continue
+                    # 添加到山寨币活跃订单列表
+                    new_batch.append(new_altcoin_order)
+                    new_altcoin_orders_count += 1
+                    logger.info(f"添加新山寨币订单: {original_symbol} {direction} 入场价:{entry_price}")
             
+            altcoin_active_orders.extend(new_batch)
+            for order in new_batch:
+                altcoin_orders_by_symbol[order['symbol']].append(order)
             if new_altcoin_orders_count > 0:
                 logger.info(f"山寨币监控：成功添加 {new_altcoin_orders_count} 个新山寨币订单")
                 return True
@@ -5145,6 +5658,12 @@ def initialize_system():
         else:
             logger.info("成功连接到币安API，将使用实时价格数据（仅监控BTC和ETH）")
         
+        # 先合并上次运行遗留的订单状态日志，保证加载时CSV中的状态是最新的
+        try:
+            compact_order_status_log()
+        except Exception as e:
+            logger.error(f"合并订单状态日志时出错: {str(e)}")
+        
         # 加载初始订单数据
         if not load_order_data():
             logger.warning("加载初始订单数据失败")
@@ -5250,17 +5769,22 @@ def safe_emit(event_name, data, **kwargs):
 # ========== 恢复原版的 WebSocket 事件 ==========
 @socketio.on('connect')
 def handle_connect():
-    """处理WebSocket连接"""
+    """处理WebSocket连接
+    
+    初始数据只发给新连接的客户端：socketio.emit 默认广播，每有一个客户端连接，
+    所有已连接的客户端都会重新收到完整的订单列表。
+    """
     logger.info('客户端已连接')
+    sid = request.sid
     # 发送初始价格数据
     if price_data:
         safe_emit('all_prices', {
             'prices': list(price_data.values()),
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        })
-    # 发送初始订单数据
-    serializable_active_orders = make_json_serializable(active_orders)
-    serializable_completed_orders = make_json_serializable(completed_orders)
+            'timestamp': now_str()
+        }, to=sid)
+    # 发送初始订单数据（复用推送用的序列化缓存）
+    serializable_active_orders, _ = serialize_orders_cached('active', active_orders)
+    serializable_completed_orders, _ = serialize_orders_cached('completed', completed_orders)
     
     # 记录日志，验证数据是否正确
     logger.debug(f"WebSocket连接 - 发送活跃订单: {len(active_orders)}, 已完成订单: {len(completed_orders)}")
@@ -5268,8 +5792,8 @@ def handle_connect():
     safe_emit('orders_update', {
         'active_orders': serializable_active_orders,
         'completed_orders': serializable_completed_orders,
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    })
+        'timestamp': now_str()
+    }, to=sid)
     # 发送监控状态
     safe_emit('monitoring_status', {
         'is_monitoring': monitoring_active,
@@ -5278,7 +5802,7 @@ def handle_connect():
         'active_order_count': len(active_orders),
         'completed_order_count': len(completed_orders),
         'title_config': TITLE_CONFIG
-    })
+    }, to=sid)
 
 @socketio.on('start_monitoring')
 def handle_start_monitoring():
@@ -5325,7 +5849,7 @@ def handle_refresh_data():
         safe_emit('orders_update', {
             'active_orders': serializable_active_orders,
             'completed_orders': serializable_completed_orders,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         # 同时发送标题配置
         safe_emit('title_config_update', {
@@ -5348,7 +5872,7 @@ def handle_refresh_csv():
         socketio.emit('orders_update', {
             'active_orders': serializable_active_orders,
             'completed_orders': serializable_completed_orders,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         return {'status': 'success', 'message': f'CSV文件刷新成功，当前活跃订单: {len(active_orders)}个'}
     else:
@@ -5409,7 +5933,7 @@ def handle_edit_order(data):
         socketio.emit('orders_update', {
             'active_orders': serializable_active_orders,
             'completed_orders': serializable_completed_orders,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         logger.info(f"[{datetime.now().strftime('%H:%M:%S')}] 订单已编辑: ID={order_id}")
         return {'status': 'success', 'message': '订单更新成功'}
@@ -5432,7 +5956,6 @@ def handle_delete_order(data):
                 break
         if not order_to_delete:
             return {'status': 'error', 'message': f'未找到ID为{order_id}的订单'}
-        import pandas as pd
         if os.path.exists(csv_file_path):
             df = pd.read_csv(csv_file_path)
             if 'id' in df.columns:
@@ -5451,7 +5974,7 @@ def handle_delete_order(data):
         socketio.emit('orders_update', {
             'active_orders': serializable_active_orders,
             'completed_orders': serializable_completed_orders,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         return {'status': 'success', 'message': '订单已彻底删除'}
     except Exception as e:
@@ -5532,7 +6055,7 @@ def handle_add_order(data):
             'target_price': target_price,
             'stop_loss': stop_loss,
             'channel': data.get('channel', '手动添加'),
-            'publish_time': data.get('publish_time', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            'publish_time': data.get('publish_time', now_str()),
             'triggered': data.get('triggered', False),
             'risk_reward_ratio': risk_reward_ratio,
             'is_completed': False,
@@ -5544,8 +6067,6 @@ def handle_add_order(data):
         
         # 更新按币种分类的订单
         symbol_key = symbol.upper()
-        if symbol_key not in orders_by_symbol:
-            orders_by_symbol[symbol_key] = []
         orders_by_symbol[symbol_key].append(new_order)
         
         # 更新前端
@@ -5557,12 +6078,11 @@ def handle_add_order(data):
         socketio.emit('orders_update', {
             'active_orders': serializable_active_orders,
             'completed_orders': serializable_completed_orders,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': now_str()
         })
         
         # 添加到CSV文件
         try:
-            import pandas as pd
             new_row = {
                 'id': new_order['id'],
                 'timestamp': new_order['publish_time'],
@@ -5690,7 +6210,7 @@ if __name__ == '__main__':
         # 启动Flask应用
         # host='0.0.0.0' 允许从任何IP地址访问，用于直接部署在服务器上
         
-        logger.info("正在启动Flask应用...")
+        logger.info(f"正在启动Flask应用... (SocketIO模式: {SOCKETIO_ASYNC_MODE})")
         logger.info("外部访问已启用，CORS设置已配置")
         
         try:
@@ -5726,13 +6246,11 @@ print(app.url_map)
 @app.route('/api/channel_winrate')
 def channel_winrate():
     """读取channel.xlsx，返回博主胜率数据"""
-    import pandas as pd
-    import os
     try:
         excel_path = os.path.join('Discord', 'data', 'channel.xlsx')
         if not os.path.exists(excel_path):
             return jsonify({'status': 'error', 'msg': f'找不到文件: {excel_path}'})
-        df = pd.read_excel(excel_path)
+        df = read_excel_fast(excel_path)
         columns = ['频道', '类型', '总交易数', '盈利交易数', '亏损交易数', '胜率']
         df = df[columns]
         data = df.to_dict('records')
@@ -5749,8 +6267,6 @@ def channel_winrate_page():
 def get_latest_prices():
     """从price_history.csv文件读取最新的价格数据"""
     try:
-        import pandas as pd
-        import os
         
         csv_path = os.path.join('data', 'price_history.csv')
         if not os.path.exists(csv_path):
@@ -5800,7 +6316,7 @@ def get_price_history_latest():
             return jsonify({
                 'status': 'error', 
                 'message': f'找不到文件: {csv_path}',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': now_str()
             })
         
         # 读取CSV文件，只读取最后50行以提高性能
@@ -5810,7 +6326,7 @@ def get_price_history_latest():
             return jsonify({
                 'status': 'error', 
                 'message': '价格历史文件为空',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': now_str()
             })
         
         # 按时间戳排序，获取最新数据
@@ -5851,7 +6367,7 @@ def get_price_history_latest():
         return jsonify({
             'status': 'success',
             'prices': latest_prices,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': now_str(),
             'source': 'price_history.csv',
             'count': len(latest_prices)
         })
@@ -5861,7 +6377,7 @@ def get_price_history_latest():
         return jsonify({
             'status': 'error', 
             'message': str(e),
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': now_str(),
             'traceback': traceback.format_exc()
         })
 
@@ -5885,7 +6401,7 @@ def test_url():
         'message': '新的URL配置正常工作',
         'server_ip': '8.209.208.159',
         'port': 8080,
-        'current_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'current_time': now_str(),
         'api_endpoints': {
             'price_history_latest': '/api/price_history_latest',
             'orders_data': '/orders_data',
@@ -5919,7 +6435,7 @@ def mobile_test():
 #     )
 
 # 添加数据变化检测
-last_data_hash: str = ""
+last_data_key: Optional[tuple] = None
 last_push_time: float = 0
 min_push_interval: float = 15  # 最小推送间隔15秒
 
@@ -5943,7 +6459,7 @@ def test_altcoin_update():
             results[symbol] = {
                 'normalized': normalized,
                 'in_valid_list': symbol in symbols,
-                'in_whitelist': symbol in ['PUMPFUNUSDT', 'TOSHIUSDT', 'HYPEUSDT', 'BONKUSDT', 'WIFUSDT']
+                'in_whitelist': symbol in _WHITELIST_SYMBOLS
             }
         
         return jsonify({
@@ -0,0 +1,134 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+import database_manager
+from database_manager import DatabaseManager
+
+
+def _create_tables(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id TEXT UNIQUE,
+                symbol TEXT NOT NULL,
+                side TEXT NOT NULL,
+                order_type TEXT,
+                quantity REAL,
+                price REAL,
+                status TEXT,
+                filled_quantity REAL DEFAULT 0,
+                commission REAL DEFAULT 0,
+                signal_id INTEGER,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                level TEXT NOT NULL,
+                category TEXT NOT NULL,
+                message TEXT NOT NULL,
+                data TEXT,
+                acknowledged BOOLEAN DEFAULT FALSE,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db_path = tmp_path / "trading_monitor.db"
+    _create_tables(db_path)
+    return DatabaseManager(str(db_path))
+
+
+def _order(order_id):
+    return {"orderId": order_id, "symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT",
+            "origQty": 1, "price": 100, "status": "NEW"}
+
+
+def _count(manager, table):
+    with sqlite3.connect(manager.db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_batch_with_one_bad_row_only_fails_that_write(manager):
+    async def run():
+        results = await asyncio.gather(
+            manager.save_order(_order("a")),
+            manager.save_order(_order("b")),
+            manager.save_order(_order("a")),  # order_id 重复，违反UNIQUE约束
+            manager.save_alert("INFO", "test", "ok"),
+            return_exceptions=True,
+        )
+        await manager.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert isinstance(results[2], sqlite3.IntegrityError)
+    assert isinstance(results[0], int) and isinstance(results[1], int)
+    assert results[3] is None
+    assert _count(manager, "orders") == 2
+    assert _count(manager, "alerts") == 1
+
+
+def test_writer_crash_fails_pending_writes_and_keeps_queue(manager, monkeypatch):
+    async def broken_flush(db, batch):
+        raise RuntimeError("writer crashed")
+
+    async def run():
+        monkeypatch.setattr(manager, "_flush_write_batch", broken_flush)
+        first = await asyncio.wait_for(asyncio.gather(
+            manager.save_alert("INFO", "test", "1"),
+            manager.save_alert("INFO", "test", "2"),
+            return_exceptions=True,
+        ), timeout=5)
+        queue = manager._write_queue
+
+        # 写入协程恢复后复用同一个队列继续工作
+        monkeypatch.undo()
+        await asyncio.wait_for(manager.save_alert("INFO", "test", "3"), timeout=5)
+        assert manager._write_queue is queue
+        await manager.close()
+        return first
+
+    first = asyncio.run(run())
+
+    assert all(isinstance(r, RuntimeError) for r in first)
+    assert _count(manager, "alerts") == 1
+
+
+def test_writer_connect_failure_does_not_hang_callers(manager, monkeypatch):
+    def broken_connect(*args, **kwargs):
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(database_manager.aiosqlite, "connect", broken_connect)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(manager.save_alert("INFO", "test", "x"), return_exceptions=True), timeout=5)
+
+    (result,) = asyncio.run(run())
+    assert isinstance(result, sqlite3.OperationalError)
+
+
+def test_cached_rows_are_copied_for_each_caller(manager):
+    async def run():
+        await manager.save_alert("INFO", "test", "original")
+        first = await manager.get_unacknowledged_alerts()
+        first[0]["message"] = "changed"
+        second = await manager.get_unacknowledged_alerts()
+        second[0]["message"] = "changed again"
+        third = await manager.get_unacknowledged_alerts()
+        await manager.close()
+        return third
+
+    assert asyncio.run(run())[0]["message"] == "original"
@@ -0,0 +1,158 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("flask_socketio")
+pytest.importorskip("Binance_price_monitor")
+
+
+@pytest.fixture
+def pom(tmp_path, monkeypatch):
+    """在临时目录中导入 price_order_monitor，并屏蔽外部依赖（价格源、Excel、推送）"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join("data", "analysis_results"), exist_ok=True)
+    import price_order_monitor
+
+    prices = {}
+
+    class _Monitor:
+        def get_current_price(self, symbol):
+            return prices.get(symbol)
+
+    monkeypatch.setattr(price_order_monitor, "monitor", _Monitor())
+    monkeypatch.setattr(price_order_monitor, "save_completed_orders_to_excel", lambda *a, **kw: None)
+    monkeypatch.setattr(price_order_monitor, "queue_emit", lambda *a, **kw: None)
+    monkeypatch.setattr(price_order_monitor, "update_entry_status_for_orders", lambda orders: None)
+    monkeypatch.setattr(price_order_monitor, "active_orders", [])
+    monkeypatch.setattr(price_order_monitor, "completed_orders", [])
+    price_order_monitor.begin_price_tick()
+    price_order_monitor.prices = prices
+    yield price_order_monitor
+    price_order_monitor.begin_price_tick()
+
+
+def _order(symbol, entry, stop, target):
+    return {
+        "id": symbol, "symbol": symbol, "normalized_symbol": symbol + "USDT", "direction": "做多",
+        "entry_price": entry, "stop_loss": stop, "target_price": target,
+        "timestamp": "2024-01-01 10:00:00", "status": "active",
+    }
+
+
+def test_completed_orders_reach_csv_from_both_update_paths(pom):
+    csv_path = os.path.join("data", "analysis_results", "all_analysis_results.csv")
+    pd.DataFrame([
+        {"analysis.交易币种": "BTC", "analysis.方向": "做多", "analysis.入场点位1": 100.0,
+         "analysis.止损点位1": 90.0, "analysis.止盈点位1": 110.0},
+        {"analysis.交易币种": "ETH", "analysis.方向": "做多", "analysis.入场点位1": 10.0,
+         "analysis.止损点位1": 9.0, "analysis.止盈点位1": 11.0},
+    ]).to_csv(csv_path, index=False)
+    pom.active_orders.extend([_order("BTC", 100.0, 90.0, 110.0), _order("ETH", 10.0, 9.0, 11.0)])
+
+    # BTC 在 update_order_prices 中止盈
+    pom.prices.update({"BTCUSDT": 120.0, "ETHUSDT": 10.5})
+    pom.update_order_prices()
+    # ETH 在 update_all_orders_status 中止盈
+    pom.begin_price_tick()
+    pom.prices["ETHUSDT"] = 12.0
+    pom.update_all_orders_status()
+
+    assert pom.active_orders == []
+    assert pom.compact_order_status_log() == 2
+
+    df = pd.read_csv(csv_path).set_index("analysis.交易币种")
+    assert df.loc["BTC", "status"] == "completed"
+    assert df.loc["BTC", "result"] == "止盈"
+    assert df.loc["ETH", "status"] == "completed"
+    assert df.loc["ETH", "result"] == "止盈"
+    assert not os.path.exists(pom.ORDER_STATUS_LOG_PATH)
+
+
+def test_normalize_symbol_refreshes_expired_valid_symbols(pom, monkeypatch):
+    monkeypatch.setattr(pom, "valid_symbols_cache", {"BTCUSDT"})
+    monkeypatch.setattr(pom, "last_symbols_update", time.time())
+    pom._normalize_symbol_cached.cache_clear()
+    assert pom.normalize_symbol("new") is None
+
+    # 有效交易对列表过期后，即使结果已缓存也要重新获取
+    monkeypatch.setattr(pom, "last_symbols_update", time.time() - pom.VALID_SYMBOLS_TTL - 1)
+    monkeypatch.setattr(pom, "_load_valid_symbols_file", lambda: ({"BTCUSDT", "NEWUSDT"}, time.time()))
+    assert pom.normalize_symbol("new") == "NEWUSDT"
+    pom._normalize_symbol_cached.cache_clear()
+
+
+CSV_COLUMNS = ["analysis.交易币种", "n", "analysis.原文"]
+
+
+def _csv_rows(start, stop):
+    # 原文是带引号的多行文本
+    return pd.DataFrame({
+        "analysis.交易币种": ["BTC"] * (stop - start),
+        "n": range(start, stop),
+        "analysis.原文": [f'第{i}行\n"引用"内容' for i in range(start, stop)],
+    })
+
+
+def _assert_cached_matches_full_parse(pom, path):
+    dtype = {"analysis.交易币种": "category"}
+    cached = pom.read_table_cached(path, CSV_COLUMNS, dtype)
+    with open(path, "rb") as f:
+        expected = pom.read_csv_columns(f.read(), CSV_COLUMNS, dtype)
+    pd.testing.assert_frame_equal(cached.reset_index(drop=True), expected)
+
+
+def _try_read(pom, path):
+    # 写到一半的文件可能无法解析，这里只关心之后的读取结果是否正确
+    try:
+        pom.read_table_cached(path, CSV_COLUMNS, {"analysis.交易币种": "category"})
+    except Exception:
+        pass
+
+
+def test_incremental_csv_append_and_rewrite(pom):
+    path = "orders.csv"
+    _csv_rows(0, 3).to_csv(path, index=False)
+    _assert_cached_matches_full_parse(pom, path)
+
+    _csv_rows(3, 5).to_csv(path, index=False, header=False, mode="a")
+    _assert_cached_matches_full_parse(pom, path)
+
+    _csv_rows(10, 16).to_csv(path, index=False)
+    _assert_cached_matches_full_parse(pom, path)
+
+
+def test_incremental_csv_partial_line(pom):
+    path = "orders.csv"
+    _csv_rows(0, 3).to_csv(path, index=False)
+    _assert_cached_matches_full_parse(pom, path)
+
+    tail = _csv_rows(3, 4).to_csv(index=False, header=False).encode("utf-8")
+    with open(path, "ab") as f:
+        f.write(tail[:5])
+    _try_read(pom, path)
+    with open(path, "ab") as f:
+        f.write(tail[5:])
+    _assert_cached_matches_full_parse(pom, path)
+
+
+def test_incremental_csv_partial_write_inside_quoted_newline(pom):
+    path = "orders.csv"
+    _csv_rows(0, 3).to_csv(path, index=False)
+    _assert_cached_matches_full_parse(pom, path)
+
+    tail = _csv_rows(3, 4).to_csv(index=False, header=False).encode("utf-8")
+    # 停在引号字段内的换行处：以换行结尾，但不是记录边界
+    cut = tail.index(b"\n") + 1
+    with open(path, "ab") as f:
+        f.write(tail[:cut])
+    with open(path, "rb") as f:
+        assert not pom._ends_at_csv_record_boundary(f.read())
+    _try_read(pom, path)
+
+    with open(path, "ab") as f:
+        f.write(tail[cut:])
+    _assert_cached_matches_full_parse(pom, path)
+    _csv_rows(4, 6).to_csv(path, index=False, header=False, mode="a")
+    _assert_cached_matches_full_parse(pom, path)